@@ -108,8 +108,8 @@ def on_quit(icon, item):
     app = get_app_instance()
     if app:
         try:
-            if app.main_window and hasattr(app.main_window, 'translation_executor'):
-                app.main_window.translation_executor.shutdown(wait=False)
+            from VezylTranslatorNeutron.scheduler_service import shutdown_scheduler
+            shutdown_scheduler()
         except Exception as e:
             print(f"Cleanup error: {e}")
         
@@ -17,10 +17,13 @@ from VezylTranslatorNeutron import constant
 from VezylTranslatorElectron.events import UIEvents
 from VezylTranslatorElectron.components import UIComponents
 from VezylTranslatorNeutron.helpers import get_windows_theme
+from VezylTranslatorNeutron.scheduler_service import (
+    CancellationToken, TaskPriority, TranslationCancelled, get_scheduler
+)
 
 # Additional imports for GUIController
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 
 
 # === GUI Controller (merged from VezylTranslatorProton/gui_controller.py) ===
@@ -33,8 +36,7 @@ class GUIController:
         self.theme_interface = theme_interface
         self._ = _
         
-        # Translation executor for async operations
-        self.translation_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="gui_translate")
+        # Translations run on the shared priority scheduler
         self.pending_translations = {}
         
         # UI state management
@@ -74,51 +76,40 @@ class GUIController:
             (os.path.join(constant.RESOURCES_DIR, "settings.png"), "Cài đặt")
         ]
     
-    def translate_async(self, widget_id, translate_function):
-        """Execute translation asynchronously using ThreadPool"""
+    def translate_async(self, widget_id, translate_function, priority=TaskPriority.INTERACTIVE, cancel_token=None):
+        """Execute translation asynchronously on the priority scheduler"""
         if self._shutting_down:
             print("Translation skipped: Application shutting down")
             return None
-            
-        if not hasattr(self, 'translation_executor') or self.translation_executor._shutdown:
-            print("Translation executor unavailable or shutdown")
+        
+        # Supersedes the previous translation for this widget (queued or running)
+        try:
+            future = get_scheduler().submit(translate_function, priority=priority, key=widget_id,
+                                            cancel_token=cancel_token)
+        except RuntimeError as e:
+            print(f"Translation scheduler unavailable: {e}")
             return None
-            
-        # Cancel pending translation for this widget
-        if widget_id in self.pending_translations:
+        self.pending_translations[widget_id] = future
+        
+        def on_complete(fut):
+            if self.pending_translations.get(widget_id) is fut:
+                self.pending_translations.pop(widget_id, None)
+            if fut.cancelled():
+                return
             try:
-                self.pending_translations[widget_id].cancel()
-            except:
+                fut.result()
+            except TranslationCancelled:
                 pass
-            
-        try:
-            future = self.translation_executor.submit(translate_function)
-            self.pending_translations[widget_id] = future
-            
-            def on_complete(fut):
-                self.pending_translations.pop(widget_id, None)
-                try:
-                    fut.result()
-                except Exception as e:
-                    print(f"Translation error: {e}")
-                    
-            future.add_done_callback(on_complete)
-            return future
-        except RuntimeError as e:
-            if "cannot schedule new futures after shutdown" in str(e):
-                print("Translation executor has been shutdown")
-                return None
-            else:
-                raise
+            except Exception as e:
+                print(f"Translation error: {e}")
+        
+        future.add_done_callback(on_complete)
+        return future
     
     def cancel_translation(self, widget_id):
         """Cancel translation for specific widget"""
-        if widget_id in self.pending_translations:
-            try:
-                self.pending_translations[widget_id].cancel()
-            except:
-                pass
-            self.pending_translations.pop(widget_id, None)
+        get_scheduler().cancel(widget_id)
+        self.pending_translations.pop(widget_id, None)
     
     def setup_ctrl_tracking(self, window):
         """Setup or disable Ctrl key tracking"""
@@ -184,16 +175,8 @@ class GUIController:
             self.cleanup_mousewheel_handlers()
             
             # Cancel all pending translations
-            for future in list(self.pending_translations.values()):
-                try:
-                    future.cancel()
-                except:
-                    pass
-            self.pending_translations.clear()
-            
-            # Shutdown ThreadPool
-            if hasattr(self, 'translation_executor') and not self.translation_executor._shutdown:
-                self.translation_executor.shutdown(wait=False)
+            for widget_id in list(self.pending_translations):
+                self.cancel_translation(widget_id)
             
             # Check if Ctrl is pressed when closing to exit completely
             if getattr(self.translator, 'enable_ctrl_tracking', True) and self.ctrl_pressed:
@@ -212,16 +195,8 @@ class GUIController:
             self.cleanup_mousewheel_handlers()
             
             # Cancel all pending translations
-            for future in list(self.pending_translations.values()):
-                try:
-                    future.cancel()
-                except:
-                    pass
-            self.pending_translations.clear()
-            
-            # Shutdown ThreadPool if still running
-            if hasattr(self, 'translation_executor') and not self.translation_executor._shutdown:
-                self.translation_executor.shutdown(wait=False)
+            for widget_id in list(self.pending_translations):
+                self.cancel_translation(widget_id)
                 
         except Exception as e:
             print(f"Error during destroy cleanup: {e}")
@@ -268,6 +243,8 @@ class SettingsController:
             ]),
             (self._("settings")["translation"]["title"], [
                 ("translation_model", self._("settings")["translation"]["translation_model"], "translation_model"),
+                ("translation_profile", self._("settings")["translation"]["translation_profile"], "profile"),
+                ("popup_translation_profile", self._("settings")["translation"]["popup_translation_profile"], "profile"),
             ])
         ]
     
@@ -757,9 +734,14 @@ class TranslationController:
         
         # Auto-save state management
         self.auto_save_state = {"saved": False, "timer_id": None, "last_content": ""}
+        
+        # Per-session sentence translations for incremental homepage updates
+        self._segment_cache = OrderedDict()
+        self._segment_cache_lock = threading.Lock()
     
     def create_translation_function(self, text, src_lang, dest_lang, dest_text_widget, 
-                                   src_lang_combo=None, lang_display=None, write_history=True):
+                                   src_lang_combo=None, lang_display=None, write_history=True,
+                                   cancel_token=None):
         """Create a translation function for async execution"""
         def do_translate():
             if not text.strip():
@@ -769,20 +751,19 @@ class TranslationController:
                 return
             
             try:
-                # Perform translation using new engine
-                from VezylTranslatorProton.translator import get_translation_engine
-                engine = get_translation_engine()
-                result = engine.translate(
-                    text, src_lang, dest_lang, 
-                    self.translator.translation_model
+                # Only sentences that changed since the last run reach the engine
+                translated_text, detected_src = self.translate_incremental(
+                    text, src_lang, dest_lang,
+                    self.translator.translation_model,
+                    getattr(self.translator, 'translation_profile', None),
+                    cancel_token
                 )
-                translated = result.to_dict()  # Convert to old format for compatibility
                 
-                if translated and dest_text_widget:
-                    # Extract text from translation result
-                    translated_text = translated.get("text", "") if isinstance(translated, dict) else str(translated)
-                    detected_src = translated.get("src", src_lang) if isinstance(translated, dict) else src_lang
-                    
+                # A newer keystroke superseded this request: no UI update, no history entry
+                if cancel_token is not None and cancel_token.cancelled:
+                    return
+                
+                if dest_text_widget:
                     # Update source language combo if auto-detect was used
                     if src_lang == "auto" and src_lang_combo and lang_display and detected_src != "auto":
                         detected_display = lang_display.get(detected_src, detected_src)
@@ -807,11 +788,14 @@ class TranslationController:
                                 "homepage",       # source
                                 constant.TRANSLATE_LOG_FILE,  # log_file
                                 self.language_interface,      # language_interface
-                                self.theme_interface           # theme_interface
+                                self.theme_interface,          # theme_interface
+                                original_text=text             # lets the cache be seeded from history
                             )
                         except Exception as e:
                             print(f"Error writing history: {e}")
                 
+            except TranslationCancelled:
+                return
             except Exception as e:
                 print(f"Translation error: {e}")
                 if dest_text_widget:
@@ -820,13 +804,95 @@ class TranslationController:
         
         return do_translate
     
+    def translate_incremental(self, text, src_lang, dest_lang, model=None, profile=None, cancel_token=None):
+        """Translate text sentence by sentence, reusing sentences translated earlier this session"""
+        from VezylTranslatorProton.translator import get_translation_engine
+        from VezylTranslatorProton.segmenter import split_sentences
+        from VezylTranslatorProton.documents import (
+            detect_document_format, extract_document_text, translate_document_text
+        )
+        engine = get_translation_engine()
+        
+        # Whole text already translated (e.g. by a prefetch or an undo back to earlier text)
+        cached = engine.get_cached(text, src_lang, dest_lang, model, profile)
+        if cached:
+            return cached.text, cached.src_lang
+        
+        # Pasted Markdown/HTML: translate text nodes only and keep the markup
+        doc_format = detect_document_format(text)
+        if doc_format != "text":
+            if src_lang == "auto":
+                # Detect once on the whole document; single text nodes are often too short
+                from VezylTranslatorProton.translator import detect_language
+                detected = detect_language(extract_document_text(text, doc_format))
+                src_lang = detected if detected != "unknown" else "auto"
+            translated = translate_document_text(text, dest_lang, src_lang, model, profile, doc_format, cancel_token)
+            return translated, src_lang
+        
+        pieces = split_sentences(text)
+        if len(pieces) <= 1:
+            result = engine.translate(text, src_lang, dest_lang, model, profile=profile, cancel_token=cancel_token)
+            return result.text, result.src_lang
+        
+        translations = {}
+        missing = []
+        with self._segment_cache_lock:
+            for sentence, _separator in pieces:
+                if not sentence.strip() or sentence in translations:
+                    continue
+                key = (sentence, src_lang, dest_lang, model, profile)
+                entry = self._segment_cache.get(key)
+                if entry is not None:
+                    self._segment_cache.move_to_end(key)
+                    translations[sentence] = entry
+                elif sentence not in missing:
+                    missing.append(sentence)
+        
+        if missing:
+            results = engine.batch_translate(missing, src_lang, dest_lang, model, profile=profile,
+                                             cancel_token=cancel_token)
+            with self._segment_cache_lock:
+                for sentence, result in zip(missing, results):
+                    entry = (result.text, result.src_lang)
+                    translations[sentence] = entry
+                    if result.error:
+                        continue  # Retry failed sentences on the next edit
+                    self._segment_cache[(sentence, src_lang, dest_lang, model, profile)] = entry
+                while len(self._segment_cache) > constant.PerformanceSettings.SEGMENT_CACHE_SIZE:
+                    self._segment_cache.popitem(last=False)
+        
+        # Splice translated sentences back between the original separators
+        output = []
+        detected_src = src_lang
+        for sentence, separator in pieces:
+            if sentence.strip():
+                translated, sentence_src = translations[sentence]
+                output.append(translated)
+                if detected_src == "auto" and sentence_src and sentence_src != "auto":
+                    detected_src = sentence_src
+            else:
+                output.append(sentence)
+            output.append(separator)
+        return "".join(output), detected_src
+    
     def _update_dest_text(self, dest_text_widget, text):
-        """Update destination text widget safely"""
+        """Update destination text widget, replacing only the part that changed"""
         try:
             if dest_text_widget.winfo_exists():
                 dest_text_widget.configure(state="normal")
-                dest_text_widget.delete("1.0", "end")
-                dest_text_widget.insert("1.0", text)
+                current = dest_text_widget.get("1.0", "end-1c")
+                if current != text:
+                    # Common prefix and suffix stay in place so the view does not jump
+                    prefix = 0
+                    limit = min(len(current), len(text))
+                    while prefix < limit and current[prefix] == text[prefix]:
+                        prefix += 1
+                    suffix = 0
+                    while (suffix < limit - prefix
+                           and current[len(current) - 1 - suffix] == text[len(text) - 1 - suffix]):
+                        suffix += 1
+                    dest_text_widget.delete(f"1.0+{prefix}c", f"1.0+{len(current) - suffix}c")
+                    dest_text_widget.insert(f"1.0+{prefix}c", text[prefix:len(text) - suffix])
                 dest_text_widget.configure(state="disabled")
         except Exception as e:
             print(f"Error updating destination text: {e}")
@@ -953,6 +1019,9 @@ class TranslationController:
         
         # Clear auto-save state
         self.auto_save_state = {"saved": False, "timer_id": None, "last_content": ""}
+        
+        with self._segment_cache_lock:
+            self._segment_cache.clear()
 
 
 class MainWindow(ctk.CTkToplevel):
@@ -1202,14 +1271,15 @@ class MainWindow(ctk.CTkToplevel):
                 dest_lang_var.get(), lang_display, ""
             )
             
-            # Create and execute translation
+            # Create and execute translation; the next change cancels it even if it is running
+            cancel_token = CancellationToken()
             translate_function = self.translation_controller.create_translation_function(
                 text, src_lang, dest_lang, dest_text, 
-                src_lang_combo, lang_display
+                src_lang_combo, lang_display, cancel_token=cancel_token
             )
             
             widget_id = f"home_translate_{id(src_text)}"
-            future = self.gui_controller.translate_async(widget_id, translate_function)
+            future = self.gui_controller.translate_async(widget_id, translate_function, cancel_token=cancel_token)
             
             if future is None:
                 print("Translation not executed - system unavailable")
@@ -1586,6 +1656,8 @@ class MainWindow(ctk.CTkToplevel):
             ]),
             (self._("settings")["translation"]["title"], [
                 ("translation_model", self._("settings")["translation"]["translation_model"], "translation_model"),
+                ("translation_profile", self._("settings")["translation"]["translation_profile"], "profile"),
+                ("popup_translation_profile", self._("settings")["translation"]["popup_translation_profile"], "profile"),
             ]),
         ]
 
@@ -1690,6 +1762,9 @@ class MainWindow(ctk.CTkToplevel):
             return self.ui_components.create_combo_field(parent, fonts, val)
         elif typ == "translation_model":
             return self._create_translation_model_field(parent, val)
+        elif typ == "profile":
+            from VezylTranslatorProton.profiles import TRANSLATION_PROFILES
+            return self.ui_components.create_combo_field(parent, list(TRANSLATION_PROFILES.keys()), val)
         elif typ == "hotkey":
             entry = self.ui_components.create_readonly_entry_field(parent, val)
             click_handler = self.settings_controller.create_hotkey_click_handler(entry)
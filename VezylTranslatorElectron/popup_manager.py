@@ -50,6 +50,9 @@ from VezylTranslatorNeutron.helpers import (
     search_entries
 )
 from VezylTranslatorNeutron.clipboard_service import clipboard_watcher, get_clipboard_text, set_clipboard_text
+from VezylTranslatorNeutron.scheduler_service import (
+    CancellationToken, TaskPriority, TranslationCancelled, get_scheduler
+)
 from VezylTranslatorProton.translator import get_translation_engine
 
 import threading
@@ -85,12 +88,6 @@ def ensure_main_window_available(translator, main_window_instance, language_inte
         new_window = MainWindow(translator, language_interface, theme_interface, _)
         translator.main_window = new_window
         
-        # Ensure the new window has translation executor initialized
-        if hasattr(new_window, 'gui_controller') and hasattr(new_window.gui_controller, 'translation_executor'):
-            if new_window.gui_controller.translation_executor is None:
-                # Force initialization of translation executor
-                new_window.gui_controller._ensure_translation_executor()
-        
         # Try to update global reference
         try:
             import VezylTranslator
@@ -358,6 +355,8 @@ def show_popup(translator, text, x, y, main_window_instance, language_interface,
 
 
     # --- Hàm cập nhật kết quả dịch ---
+    cancel_token = CancellationToken()
+
     def do_translate():
         try:
             # Lấy model dịch từ translator instance
@@ -367,9 +366,11 @@ def show_popup(translator, text, x, y, main_window_instance, language_interface,
                 text,
                 src_lang="auto",
                 dest_lang=dest_lang,
-                model=model_name
+                model=model_name,
+                profile=getattr(translator, 'popup_translation_profile', 'instant'),
+                cancel_token=cancel_token
             )
-            result = translation_result.to_dict()  # Convert to old format
+            result = translation_result.as_mapping()  # Old format (read-only view)
             translated = result["text"]
             src_lang = result["src"]
             src_lang_display = lang_display.get(src_lang, src_lang)
@@ -388,14 +389,17 @@ def show_popup(translator, text, x, y, main_window_instance, language_interface,
             popup.after(0, safe_update_ui)
             # Ghi log
             write_log_entry(
-                constant.last_translated_text, 
+                translated,  # Bản dịch, không phải văn bản gốc
                 src_lang, 
                 dest_lang, 
                 "popup", 
                 constant.TRANSLATE_LOG_FILE, 
                 language_interface, 
-                theme_interface
+                theme_interface,
+                original_text=text
             )
+        except TranslationCancelled:
+            return  # Popup đã bị thay thế, bỏ qua cập nhật và ghi log
         except Exception as e:
             def safe_show_error():
                 try:
@@ -406,16 +410,26 @@ def show_popup(translator, text, x, y, main_window_instance, language_interface,
                     
             popup.after(0, safe_show_error)
 
-    # Chạy dịch ở thread phụ
-    threading.Thread(target=do_translate, daemon=True).start()
+    # Chạy dịch trên scheduler với độ ưu tiên popup (mỗi popup một key, các popup khác không bị huỷ)
+    popup_task_key = ("popup_translate", id(popup))
+    get_scheduler().submit(do_translate, priority=TaskPriority.POPUP, key=popup_task_key, cancel_token=cancel_token)
+
+    def on_popup_destroy(event):
+        if event.widget is popup:
+            get_scheduler().cancel(popup_task_key)  # Popup đã đóng, không cần dịch tiếp
+
+    popup.bind("<Destroy>", on_popup_destroy, add="+")
 
     def update_translation(new_src_lang):
         try:
             # Lấy model dịch từ translator instance
             model_name = getattr(translator, 'translation_model', 'google')
             engine = get_translation_engine()
-            translation_result = engine.translate(text, src_lang=new_src_lang, dest_lang=dest_lang, model=model_name)
-            result = translation_result.to_dict()  # Convert to old format
+            translation_result = engine.translate(
+                text, src_lang=new_src_lang, dest_lang=dest_lang, model=model_name,
+                profile=getattr(translator, 'popup_translation_profile', 'instant')
+            )
+            result = translation_result.as_mapping()  # Old format (read-only view)
             translated = result["text"]  # Sửa lại từ result.text thành result["text"]
             
             # Update constant for consistency
@@ -437,7 +451,8 @@ def show_popup(translator, text, x, y, main_window_instance, language_interface,
                     "popup", 
                     constant.TRANSLATE_LOG_FILE, 
                     language_interface, 
-                    theme_interface
+                    theme_interface,
+                    original_text=text
                 )
             except Exception as e:
                 print(f"Error writing popup history: {e}")
@@ -540,8 +555,11 @@ def show_icon(translator, text, x, y, main_window_instance, language_interface,
         )
         img_label.pack(fill="both", expand=True, padx=0, pady=0)
 
+        clicked = [False]
+
         def on_click(event):
             print(f"Clicked on icon at ({icon_x}, {icon_y})")
+            clicked[0] = True
             translator.Is_icon_showing = False
             icon_win.withdraw()
             # Popup cũng đối xứng quanh chuột như icon
@@ -571,6 +589,9 @@ def show_icon(translator, text, x, y, main_window_instance, language_interface,
 
         def destroy_icon():
             translator.Is_icon_showing = False
+            # Icon expired unclicked - drop the speculative translation
+            if not clicked[0] and hasattr(translator, 'cancel_prefetch'):
+                translator.cancel_prefetch(text)
             icon_win.destroy()
 
         icon_win.after(icon_dissapear_after, destroy_icon)
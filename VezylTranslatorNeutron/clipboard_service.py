@@ -176,9 +176,11 @@ class ClipboardService:
             # Fallback if cache has issues
             return self._format_text_internal(text)
     
-    def clear_format_cache(self):
-        """Clear format cache to save memory"""
+    def clear_format_cache(self) -> int:
+        """Clear format cache to save memory. Returns the number of entries dropped"""
+        dropped = self._format_text_cached.cache_info().currsize
         self._format_text_cached.cache_clear()
+        return dropped
     
     # === Public API ===
     
@@ -193,7 +195,8 @@ class ClipboardService:
     
     # === Clipboard Monitoring ===
     
-    def start_watcher(self, translator_instance, show_popup_func, show_icon_func, show_homepage_func):
+    def start_watcher(self, translator_instance, show_popup_func, show_icon_func, show_homepage_func,
+                      prefetch_func=None):
         """Start clipboard monitoring with adaptive interval"""
         self.recent_value = self._safe_clipboard_paste()
         print("Clipboard watcher started with safe access")
@@ -236,6 +239,12 @@ class ClipboardService:
                         show_popup_func(formatted_value, x, y)
                     else:
                         print("icon")
+                        # Translate speculatively while the icon waits for a click
+                        if prefetch_func is not None:
+                            try:
+                                prefetch_func(formatted_value)
+                            except Exception as e:
+                                print(f"Prefetch error: {e}")
                         show_icon_func(formatted_value, x, y)
                 else:
                     # No activity - gradually increase interval
@@ -337,9 +346,10 @@ class ClipboardService:
 _clipboard_service = ClipboardService()
 
 def clipboard_watcher(translator_instance, main_window_instance, always_show_transtale, 
-                     show_popup_func, show_icon_func, show_homepage_func):
+                     show_popup_func, show_icon_func, show_homepage_func, prefetch_func=None):
     """Legacy wrapper for clipboard watcher"""
-    return _clipboard_service.start_watcher(translator_instance, show_popup_func, show_icon_func, show_homepage_func)
+    return _clipboard_service.start_watcher(translator_instance, show_popup_func, show_icon_func, show_homepage_func,
+                                            prefetch_func)
 
 def get_clipboard_text():
     """Legacy wrapper for getting clipboard text"""
@@ -100,6 +100,27 @@ class PerformanceSettings:
     TRANSLATION_TIMEOUT: Final[int] = 30  # seconds
     MAX_CONCURRENT_TRANSLATIONS: Final[int] = 3
     MEMORY_CLEANUP_INTERVAL: Final[int] = 60  # seconds
+    PREFETCH_MAX_CHARS: Final[int] = 5000  # Longer clipboard text is not prefetched
+    PREFETCH_CHARS_PER_MINUTE: Final[int] = 20000  # Speculative translation budget
+    PREFETCH_MAX_CPU_PERCENT: Final[float] = 85.0  # Skip prefetch above this CPU load
+    SEGMENT_CACHE_SIZE: Final[int] = 2000  # Homepage sentence translations kept per session
+    SCHEDULER_WORKERS: Final[int] = 4  # Translation scheduler threads
+    SCHEDULER_INTERACTIVE_LIMIT: Final[int] = 4  # Max concurrent homepage translations
+    SCHEDULER_POPUP_LIMIT: Final[int] = 2  # Max concurrent popup translations
+    SCHEDULER_BACKGROUND_LIMIT: Final[int] = 1  # Max concurrent prefetch/batch tasks
+    FILE_TRANSLATE_BATCH_SIZE: Final[int] = 64  # Records per batch_translate call in translate-file
+    FILE_TRANSLATE_CONCURRENCY: Final[int] = 4  # Batches in flight in translate-file
+    FILE_CHECKPOINT_INTERVAL: Final[float] = 2.0  # seconds between translate-file checkpoints
+    STAGE_TIMING_WINDOW: Final[int] = 1000  # Samples kept per provider and stage
+    MEMORY_CHECK_INTERVAL: Final[float] = 15.0  # seconds between memory governor checks
+    MEMORY_GC_COOLDOWN: Final[float] = 30.0  # Minimum seconds between governor gc passes
+    MEMORY_EVENT_HISTORY: Final[int] = 100  # Memory governor events kept
+    MEMORY_MODEL_IDLE_SECONDS: Final[float] = 300.0  # Marian models unused this long go first
+    # torch + transformers alone hold ~700MB RSS; one loaded opus-mt model ~1.1GB, a pivot pair ~1.3GB
+    MEMORY_SOFT_LIMIT_MB: Final[int] = 1600  # Default RSS above which caches are shed
+    MEMORY_HARD_LIMIT_MB: Final[int] = 2400  # Default RSS above which Marian models are unloaded too
+    MEMORY_MIN_RELEASE_MB: Final[float] = 10.0  # A shedding round freeing less than this did not help
+    MEMORY_REGROWTH_MB: Final[float] = 100.0  # RSS growth that ends a pause after an ineffective round
 
 
 
@@ -114,6 +135,15 @@ class EnvVars:
     VEZYL_CONFIG_DIR: Final[str] = "VEZYL_CONFIG_DIR"
     VEZYL_THEME_OVERRIDE: Final[str] = "VEZYL_THEME_OVERRIDE"
     DISABLE_IMMEDIATE_MODEL_LOADING: Final[str] = "DISABLE_IMMEDIATE_MODEL_LOADING"
+    # Record/replay translation providers (override [replay] in advanced_config.ini)
+    VEZYL_REPLAY_MODE: Final[str] = "VEZYL_REPLAY_MODE"  # off / record / replay
+    VEZYL_REPLAY_CASSETTE: Final[str] = "VEZYL_REPLAY_CASSETTE"
+    VEZYL_REPLAY_LATENCY: Final[str] = "VEZYL_REPLAY_LATENCY"  # recorded / none / fixed:MS / uniform:MIN,MAX / normal:MEAN,STD
+    VEZYL_REPLAY_ERROR_RATE: Final[str] = "VEZYL_REPLAY_ERROR_RATE"
+    VEZYL_REPLAY_TIMEOUT_RATE: Final[str] = "VEZYL_REPLAY_TIMEOUT_RATE"
+    VEZYL_REPLAY_MISS: Final[str] = "VEZYL_REPLAY_MISS"  # error / echo
+    VEZYL_REPLAY_SEED: Final[str] = "VEZYL_REPLAY_SEED"
+    VEZYL_STAGE_TIMINGS: Final[str] = "VEZYL_STAGE_TIMINGS"  # 0 / 1 / log (overrides [performance] stage_timings)
 
 
 # === API Constants ===
@@ -122,6 +152,18 @@ class APIConstants:
     USER_AGENT: Final[str] = f"{SOFTWARE_NAME}/{SOFTWARE_VERSION}"
 
 
+# === Local Server Constants ===
+class ServerSettings:
+    """Headless translation server (--serve) settings"""
+    HOST: Final[str] = "127.0.0.1"  # Only loopback addresses are accepted
+    PORT: Final[int] = 8765
+    MAX_CONCURRENCY: Final[int] = 8  # Requests translated at the same time
+    QUEUE_TIMEOUT: Final[float] = 10.0  # Seconds a request waits for a slot before 503
+    MAX_BODY_BYTES: Final[int] = 4 * 1024 * 1024
+    KEEP_ALIVE_TIMEOUT: Final[int] = 30  # Idle seconds before a connection is closed
+    STREAM_BATCH_SIZE: Final[int] = 16  # Texts translated per streamed batch step
+
+
 
 
 
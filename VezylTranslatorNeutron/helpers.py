@@ -20,8 +20,10 @@ import gc
 import winreg
 import customtkinter as ctk
 import toml
+from collections import deque
+from dataclasses import dataclass
 from typing import Optional, List, Dict, Any, Callable, Tuple, Union
-from VezylTranslatorNeutron.constant import CONFIG_DIR, CLIENT_CONFIG_FILE, PERFORMANCE_CONFIG_FILE
+from VezylTranslatorNeutron.constant import CONFIG_DIR, CLIENT_CONFIG_FILE, PERFORMANCE_CONFIG_FILE, PerformanceSettings
 
 
 # === UI Utilities ===
@@ -327,6 +329,185 @@ class PerformanceOptimizer:
         self._monitoring_active = False
 
 
+# === Memory Governor ===
+
+@dataclass
+class MemoryEvent:
+    """One action taken by the memory governor"""
+    time: float
+    level: str  # "soft" or "hard"
+    action: str  # Shedder name or "gc"
+    rss_before_mb: float
+    rss_after_mb: float
+    detail: str = ""
+
+
+def get_process_rss_mb() -> Optional[float]:
+    """Get resident memory of this process in MB (None without psutil)"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+class MemoryGovernor:
+    """
+    Keep process memory within soft and hard RSS budgets
+    
+    Above the soft budget, shedders registered for "soft" run in registration
+    order (register the cheapest first) until memory is back under the soft
+    budget; above the hard budget the "hard" ones (e.g. unloading models) run
+    too. A gc pass follows, at most once per gc cooldown. Every action becomes a
+    MemoryEvent passed to the listeners.
+    
+    A round that frees almost nothing means the budget is below what the process
+    needs (libraries and loaded models); shedding then pauses until RSS grows
+    further, drops under the soft budget or crosses into the hard budget.
+    """
+    
+    def __init__(self, soft_limit_mb: float = 0, hard_limit_mb: float = 0,
+                 interval: float = PerformanceSettings.MEMORY_CHECK_INTERVAL,
+                 gc_cooldown: float = PerformanceSettings.MEMORY_GC_COOLDOWN,
+                 read_rss: Callable[[], Optional[float]] = get_process_rss_mb):
+        self.soft_limit_mb = soft_limit_mb  # 0 disables the governor
+        self.hard_limit_mb = hard_limit_mb
+        self.interval = interval
+        self.gc_cooldown = gc_cooldown
+        self._read_rss = read_rss
+        self._shedders: List[Tuple[str, Callable[[str], str], str]] = []
+        self._listeners: List[Callable[[MemoryEvent], None]] = []
+        self._events = deque(maxlen=PerformanceSettings.MEMORY_EVENT_HISTORY)
+        self._check_lock = threading.Lock()
+        self._last_gc = 0.0
+        self._stalled: Optional[Tuple[str, float]] = None  # (level, RSS) after a round that freed nothing
+        self._stop_event: Optional[threading.Event] = None
+    
+    def configure(self, soft_limit_mb: float, hard_limit_mb: float):
+        """Set the budgets in MB (hard is raised to at least soft)"""
+        self.soft_limit_mb = max(0, soft_limit_mb)
+        self.hard_limit_mb = max(self.soft_limit_mb, hard_limit_mb)
+    
+    def register_shedder(self, name: str, shed: Callable[[str], str], level: str = "soft"):
+        """
+        Register shed(level) -> description of what was freed ("" if nothing)
+        
+        level "hard" shedders only run above the hard budget.
+        """
+        self._shedders.append((name, shed, level))
+    
+    def add_listener(self, listener: Callable[[MemoryEvent], None]):
+        """Call listener(event) for every action taken"""
+        self._listeners.append(listener)
+    
+    def _record(self, level: str, action: str, before: float, after: float, detail: str) -> MemoryEvent:
+        event = MemoryEvent(time.time(), level, action, round(before, 1), round(after, 1), detail)
+        self._events.append(event)
+        print(f"[WARNING] Memory {level} limit: {action} {detail} ({before:.0f}MB -> {after:.0f}MB)")
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Memory event listener error: {e}")
+        return event
+    
+    def check(self) -> List[MemoryEvent]:
+        """Measure RSS once and shed until it is under the soft budget"""
+        if not self.soft_limit_mb or not self._check_lock.acquire(blocking=False):
+            return []
+        try:
+            rss = self._read_rss()
+            if rss is None or rss < self.soft_limit_mb:
+                self._stalled = None
+                return []
+            level = "hard" if self.hard_limit_mb and rss >= self.hard_limit_mb else "soft"
+            if self._stalled is not None:
+                stalled_level, stalled_rss = self._stalled
+                if level == stalled_level and rss < stalled_rss + PerformanceSettings.MEMORY_REGROWTH_MB:
+                    return []
+            
+            started_rss = rss
+            events = []
+            for name, shed, shed_level in self._shedders:
+                if shed_level == "hard" and level != "hard":
+                    continue
+                try:
+                    detail = shed(level)
+                except Exception as e:
+                    print(f"[ERROR] Memory shedder {name} failed: {e}")
+                    continue
+                if not detail:
+                    continue
+                after = self._read_rss() or rss
+                events.append(self._record(level, name, rss, after, detail))
+                rss = after
+                if rss < self.soft_limit_mb:
+                    break
+            
+            # Collect cycles left behind by the dropped objects
+            now = time.monotonic()
+            if now - self._last_gc >= self.gc_cooldown:
+                self._last_gc = now
+                collected = gc.collect()
+                after = self._read_rss() or rss
+                events.append(self._record(level, "gc", rss, after, f"{collected} objects collected"))
+                rss = after
+            
+            if started_rss - rss < PerformanceSettings.MEMORY_MIN_RELEASE_MB:
+                if self._stalled is None or self._stalled[0] != level:
+                    print(f"[INFO] Memory {level} limit: nothing left to free at {rss:.0f}MB, pausing until "
+                          f"memory grows by {PerformanceSettings.MEMORY_REGROWTH_MB:.0f}MB")
+                self._stalled = (level, rss)
+            else:
+                self._stalled = None
+            return events
+        finally:
+            self._check_lock.release()
+    
+    def start(self) -> bool:
+        """Check memory periodically in the background (requires psutil)"""
+        if not self.soft_limit_mb:
+            print("[INFO] Memory governor disabled (no budget set)")
+            return False
+        if self._read_rss() is None:
+            print("[INFO] psutil not available, memory governor disabled")
+            return False
+        if self._stop_event is not None:
+            return True
+        
+        self._stop_event = stop_event = threading.Event()
+        
+        def run():
+            while not stop_event.wait(self.interval):
+                self.check()
+        
+        threading.Thread(target=run, name="MemoryGovernor", daemon=True).start()
+        print(f"[OK] Memory governor started (soft {self.soft_limit_mb:.0f}MB, hard {self.hard_limit_mb:.0f}MB)")
+        return True
+    
+    def stop(self) -> None:
+        """Stop background checks"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+    
+    def get_events(self) -> List[MemoryEvent]:
+        """Get recent actions, oldest first"""
+        return list(self._events)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get budgets, current RSS and registered shedders"""
+        return {
+            "rss_mb": self._read_rss(),
+            "soft_limit_mb": self.soft_limit_mb,
+            "hard_limit_mb": self.hard_limit_mb,
+            "running": self._stop_event is not None,
+            "paused": self._stalled is not None,
+            "shedders": [(name, level) for name, _, level in self._shedders],
+            "events": len(self._events),
+        }
+
+
 # === Startup Optimization ===
 
 class StartupOptimizer:
@@ -440,6 +621,9 @@ performance_optimizer = PerformanceOptimizer()
 # Startup optimizer instance
 startup_optimizer = StartupOptimizer()
 
+# Memory governor instance (budgets are set by the app from advanced config)
+memory_governor = MemoryGovernor()
+
 # Lazy importers for heavy libraries
 transformers_lazy = LazyImporter('transformers')
 
@@ -524,6 +708,7 @@ def create_performance_config() -> bool:
 def cleanup_helpers() -> None:
     """Cleanup helper resources"""
     performance_optimizer.stop_monitoring()
+    memory_governor.stop()
     print("[OK] Helper resources cleaned up")
 
 
@@ -538,6 +723,9 @@ __all__ = [
     # Performance
     'PerformanceOptimizer', 'performance_optimizer', 'apply_performance_optimizations',
     
+    # Memory
+    'MemoryEvent', 'MemoryGovernor', 'memory_governor', 'get_process_rss_mb',
+    
     # Startup
     'StartupOptimizer', 'startup_optimizer', 'optimize_startup', 'finish_startup',
     
@@ -0,0 +1,272 @@
+"""
+Translation Scheduler Service for VezylTranslator
+Priority-aware worker pool shared by the homepage, popup and background translations
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from VezylTranslatorNeutron.constant import PerformanceSettings
+
+
+class TaskPriority(IntEnum):
+    """Priority classes, most urgent first"""
+    INTERACTIVE = 0  # Homepage typing, the user is watching
+    POPUP = 1        # Clipboard popup
+    BACKGROUND = 2   # Prefetch, batch jobs, favorites
+
+
+class TranslationCancelled(Exception):
+    """Raised when a translation is abandoned through its cancellation token"""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared by a request and the code running it
+
+    Long-running steps check `cancelled` between stages, and callbacks let
+    blocking work (HTTP requests, model generation) be interrupted at once.
+    """
+    __slots__ = ("_event", "_callbacks", "_lock")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the request and run the registered callbacks once"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[WARNING] Cancellation callback failed: {e}")
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Run callback on cancel (immediately if already cancelled)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        """Unregister a callback once the work it interrupts is done"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        """Raise TranslationCancelled if the request was cancelled"""
+        if self._event.is_set():
+            raise TranslationCancelled()
+
+
+class _ScheduledTask:
+    """Queued unit of work"""
+    __slots__ = ("priority", "fn", "args", "kwargs", "future", "key", "enqueued_at", "cancel_token", "was_cancelled")
+
+    def __init__(self, priority: TaskPriority, fn: Callable, args, kwargs, key: Optional[Hashable],
+                 cancel_token: Optional[CancellationToken] = None):
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.key = key
+        self.enqueued_at = time.perf_counter()
+        self.cancel_token = cancel_token
+        self.was_cancelled = False  # Cancelled by the scheduler (already counted as cancelled)
+
+    def cancel(self) -> bool:
+        """Cancel a queued task, or signal a running one through its token"""
+        if self.future.cancel():
+            self.was_cancelled = True
+            return True
+        if self.cancel_token is not None and not self.future.done():
+            self.cancel_token.cancel()
+            self.was_cancelled = True
+            return True
+        return False
+
+
+class TranslationScheduler:
+    """
+    Run translation tasks by priority class with per-class concurrency caps
+
+    Workers always take the most urgent queued task whose class is below its
+    cap, so queued background work waits whenever interactive or popup work
+    arrives. Keeping the background cap below the worker count leaves workers
+    free for interactive requests while a long batch runs. Submitting with a
+    key supersedes the earlier task with the same key: a queued task is
+    dropped, a running one is signalled through its cancellation token.
+    """
+
+    def __init__(self, max_workers: int = PerformanceSettings.SCHEDULER_WORKERS,
+                 class_limits: Optional[Dict[TaskPriority, int]] = None):
+        self.max_workers = max(1, max_workers)
+        self.class_limits = {
+            TaskPriority.INTERACTIVE: PerformanceSettings.SCHEDULER_INTERACTIVE_LIMIT,
+            TaskPriority.POPUP: PerformanceSettings.SCHEDULER_POPUP_LIMIT,
+            TaskPriority.BACKGROUND: PerformanceSettings.SCHEDULER_BACKGROUND_LIMIT,
+        }
+        self.class_limits.update(class_limits or {})
+
+        self._queues: Dict[TaskPriority, deque] = {priority: deque() for priority in TaskPriority}
+        self._running: Dict[TaskPriority, int] = {priority: 0 for priority in TaskPriority}
+        self._keyed: Dict[Hashable, _ScheduledTask] = {}
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+
+        # Metrics per class
+        self._wait_times_ms = {priority: deque(maxlen=1000) for priority in TaskPriority}
+        self._completed = {priority: 0 for priority in TaskPriority}
+        self._cancelled = {priority: 0 for priority in TaskPriority}
+
+    def submit(self, fn: Callable, *args, priority: TaskPriority = TaskPriority.BACKGROUND,
+               key: Optional[Hashable] = None, cancel_token: Optional[CancellationToken] = None,
+               **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) and return a future with its result"""
+        task = _ScheduledTask(TaskPriority(priority), fn, args, kwargs, key, cancel_token)
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+
+            if key is not None:
+                previous = self._keyed.get(key)
+                if previous is not None and previous.cancel():
+                    self._cancelled[previous.priority] += 1
+                self._keyed[key] = task
+
+            self._queues[task.priority].append(task)
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker_loop, daemon=True,
+                                          name=f"TranslationScheduler-{len(self._threads)}")
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+        return task.future
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel the task for key. Returns False if it cannot be stopped"""
+        with self._condition:
+            task = self._keyed.pop(key, None)
+            if task is None or not task.cancel():
+                return False
+            self._cancelled[task.priority] += 1
+            return True
+
+    def _next_task(self) -> Optional[_ScheduledTask]:
+        """Wait for the most urgent task that its class cap allows to start"""
+        with self._condition:
+            while not self._shutdown:
+                for priority in TaskPriority:
+                    queue = self._queues[priority]
+                    while queue and queue[0].future.cancelled():
+                        queue.popleft()  # Superseded or cancelled while queued
+                    if queue and self._running[priority] < self.class_limits[priority]:
+                        task = queue.popleft()
+                        self._running[priority] += 1
+                        return task
+                self._condition.wait()
+        return None
+
+    def _worker_loop(self):
+        """Run tasks until shutdown"""
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    self._wait_times_ms[task.priority].append((time.perf_counter() - task.enqueued_at) * 1000)
+                    try:
+                        task.future.set_result(task.fn(*task.args, **task.kwargs))
+                    except BaseException as e:
+                        task.future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._running[task.priority] -= 1
+                    if task.was_cancelled:
+                        pass  # Counted in _cancelled when it was cancelled
+                    elif task.future.cancelled() or (task.cancel_token is not None and task.cancel_token.cancelled):
+                        self._cancelled[task.priority] += 1  # Token cancelled by its owner
+                    else:
+                        self._completed[task.priority] += 1
+                    if task.key is not None and self._keyed.get(task.key) is task:
+                        del self._keyed[task.key]
+                    self._condition.notify()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue length, running tasks and queue wait per priority class"""
+        def percentile(values, q):
+            return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+        stats = {}
+        with self._condition:
+            for priority in TaskPriority:
+                waits = sorted(self._wait_times_ms[priority])
+                stats[priority.name.lower()] = {
+                    "limit": self.class_limits[priority],
+                    "queued": sum(1 for task in self._queues[priority] if not task.future.cancelled()),
+                    "running": self._running[priority],
+                    "completed": self._completed[priority],
+                    "cancelled": self._cancelled[priority],
+                    "wait_p50_ms": percentile(waits, 0.5),
+                    "wait_p95_ms": percentile(waits, 0.95),
+                    "wait_max_ms": waits[-1] if waits else 0.0,
+                }
+        return stats
+
+    def shutdown(self):
+        """Stop the workers and cancel queued tasks"""
+        with self._condition:
+            self._shutdown = True
+            for queue in self._queues.values():
+                for task in queue:
+                    task.future.cancel()
+                queue.clear()
+            for task in self._keyed.values():
+                task.cancel()  # Running keyed tasks stop early
+            self._keyed.clear()
+            self._condition.notify_all()
+
+
+# === Global Scheduler Instance ===
+_global_scheduler: Optional[TranslationScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> TranslationScheduler:
+    """Get the global translation scheduler (recreated after shutdown)"""
+    global _global_scheduler
+    with _scheduler_lock:
+        if _global_scheduler is None or _global_scheduler._shutdown:
+            _global_scheduler = TranslationScheduler()
+        return _global_scheduler
+
+
+def shutdown_scheduler():
+    """Shutdown the global translation scheduler"""
+    global _global_scheduler
+    with _scheduler_lock:
+        if _global_scheduler is not None:
+            _global_scheduler.shutdown()
+            _global_scheduler = None
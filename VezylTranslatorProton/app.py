@@ -327,6 +327,8 @@ class VezylTranslatorApp:
         self.lang_display = self.app_config.lang_display
         self.translation_model = self.app_config.translation_model
         self.translation_models = self.app_config.translation_models
+        self.translation_profile = self.app_config.translation_profile
+        self.popup_translation_profile = self.app_config.popup_translation_profile
         
         # Initialize translation engine after all config is loaded
         self._init_translation_engine()
@@ -387,6 +389,8 @@ class VezylTranslatorApp:
             self.app_config.lang_display = self.lang_display
             self.app_config.translation_model = self.translation_model
             self.app_config.translation_models = self.translation_models
+            self.app_config.translation_profile = self.translation_profile
+            self.app_config.popup_translation_profile = self.popup_translation_profile
             
             return self.config_manager.save_app_config(self.app_config)
         return False
@@ -440,6 +444,75 @@ class VezylTranslatorApp:
         )
         return self.main_window
     
+    def prefetch_translation(self, text: str):
+        """Start translating clipboard text before the icon is clicked"""
+        from VezylTranslatorProton.prefetch import get_prefetcher
+        
+        if len(text) > self.max_length_on_popup:
+            # Long text opens the homepage, which translates the stripped text with its own profile
+            get_prefetcher().prefetch(text.strip(), "auto", self.dest_lang, self.translation_model, self.translation_profile)
+        else:
+            get_prefetcher().prefetch(text, "auto", self.dest_lang, self.translation_model, self.popup_translation_profile)
+    
+    def cancel_prefetch(self, text: str):
+        """Cancel speculative translation when the icon expires unclicked"""
+        from VezylTranslatorProton.prefetch import get_prefetcher
+        
+        get_prefetcher().cancel(text.strip() if len(text) > self.max_length_on_popup else text)
+    
+    def start_memory_governor(self):
+        """Shed caches and models when memory goes over the configured budgets"""
+        from VezylTranslatorNeutron.helpers import memory_governor
+        from VezylTranslatorNeutron.clipboard_service import clear_format_cache
+        from VezylTranslatorProton.config import get_memory_limits
+        from VezylTranslatorProton.storage import get_storage_manager
+        
+        engine = self.translation_engine
+        
+        def marian_provider():
+            return engine.providers.get("marian")  # Only once constructed
+        
+        def shed_format_cache(level):
+            dropped = clear_format_cache()
+            return f"{dropped} formatted texts" if dropped else ""
+        
+        def shed_storage_cache(level):
+            dropped = get_storage_manager().clear_cache()
+            return f"{dropped} history/favorite lists" if dropped else ""
+        
+        def shed_translation_cache(level):
+            dropped = engine.cache.shrink(0.0 if level == "hard" else 0.5)
+            return f"{dropped} cached translations" if dropped else ""
+        
+        def shed_idle_models(level):
+            provider = marian_provider()
+            evicted = provider.evict_models(constant.PerformanceSettings.MEMORY_MODEL_IDLE_SECONDS) if provider else []
+            return f"unloaded idle {', '.join(os.path.basename(path) for path in evicted)}" if evicted else ""
+        
+        def shed_all_models(level):
+            provider = marian_provider()
+            evicted = provider.evict_models() if provider else []
+            return f"unloaded {', '.join(os.path.basename(path) for path in evicted)}" if evicted else ""
+        
+        # Cheapest to rebuild first
+        memory_governor.register_shedder("format_cache", shed_format_cache)
+        memory_governor.register_shedder("storage_cache", shed_storage_cache)
+        memory_governor.register_shedder("translation_cache", shed_translation_cache)
+        memory_governor.register_shedder("idle_marian_models", shed_idle_models)
+        memory_governor.register_shedder("marian_models", shed_all_models, level="hard")
+        
+        memory_governor.configure(*get_memory_limits())
+        memory_governor.start()
+    
+    def start_cache_seeding(self):
+        """Fill the translation cache from favorites and history in the background"""
+        from VezylTranslatorProton.cache_seed import start_cache_seeding
+        from VezylTranslatorNeutron.helpers import get_client_preferences
+        
+        language_interface, theme_interface = get_client_preferences()
+        start_cache_seeding(language_interface, theme_interface, self.translation_model,
+                            (self.translation_profile, self.popup_translation_profile))
+    
     def start_clipboard_watcher(self):
         """Start clipboard monitoring thread"""
         from VezylTranslatorNeutron.clipboard_service import clipboard_watcher
@@ -456,7 +529,8 @@ class VezylTranslatorApp:
                 self.always_show_transtale,
                 self.show_popup,
                 self.show_icon,
-                self.main_window.show_and_fill_homepage
+                self.main_window.show_and_fill_homepage,
+                self.prefetch_translation
             ),
             daemon=True
         )
@@ -547,11 +621,6 @@ class VezylTranslatorApp:
                     if hasattr(self.main_window, '_shutting_down'):
                         self.main_window._shutting_down = False
                         
-                    # Ensure translation executor is available
-                    if hasattr(self.main_window, 'gui_controller'):
-                        if not hasattr(self.main_window.gui_controller, 'translation_executor') or self.main_window.gui_controller.translation_executor is None:
-                            self.main_window.gui_controller._ensure_translation_executor()
-                            
                     self.main_window.show_and_fill_homepage()
                     return True
                 except Exception as e:
@@ -562,9 +631,9 @@ class VezylTranslatorApp:
         def on_quit(icon, item):
             """Cleanup resources before quitting"""
             try:
-                # Cleanup main window ThreadPool if available
-                if self.main_window and hasattr(self.main_window, 'translation_executor'):
-                    self.main_window.translation_executor.shutdown(wait=False)
+                # Stop the translation scheduler
+                from VezylTranslatorNeutron.scheduler_service import shutdown_scheduler
+                shutdown_scheduler()
             except Exception as e:
                 print(f"Cleanup error: {e}")
             
@@ -575,6 +644,15 @@ class VezylTranslatorApp:
             except ImportError:
                 pass
             
+            try:
+                # Stop speculative translation and Marian worker processes
+                from VezylTranslatorProton.prefetch import get_prefetcher
+                get_prefetcher().shutdown()
+                if hasattr(self, 'translation_engine'):
+                    self.translation_engine.shutdown()
+            except Exception as e:
+                print(f"Translation engine cleanup error: {e}")
+            
             icon.stop()
             os._exit(0)
         
@@ -622,6 +700,12 @@ class VezylTranslatorApp:
         print(f"GUI initialized: {time.time() - gui_start:.3f}s")
         print(f"Total startup time: {time.time() - startup_start:.3f}s")
         
+        # Keep memory within budget on machines shared with browsers
+        self.start_memory_governor()
+        
+        # Seed the translation cache so repeat lookups skip the provider
+        self.start_cache_seeding()
+        
         # Start clipboard watcher
         self.start_clipboard_watcher()
         
@@ -686,14 +770,28 @@ def create_app() -> VezylTranslatorApp:
 
 def main():
     """Main entry point for the application"""
+    # Required for Marian worker processes in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     # Setup crash handler first
     CrashHandler.setup_crash_handler()
     
+    # Subcommands run headless and exit
+    if len(sys.argv) > 1 and sys.argv[1] == 'translate-file':
+        from VezylTranslatorProton.file_translator import main as translate_file_main
+        sys.exit(translate_file_main(sys.argv[2:]))
+    
     # Parse command line arguments
     import argparse
     parser = argparse.ArgumentParser(description='VezylTranslator')
     parser.add_argument('--app-dir', help='Application directory path')
     parser.add_argument('--quiet-startup', action='store_true', help='Start silently')
+    parser.add_argument('--serve', action='store_true', help='Run the headless localhost translation API')
+    parser.add_argument('--host', default=constant.ServerSettings.HOST, help='Loopback address for --serve')
+    parser.add_argument('--port', type=int, default=constant.ServerSettings.PORT, help='Port for --serve')
+    parser.add_argument('--max-concurrency', type=int, default=constant.ServerSettings.MAX_CONCURRENCY,
+                        help='Concurrent translations for --serve')
     args, unknown = parser.parse_known_args()
     
     # Change to the application directory if specified
@@ -704,6 +802,12 @@ def main():
         except Exception as e:
             print(f"Failed to set working directory: {e}")
     
+    # Headless mode: no Tk window, tray or clipboard watcher
+    if args.serve:
+        from VezylTranslatorProton.server import run_server
+        run_server(args.host, args.port, args.max_concurrency)
+        return
+    
     # Kiểm tra các file cần thiết trước khi khởi động
     if not check_required_files():
         # Nếu thiếu file, thoát chương trình
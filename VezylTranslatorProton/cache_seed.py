@@ -0,0 +1,55 @@
+"""
+Translation Cache Seeding for VezylTranslator
+Fills the translation cache from favorites and history after startup
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Favorites store both texts. History entries written before original_text was
+recorded have no source text and are skipped.
+"""
+
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from VezylTranslatorNeutron import constant
+from VezylTranslatorNeutron.scheduler_service import TaskPriority, get_scheduler
+
+
+def load_seed_pairs(language_interface: str, theme_interface: str) -> List[Tuple[str, str, str, str]]:
+    """(original, translation, src_lang, dest_lang) pairs: favorites first, then history, newest first"""
+    from .storage import get_storage_manager
+    storage = get_storage_manager()
+
+    favorites = storage.read_favorite_entries(constant.FAVORITE_LOG_FILE, language_interface, theme_interface)
+    history = storage.read_history_entries(constant.TRANSLATE_LOG_FILE, language_interface, theme_interface)
+
+    pairs = [(entry.original_text, entry.translated_text, entry.src_lang, entry.dest_lang)
+             for entry in reversed(favorites)]
+    pairs.extend((entry.original_text, entry.last_translated_text, entry.src_lang, entry.dest_lang)
+                 for entry in reversed(history) if entry.original_text)
+    return pairs
+
+
+def seed_translation_cache(language_interface: str, theme_interface: str, model: Optional[str] = None,
+                           profiles: Tuple[Optional[str], ...] = (None,)) -> int:
+    """Read favorites and history and add their translations to the engine cache"""
+    from .translator import get_translation_engine
+
+    started = time.perf_counter()
+    try:
+        pairs = load_seed_pairs(language_interface, theme_interface)
+        seeded = get_translation_engine().seed_cache(pairs, model, profiles)
+    except Exception as e:
+        print(f"[WARNING] Translation cache seeding failed: {e}")
+        return 0
+    print(f"[OK] Seeded translation cache with {seeded} entries from {len(pairs)} favorites/history items "
+          f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return seeded
+
+
+def start_cache_seeding(language_interface: str, theme_interface: str, model: Optional[str] = None,
+                        profiles: Tuple[Optional[str], ...] = (None,)) -> Future:
+    """Seed the cache on the scheduler at background priority"""
+    return get_scheduler().submit(seed_translation_cache, language_interface, theme_interface, model, profiles,
+                                  priority=TaskPriority.BACKGROUND, key="cache_seed")
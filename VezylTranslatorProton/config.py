@@ -10,7 +10,7 @@ import json
 import toml
 import configparser
 import base64
-from typing import Dict, Any, Optional, Union, List
+from typing import Dict, Any, Optional, Union, List, Tuple
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
@@ -35,6 +35,8 @@ class AppConfig:
     always_show_transtale: bool = True
     dest_lang: str = 'vi'
     translation_model: str = 'google'
+    translation_profile: str = 'balanced'  # Homepage and batch jobs (instant/balanced/quality)
+    popup_translation_profile: str = 'instant'
     translation_models: Dict[str, str] = field(default_factory=lambda: {
         "google": "🌐 Google Translator",
         "deepl": "🔬 DeepL Translator", 
@@ -100,16 +102,47 @@ class AdvancedConfig:
     auto_download_models: bool = True
     max_concurrent_models: int = 2
     enable_model_cache: bool = True
+    worker_processes: int = 0  # 0 keeps Marian inference in-process
+    worker_affinity: str = ""  # e.g. "en-vi:0,1; vi-en:2"
+    batch_window_ms: float = 10.0  # Micro-batching window (0 = disabled)
+    max_batch_size: int = 8
     
     # Performance settings  
     lazy_load_transformers: bool = True
     model_load_timeout: int = 30
     debug_marian: bool = False
+    inference_threads: str = "auto"  # "auto" or a fixed thread count
+    inference_interop_threads: int = 1  # 0 keeps the torch default
+    calibrated_inference_threads: int = 0  # Persisted result of "auto" calibration
+    placeholder_masking: bool = True  # Send URLs, paths and code as placeholders
+    stage_timings: bool = False  # Record per-stage timings of each translation
+    stage_timings_log: bool = False  # Print one timing line per translation
+    memory_soft_limit_mb: int = constant.PerformanceSettings.MEMORY_SOFT_LIMIT_MB  # RSS above which caches are shed (0 = no memory governor)
+    memory_hard_limit_mb: int = constant.PerformanceSettings.MEMORY_HARD_LIMIT_MB  # RSS above which Marian models are unloaded too
     
     # Fallback settings
     auto_fallback_to_online: bool = True
     default_fallback_service: str = "google"
     
+    # Self-hosted LibreTranslate-compatible server
+    libretranslate_url: str = ""  # e.g. http://192.168.1.20:5000 (empty = disabled)
+    libretranslate_api_key: str = ""
+    libretranslate_timeout: float = 15.0  # seconds per request
+    libretranslate_pool_size: int = 8  # Persistent connections kept open
+    libretranslate_batch_size: int = 32  # Texts per request (array form of q)
+    
+    # Record/replay providers for offline load testing (VEZYL_REPLAY_* env vars override)
+    replay_mode: str = "off"  # off / record / replay
+    replay_cassette: str = ""  # JSONL recording (empty = local/replay/cassette.jsonl)
+    replay_latency: str = "recorded"  # recorded / none / fixed:MS / uniform:MIN,MAX / normal:MEAN,STD
+    replay_error_rate: float = 0.0  # Share of replayed calls failing with an injected error
+    replay_timeout_rate: float = 0.0  # Share of replayed calls hanging until the timeout
+    replay_miss: str = "error"  # Unrecorded texts: error / echo
+    
+    # Marian decoding policy: [decoding] and [decoding:<src>-<dest>] sections
+    # keyed by language pair ("" = global)
+    decoding_overrides: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    
 
 class ConfigManager:
     """Unified configuration manager for all config types"""
@@ -310,6 +343,10 @@ class ConfigManager:
                     default_config.auto_download_models = section.getboolean('auto_download_models', True)
                     default_config.max_concurrent_models = section.getint('max_concurrent_models', 2)
                     default_config.enable_model_cache = section.getboolean('enable_model_cache', True)
+                    default_config.worker_processes = section.getint('worker_processes', 0)
+                    default_config.worker_affinity = section.get('worker_affinity', '').strip()
+                    default_config.batch_window_ms = section.getfloat('batch_window_ms', 10.0)
+                    default_config.max_batch_size = section.getint('max_batch_size', 8)
                 
                 # Load performance settings
                 if parser.has_section('performance'):
@@ -317,6 +354,14 @@ class ConfigManager:
                     default_config.lazy_load_transformers = section.getboolean('lazy_load_transformers', True)
                     default_config.model_load_timeout = section.getint('model_load_timeout', 30)
                     default_config.debug_marian = section.getboolean('debug_marian', False)
+                    default_config.inference_threads = section.get('inference_threads', 'auto').strip().lower()
+                    default_config.inference_interop_threads = section.getint('inference_interop_threads', 1)
+                    default_config.calibrated_inference_threads = section.getint('calibrated_inference_threads', 0)
+                    default_config.placeholder_masking = section.getboolean('placeholder_masking', True)
+                    default_config.stage_timings = section.getboolean('stage_timings', False)
+                    default_config.stage_timings_log = section.getboolean('stage_timings_log', False)
+                    default_config.memory_soft_limit_mb = section.getint('memory_soft_limit_mb', constant.PerformanceSettings.MEMORY_SOFT_LIMIT_MB)
+                    default_config.memory_hard_limit_mb = section.getint('memory_hard_limit_mb', constant.PerformanceSettings.MEMORY_HARD_LIMIT_MB)
                 
                 # Load fallback settings
                 if parser.has_section('fallback'):
@@ -324,6 +369,33 @@ class ConfigManager:
                     default_config.auto_fallback_to_online = section.getboolean('auto_fallback_to_online', True)
                     default_config.default_fallback_service = section.get('default_fallback_service', 'google')
                 
+                # Load LibreTranslate settings
+                if parser.has_section('libretranslate'):
+                    section = parser['libretranslate']
+                    default_config.libretranslate_url = section.get('url', '').strip().rstrip('/')
+                    default_config.libretranslate_api_key = section.get('api_key', '').strip()
+                    default_config.libretranslate_timeout = section.getfloat('timeout', 15.0)
+                    default_config.libretranslate_pool_size = section.getint('pool_size', 8)
+                    default_config.libretranslate_batch_size = section.getint('batch_size', 32)
+                
+                # Load record/replay settings
+                if parser.has_section('replay'):
+                    section = parser['replay']
+                    default_config.replay_mode = section.get('mode', 'off').strip().lower()
+                    default_config.replay_cassette = section.get('cassette', '').strip()
+                    default_config.replay_latency = section.get('latency', 'recorded').strip().lower()
+                    default_config.replay_error_rate = section.getfloat('error_rate', 0.0)
+                    default_config.replay_timeout_rate = section.getfloat('timeout_rate', 0.0)
+                    default_config.replay_miss = section.get('miss', 'error').strip().lower()
+                
+                # Load decoding policy settings (global and per language pair)
+                for section_name in parser.sections():
+                    if section_name == 'decoding' or section_name.startswith('decoding:'):
+                        pair = section_name.partition(':')[2].strip()
+                        default_config.decoding_overrides[pair] = {
+                            key: value.strip() for key, value in parser[section_name].items()
+                        }
+                
                 print("[OK] Advanced config loaded successfully")
             else:
                 print("[INFO] Advanced config file not found, using defaults")
@@ -350,18 +422,54 @@ class ConfigManager:
             parser.set('marian_mt', 'auto_download_models', str(config.auto_download_models).lower())
             parser.set('marian_mt', 'max_concurrent_models', str(config.max_concurrent_models))
             parser.set('marian_mt', 'enable_model_cache', str(config.enable_model_cache).lower())
+            parser.set('marian_mt', 'worker_processes', str(config.worker_processes))
+            parser.set('marian_mt', 'worker_affinity', config.worker_affinity)
+            parser.set('marian_mt', 'batch_window_ms', str(config.batch_window_ms))
+            parser.set('marian_mt', 'max_batch_size', str(config.max_batch_size))
             
             # Performance section
             parser.add_section('performance')
             parser.set('performance', 'lazy_load_transformers', str(config.lazy_load_transformers).lower())
             parser.set('performance', 'model_load_timeout', str(config.model_load_timeout))
             parser.set('performance', 'debug_marian', str(config.debug_marian).lower())
+            parser.set('performance', 'inference_threads', str(config.inference_threads))
+            parser.set('performance', 'inference_interop_threads', str(config.inference_interop_threads))
+            parser.set('performance', 'calibrated_inference_threads', str(config.calibrated_inference_threads))
+            parser.set('performance', 'placeholder_masking', str(config.placeholder_masking).lower())
+            parser.set('performance', 'stage_timings', str(config.stage_timings).lower())
+            parser.set('performance', 'stage_timings_log', str(config.stage_timings_log).lower())
+            parser.set('performance', 'memory_soft_limit_mb', str(config.memory_soft_limit_mb))
+            parser.set('performance', 'memory_hard_limit_mb', str(config.memory_hard_limit_mb))
             
             # Fallback section
             parser.add_section('fallback')
             parser.set('fallback', 'auto_fallback_to_online', str(config.auto_fallback_to_online).lower())
             parser.set('fallback', 'default_fallback_service', config.default_fallback_service)
             
+            # LibreTranslate section
+            parser.add_section('libretranslate')
+            parser.set('libretranslate', 'url', config.libretranslate_url)
+            parser.set('libretranslate', 'api_key', config.libretranslate_api_key)
+            parser.set('libretranslate', 'timeout', str(config.libretranslate_timeout))
+            parser.set('libretranslate', 'pool_size', str(config.libretranslate_pool_size))
+            parser.set('libretranslate', 'batch_size', str(config.libretranslate_batch_size))
+            
+            # Record/replay section
+            parser.add_section('replay')
+            parser.set('replay', 'mode', config.replay_mode)
+            parser.set('replay', 'cassette', config.replay_cassette)
+            parser.set('replay', 'latency', config.replay_latency)
+            parser.set('replay', 'error_rate', str(config.replay_error_rate))
+            parser.set('replay', 'timeout_rate', str(config.replay_timeout_rate))
+            parser.set('replay', 'miss', config.replay_miss)
+            
+            # Decoding sections
+            for pair, settings in config.decoding_overrides.items():
+                section_name = f"decoding:{pair}" if pair else "decoding"
+                parser.add_section(section_name)
+                for key, value in settings.items():
+                    parser.set(section_name, key, str(value))
+            
             # Write to file
             with open(self.advanced_config_file, 'w', encoding='utf-8') as f:
                 parser.write(f)
@@ -591,6 +699,74 @@ def is_debug_marian_enabled() -> bool:
     return get_advanced_config().debug_marian
 
 
+def is_placeholder_masking_enabled() -> bool:
+    """Check if non-linguistic spans are masked before translation"""
+    return get_advanced_config().placeholder_masking
+
+
+def get_memory_limits() -> Tuple[int, int]:
+    """Get (soft, hard) RSS budgets in MB for the memory governor"""
+    config = get_advanced_config()
+    return config.memory_soft_limit_mb, config.memory_hard_limit_mb
+
+
+def get_marian_worker_processes() -> int:
+    """Get number of Marian worker processes (0 = in-process only)"""
+    return get_advanced_config().worker_processes
+
+
+def get_marian_worker_affinity() -> str:
+    """Get Marian worker affinity per language pair"""
+    return get_advanced_config().worker_affinity
+
+
+def get_marian_batch_window_ms() -> float:
+    """Get Marian micro-batching window in milliseconds (0 = disabled)"""
+    return get_advanced_config().batch_window_ms
+
+
+def get_marian_max_batch_size() -> int:
+    """Get maximum number of requests in one Marian micro-batch"""
+    return max(1, get_advanced_config().max_batch_size)
+
+
+def get_inference_threads() -> str:
+    """Get Marian inference thread setting ("auto" or a thread count)"""
+    return get_advanced_config().inference_threads
+
+
+def get_inference_interop_threads() -> int:
+    """Get torch inter-op thread count (0 = torch default)"""
+    return get_advanced_config().inference_interop_threads
+
+
+def get_calibrated_inference_threads() -> int:
+    """Get thread count found by the last "auto" calibration (0 = not calibrated)"""
+    return get_advanced_config().calibrated_inference_threads
+
+
+def update_calibrated_inference_threads(threads: int) -> bool:
+    """Persist the calibrated Marian inference thread count"""
+    return get_config_manager().set_config_value('calibrated_inference_threads', threads, 'advanced')
+
+
+def get_decoding_settings(pair: str = "") -> Dict[str, str]:
+    """Get raw decoding settings for a language pair ("" = global section)"""
+    return dict(get_advanced_config().decoding_overrides.get(pair, {}))
+
+
+def get_libretranslate_settings() -> Dict[str, Any]:
+    """Get LibreTranslate server settings (empty url = disabled)"""
+    config = get_advanced_config()
+    return {
+        "url": config.libretranslate_url,
+        "api_key": config.libretranslate_api_key,
+        "timeout": config.libretranslate_timeout,
+        "pool_size": max(1, config.libretranslate_pool_size),
+        "batch_size": max(1, config.libretranslate_batch_size),
+    }
+
+
 def get_fallback_service() -> str:
     """Get default fallback translation service"""
     return get_advanced_config().default_fallback_service
@@ -0,0 +1,455 @@
+"""
+Document Translation for VezylTranslator
+Translates the text of Markdown and HTML documents while keeping their markup intact
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import html
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .masking import (
+    DEFAULT_PLACEHOLDER_TEMPLATE, MaskedText, is_linguistic, split_at_placeholders, strip_placeholders, unmask_text
+)
+
+# Pending text (characters) collected before one batch_translate call
+DEFAULT_BATCH_CHARS = 4000
+
+DOCUMENT_FORMATS = ("markdown", "html", "text")
+
+# Elements whose content is code or data, never prose
+_HTML_SKIP_TAGS = {"script", "style", "code", "pre", "kbd", "samp", "var", "textarea", "svg", "math", "template"}
+
+# Elements that sit inside a sentence: their text is translated with the surrounding text
+_HTML_INLINE_TAGS = {
+    "a", "abbr", "b", "bdi", "bdo", "br", "cite", "code", "data", "dfn", "em", "font", "i", "img", "kbd",
+    "mark", "q", "s", "samp", "small", "span", "strong", "sub", "sup", "time", "u", "var", "wbr",
+}
+
+# Bare URLs inside text are kept out of the translation
+_URL = re.compile(r"\b(?:https?|ftp)://[^\s<>\"'`\[\]()]+[^\s<>\"'`\[\]().,;:!?]")
+
+_HTML_TAG = re.compile(r"<(?:p|div|span|a|b|i|em|strong|ul|ol|li|h[1-6]|table|tr|td|th|br|img|section|article|"
+                       r"header|footer|nav|body|html|head|title|label|button|form|input)\b[^>]*>", re.IGNORECASE)
+_MD_FEATURES = (
+    re.compile(r"^#{1,6}\s+\S", re.MULTILINE),         # Headings
+    re.compile(r"^\s*(?:```|~~~)", re.MULTILINE),      # Fenced code
+    re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+\S", re.MULTILINE),  # Lists
+    re.compile(r"!?\[[^\]\n]+\]\([^)\s]+\)"),          # Links and images
+    re.compile(r"^\s*>\s", re.MULTILINE),              # Block quotes
+    re.compile(r"^\s*\|.*\|\s*$", re.MULTILINE),       # Tables
+    re.compile(r"(\*\*|__)\S.*?\S\1"),                 # Bold
+)
+
+# Markdown block structure
+_MD_FENCE = re.compile(r"^\s*(```|~~~)")
+_MD_VERBATIM_LINE = re.compile(r"^\s*(?:[-*_=]\s*){3,}$|^\s*\|?\s*:?-{2,}:?\s*(?:\|\s*:?-{2,}:?\s*)*\|?\s*$"
+                               r"|^\s*\[[^\]]+\]:\s*\S+|^\s*<[^>]+>\s*$")
+_MD_PREFIX = re.compile(r"^(\s*(?:>\s*)*(?:#{1,6}\s+|[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)?)(.*?)(\s*)$", re.DOTALL)
+_MD_TABLE_CELL = re.compile(r"((?:\\\||[^|])+)")
+# Link and image syntax around the link text: "[" / "](target)" / "][ref]", and <autolinks>
+_MD_INLINE_MARKUP = re.compile(r"!?\[(?=[^\]\n]*\][(\[])|\]\([^)\n]*\)|\]\[[^\]\n]*\]|<(?:https?|ftp|mailto):[^>\s]+>")
+
+
+@dataclass
+class TextNode:
+    """Translatable text with the whitespace around it (inline markup replaced by placeholders)"""
+    leading: str
+    text: str
+    trailing: str
+    escape_html: bool = False
+    spans: Tuple[str, ...] = ()  # Inline markup and URLs behind the placeholders in text
+    template: str = DEFAULT_PLACEHOLDER_TEMPLATE
+
+    def restore(self, translated: str) -> Optional[str]:
+        """Put the inline markup back into a translation. Returns None if a placeholder was lost"""
+        if self.escape_html:
+            translated = html.escape(translated, quote=False)
+        if not self.spans:
+            return translated
+        return unmask_text(translated, MaskedText(text=self.text, spans=list(self.spans), template=self.template))
+
+
+DocumentToken = Union[str, TextNode]
+
+# Piece of an inline run: (is_markup, content)
+_RunPiece = Tuple[bool, str]
+
+
+def _run_tokens(pieces: List[_RunPiece], template: str = DEFAULT_PLACEHOLDER_TEMPLATE,
+                escape_html: bool = False) -> List[DocumentToken]:
+    """Turn a run of text and inline markup into one node, or keep it verbatim if there is nothing to translate"""
+    split: List[_RunPiece] = []
+    for is_markup, content in pieces:
+        if is_markup:
+            split.append((True, content))
+            continue
+        position = 0
+        for match in _URL.finditer(content):
+            split.append((False, content[position:match.start()]))
+            split.append((True, html.escape(match.group(), quote=False) if escape_html else match.group()))
+            position = match.end()
+        split.append((False, content[position:]))
+
+    # Merge neighbours so each stretch of markup becomes a single placeholder
+    merged: List[_RunPiece] = []
+    for is_markup, content in split:
+        if merged and merged[-1][0] == is_markup:
+            merged[-1] = (is_markup, merged[-1][1] + content)
+        elif content:
+            merged.append((is_markup, content))
+
+    def verbatim(run: List[_RunPiece]) -> str:
+        return "".join(content if is_markup or not escape_html else html.escape(content, quote=False)
+                       for is_markup, content in run)
+
+    # Markup at the edges stays outside the node
+    start, end = 0, len(merged)
+    while start < end and merged[start][0]:
+        start += 1
+    while end > start and merged[end - 1][0]:
+        end -= 1
+    leading, trailing = verbatim(merged[:start]), verbatim(merged[end:])
+
+    spans: List[str] = []
+    parts = []
+    for is_markup, content in merged[start:end]:
+        if is_markup:
+            parts.append(template.format(len(spans)))
+            spans.append(content)
+        else:
+            parts.append(content)
+    text = "".join(parts)
+    stripped = text.strip()
+    if not is_linguistic(stripped, template):
+        return [leading + verbatim(merged[start:end]) + trailing]
+    first = text.index(stripped[0])
+    return [leading, TextNode(text[:first], stripped, text[first + len(stripped):], escape_html,
+                              tuple(spans), template), trailing]
+
+
+def _text_node(raw: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> List[DocumentToken]:
+    """Tokens for plain text (URLs kept out of the translation)"""
+    return _run_tokens([(False, raw)], template)
+
+
+def _markdown_tokens(raw: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> List[DocumentToken]:
+    """Tokens for Markdown inline text: link targets and autolinks become placeholders"""
+    pieces: List[_RunPiece] = []
+    position = 0
+    for match in _MD_INLINE_MARKUP.finditer(raw):
+        pieces.append((False, raw[position:match.start()]))
+        pieces.append((True, match.group()))
+        position = match.end()
+    pieces.append((False, raw[position:]))
+    return _run_tokens(pieces, template)
+
+
+def detect_document_format(text: str) -> str:
+    """Guess whether text is Markdown, HTML or plain text"""
+    sample = text[:20000]
+    if len(_HTML_TAG.findall(sample)) >= 2 and re.search(r"</\w+>", sample):
+        return "html"
+    if sum(1 for pattern in _MD_FEATURES if pattern.search(sample)) >= 2:
+        return "markdown"
+    return "text"
+
+
+# === Tokenizers ===
+
+class _HTMLTokenizer(HTMLParser):
+    """Split HTML into verbatim markup and text nodes; inline elements stay inside their sentence"""
+
+    def __init__(self, template: str = DEFAULT_PLACEHOLDER_TEMPLATE):
+        super().__init__(convert_charrefs=True)
+        self.tokens: List[DocumentToken] = []
+        self.template = template
+        self._run: List[_RunPiece] = []  # Text and inline markup of the current sentence
+        self._skip_depth = 0
+        self._skip_inline = False  # Skipped element (e.g. <code>) inside a run: its content is markup
+
+    def _markup(self, markup: str):
+        if self._run or self._skip_inline:
+            self._run.append((True, markup))
+        else:
+            self.tokens.append(markup)
+
+    def _flush_run(self):
+        if self._run:
+            self.tokens.extend(_run_tokens(self._run, self.template, escape_html=True))
+            self._run = []
+
+    def handle_starttag(self, tag, attrs):
+        if not self._skip_depth:
+            if tag in _HTML_INLINE_TAGS:
+                self._skip_inline = tag in _HTML_SKIP_TAGS
+                self._run.append((True, self.get_starttag_text()))
+            else:
+                self._flush_run()
+                self.tokens.append(self.get_starttag_text())
+        else:
+            self._markup(self.get_starttag_text())
+        if tag in _HTML_SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if not self._skip_depth and tag in _HTML_INLINE_TAGS:
+            self._run.append((True, self.get_starttag_text()))
+        else:
+            if not self._skip_depth:
+                self._flush_run()
+            self._markup(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+            self._markup(f"</{tag}>")
+            if not self._skip_depth:
+                self._skip_inline = False
+        elif not self._skip_depth and tag in _HTML_INLINE_TAGS:
+            self._run.append((True, f"</{tag}>"))
+        else:
+            if not self._skip_depth:
+                self._flush_run()
+            self._markup(f"</{tag}>")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            self._markup(html.escape(data, quote=False) if self.cdata_elem is None else data)
+        else:
+            self._run.append((False, data))
+
+    def handle_comment(self, data):
+        self._markup(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._flush_run()
+        self.tokens.append(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._flush_run()
+        self.tokens.append(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._flush_run()
+        self.tokens.append(f"<![{data}]>")
+
+    def close(self):
+        super().close()
+        self._flush_run()
+
+    def take(self) -> List[DocumentToken]:
+        """Return tokens parsed so far (an unfinished inline run stays pending)"""
+        tokens, self.tokens = self.tokens, []
+        return tokens
+
+
+def tokenize_html(chunks: Iterable[str], template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> Iterator[DocumentToken]:
+    """Tokenize HTML incrementally, chunk by chunk"""
+    parser = _HTMLTokenizer(template)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.take()
+    parser.close()
+    yield from parser.take()
+
+
+def _iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-split arbitrary chunks into lines (keeping line endings)"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _markdown_line_tokens(line: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> List[DocumentToken]:
+    """Tokenize one Markdown line: block prefix kept, content translated"""
+    body = line.rstrip("\r\n")
+    ending = line[len(body):]
+
+    if "|" in body and body.strip().startswith("|"):
+        # Table row: translate each cell
+        tokens: List[DocumentToken] = []
+        position = 0
+        for match in _MD_TABLE_CELL.finditer(body):
+            tokens.append(body[position:match.start()])
+            tokens.extend(_markdown_tokens(match.group(), template))
+            position = match.end()
+        tokens.append(body[position:] + ending)
+        return tokens
+
+    prefix, content, trailing = _MD_PREFIX.match(body).groups()
+    return [prefix, *_markdown_tokens(content, template), trailing + ending]
+
+
+def tokenize_markdown(chunks: Iterable[str], template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> Iterator[DocumentToken]:
+    """Tokenize Markdown line by line; code blocks and markup-only lines are kept verbatim"""
+    fence: Optional[str] = None
+    paragraph: List[str] = []
+    previous_blank = True
+
+    def flush_paragraph() -> Iterator[DocumentToken]:
+        # Soft-wrapped paragraph lines are translated as one sentence-complete node
+        if paragraph:
+            ending = paragraph[-1][len(paragraph[-1].rstrip("\r\n")):] or ""
+            joined = " ".join(line.strip() for line in paragraph)
+            indent = paragraph[0][:len(paragraph[0]) - len(paragraph[0].lstrip())]
+            paragraph.clear()
+            yield indent
+            yield from _markdown_tokens(joined, template)
+            yield ending
+
+    for line in _iter_lines(chunks):
+        fence_match = _MD_FENCE.match(line)
+        if fence is not None:
+            yield line
+            if fence_match and fence_match.group(1) == fence:
+                fence = None
+            continue
+        if fence_match:
+            yield from flush_paragraph()
+            fence = fence_match.group(1)
+            yield line
+            continue
+
+        blank = not line.strip()
+        indented_code = previous_blank and not paragraph and line.startswith(("    ", "\t")) and not blank
+        plain = (not blank and not indented_code and not _MD_VERBATIM_LINE.match(line)
+                 and _MD_PREFIX.match(line.rstrip("\r\n")).group(1) == ""
+                 and not line.lstrip().startswith("|"))
+
+        if plain:
+            paragraph.append(line)
+        else:
+            yield from flush_paragraph()
+            if blank or indented_code or _MD_VERBATIM_LINE.match(line):
+                yield line
+            else:
+                yield from _markdown_line_tokens(line, template)
+        previous_blank = blank and not paragraph
+
+    yield from flush_paragraph()
+    if fence is not None:
+        print("[WARNING] Markdown document ends inside a code block")
+
+
+def tokenize_text(chunks: Iterable[str], template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> Iterator[DocumentToken]:
+    """Tokenize plain text line by line"""
+    for line in _iter_lines(chunks):
+        body = line.rstrip("\r\n")
+        yield from _text_node(body, template)
+        yield line[len(body):]
+
+
+_TOKENIZERS = {"markdown": tokenize_markdown, "html": tokenize_html, "text": tokenize_text}
+
+
+def extract_document_text(text: str, doc_format: str = None) -> str:
+    """Translatable text of a document without its markup (e.g. for language detection)"""
+    doc_format = doc_format or detect_document_format(text)
+    return "\n".join(strip_placeholders(token.text, token.template)
+                     for token in _TOKENIZERS[doc_format]([text]) if isinstance(token, TextNode))
+
+
+# === Translation ===
+
+def _render(tokens: List[DocumentToken], translations: Dict[str, str]) -> str:
+    """Reassemble tokens with translated text"""
+    parts = []
+    for token in tokens:
+        if isinstance(token, TextNode):
+            translated = token.restore(translations.get(token.text, token.text))
+            if translated is None:
+                translated = token.restore(token.text)
+            parts.append(token.leading + translated + token.trailing)
+        else:
+            parts.append(token)
+    return "".join(parts)
+
+
+def translate_document(chunks: Iterable[str], doc_format: str, dest_lang: str, src_lang: str = "auto",
+                       model: str = None, profile: str = None,
+                       batch_chars: int = DEFAULT_BATCH_CHARS, cancel_token=None) -> Iterator[str]:
+    """
+    Translate a document given as chunks of text, yielding translated output as it is ready
+
+    Text nodes are collected until about `batch_chars` characters are pending,
+    then the distinct ones go through one batch_translate call and that part
+    of the document is reassembled and yielded. Only one window of the
+    document is held in memory. Inline markup and URLs travel as placeholders;
+    if the provider loses one, the text between them is translated piecewise.
+    """
+    from .translator import get_translation_engine
+    if doc_format not in _TOKENIZERS:
+        raise ValueError(f"Unsupported document format: {doc_format}")
+    engine = get_translation_engine()
+    template = engine.get_placeholder_template(model, profile)
+
+    window: List[DocumentToken] = []
+    pending: Dict[str, TextNode] = {}  # Distinct texts in this window, in order
+    pending_chars = 0
+
+    def flush() -> str:
+        nonlocal pending_chars
+        texts = list(pending)
+        translations = {}
+        if texts:
+            results = engine.batch_translate(texts, src_lang, dest_lang, model, profile=profile,
+                                             cancel_token=cancel_token)
+            translations = {text: result.text for text, result in zip(texts, results) if not result.error}
+            translations.update(translate_segments([
+                pending[text] for text in translations
+                if pending[text].spans and pending[text].restore(translations[text]) is None
+            ]))
+        output = _render(window, translations)
+        window.clear()
+        pending.clear()
+        pending_chars = 0
+        return output
+
+    def translate_segments(nodes: List[TextNode]) -> Dict[str, str]:
+        # Placeholders lost in translation: translate the text between them on its own
+        if not nodes:
+            return {}
+        print(f"[WARNING] Inline markup lost in {len(nodes)} translation(s), translating around it instead")
+        split = {node.text: split_at_placeholders(node.text, node.template) for node in nodes}
+        segments = list(dict.fromkeys(segment.strip() for parts in split.values() for segment in parts[::2]
+                                      if is_linguistic(segment, template)))
+        results = engine.batch_translate(segments, src_lang, dest_lang, model, profile=profile,
+                                         cancel_token=cancel_token) if segments else []
+        translated = {segment: result.text for segment, result in zip(segments, results) if not result.error}
+
+        def translate_part(part: str) -> str:
+            stripped = part.strip()
+            if stripped not in translated:
+                return part
+            start = part.index(stripped[0])
+            return part[:start] + translated[stripped] + part[start + len(stripped):]
+
+        return {text: "".join(translate_part(part) if index % 2 == 0 else part for index, part in enumerate(parts))
+                for text, parts in split.items()}
+
+    for token in _TOKENIZERS[doc_format](chunks, template):
+        window.append(token)
+        if isinstance(token, TextNode) and token.text not in pending:
+            pending[token.text] = token
+            pending_chars += len(token.text)
+            if pending_chars >= batch_chars:
+                yield flush()
+    if window:
+        yield flush()
+
+
+def translate_document_text(text: str, dest_lang: str, src_lang: str = "auto", model: str = None,
+                            profile: str = None, doc_format: str = None, cancel_token=None) -> str:
+    """Translate a whole Markdown/HTML/plain document held in a string"""
+    doc_format = doc_format or detect_document_format(text)
+    return "".join(translate_document([text], doc_format, dest_lang, src_lang, model, profile,
+                                      cancel_token=cancel_token))
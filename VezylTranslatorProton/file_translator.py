@@ -0,0 +1,443 @@
+"""
+File Translator for VezylTranslator
+Streams .txt, .jsonl and .csv files through the translation engine with resumable checkpoints
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Usage:
+    python VezylTranslator.py translate-file input.jsonl --dest vi --fields text,title
+Rerunning the same command after an interruption resumes from the last checkpoint.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from VezylTranslatorNeutron.constant import PerformanceSettings
+from .profiles import DEFAULT_TRANSLATION_PROFILE, TRANSLATION_PROFILES
+from .subtitles import SUBTITLE_FORMATS
+
+FILE_FORMATS = ("txt", "jsonl", "csv")
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class _Record:
+    """One input record: the texts to translate and what is needed to write it back"""
+    texts: List[str]
+    data: Any
+    ending: str = "\n"
+
+
+@dataclass
+class _Batch:
+    """Records read together, with the input offset just past the last one"""
+    records: List[_Record]
+    end_offset: int
+
+
+@dataclass
+class FileTranslationStats:
+    """Progress of a translate-file job"""
+    records: int = 0
+    failed: int = 0
+    resumed_from: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def lines_per_second(self) -> float:
+        return (self.records - self.resumed_from) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# === Input formats ===
+
+class _LineReader:
+    """Read decoded lines from a binary file while tracking the byte offset"""
+
+    def __init__(self, handle, offset: int):
+        self.handle = handle
+        self.offset = offset
+        handle.seek(offset)
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            raw = self.handle.readline()
+            if not raw:
+                return
+            if self.offset == 0 and raw.startswith(b"\xef\xbb\xbf"):
+                raw_text = raw[3:].decode("utf-8")
+            else:
+                raw_text = raw.decode("utf-8")
+            self.offset += len(raw)
+            yield raw_text
+
+
+def _split_ending(line: str) -> Tuple[str, str]:
+    body = line.rstrip("\r\n")
+    return body, line[len(body):]
+
+
+class _TextFormat:
+    """Plain text: every line is translated on its own"""
+
+    def __init__(self, fields: List[str]):
+        self.fields = fields
+
+    def header(self, handle) -> str:
+        return ""
+
+    def records(self, lines: _LineReader) -> Iterator[Tuple[_Record, int]]:
+        for line in lines:
+            body, ending = _split_ending(line)
+            yield _Record([body], None, ending), lines.offset
+
+    def render(self, record: _Record, translated: List[str]) -> str:
+        return translated[0] + record.ending
+
+
+class _JsonlFormat(_TextFormat):
+    """JSON Lines: string values of the selected fields are translated in place"""
+
+    def records(self, lines: _LineReader) -> Iterator[Tuple[_Record, int]]:
+        for line in lines:
+            body, ending = _split_ending(line)
+            try:
+                data = json.loads(body) if body.strip() else None
+            except ValueError:
+                data = None
+                print(f"[WARNING] Invalid JSON line kept as is at byte {lines.offset - len(line.encode('utf-8'))}")
+            if not isinstance(data, dict):
+                yield _Record([], body, ending), lines.offset
+                continue
+            keys = [key for key in self.fields if isinstance(data.get(key), str)]
+            yield _Record([data[key] for key in keys], (data, keys), ending), lines.offset
+
+    def render(self, record: _Record, translated: List[str]) -> str:
+        if not record.texts:
+            return record.data + record.ending
+        data, keys = record.data
+        for key, text in zip(keys, translated):
+            data[key] = text
+        return json.dumps(data, ensure_ascii=False) + record.ending
+
+
+class _CsvFormat(_TextFormat):
+    """CSV with a header row: the selected columns are translated"""
+
+    def __init__(self, fields: List[str]):
+        super().__init__(fields)
+        self.columns: List[int] = []
+
+    def header(self, handle) -> str:
+        lines = _LineReader(handle, 0)
+        row = next(csv.reader(iter(lines)), None)
+        if row is None:
+            return ""
+        missing = [name for name in self.fields if name not in row]
+        if missing:
+            raise ValueError(f"CSV columns not found: {', '.join(missing)} (header: {', '.join(row)})")
+        self.columns = [row.index(name) for name in self.fields]
+        self.header_offset = lines.offset
+        return self._format_row(row)
+
+    def records(self, lines: _LineReader) -> Iterator[Tuple[_Record, int]]:
+        for row in csv.reader(iter(lines)):
+            indexes = [index for index in self.columns if index < len(row)]
+            yield _Record([row[index] for index in indexes], (row, indexes)), lines.offset
+
+    def render(self, record: _Record, translated: List[str]) -> str:
+        row, indexes = record.data
+        for index, text in zip(indexes, translated):
+            row[index] = text
+        return self._format_row(row)
+
+    @staticmethod
+    def _format_row(row: List[str]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(row)
+        return buffer.getvalue()
+
+
+_FORMATS = {"txt": _TextFormat, "jsonl": _JsonlFormat, "csv": _CsvFormat}
+
+
+def detect_file_format(path: str) -> str:
+    """Guess the file format from its extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension in ("csv",) + SUBTITLE_FORMATS:
+        return extension
+    return "txt"
+
+
+# === Translation ===
+
+class FileTranslator:
+    """
+    Translate a file record by record without loading it into memory
+
+    Records are read in batches, and up to `concurrency` batches are
+    translated at once while output is written strictly in input order. The
+    checkpoint stores the input offset and output size of the last flushed
+    batch, so a rerun truncates any partial output and continues from there.
+    """
+
+    def __init__(self, input_path: str, output_path: str, dest_lang: str, src_lang: str = "auto",
+                 model: Optional[str] = None, profile: Optional[str] = None, file_format: Optional[str] = None,
+                 fields: Optional[List[str]] = None, checkpoint_path: Optional[str] = None,
+                 batch_size: int = PerformanceSettings.FILE_TRANSLATE_BATCH_SIZE,
+                 concurrency: int = PerformanceSettings.FILE_TRANSLATE_CONCURRENCY):
+        self.input_path = os.path.abspath(input_path)
+        self.output_path = os.path.abspath(output_path)
+        self.checkpoint_path = checkpoint_path or self.output_path + ".checkpoint.json"
+        self.file_format = file_format or detect_file_format(input_path)
+        if self.file_format not in _FORMATS:
+            raise ValueError(f"Unsupported file format: {self.file_format}")
+        self.fields = fields or ["text"]
+        self.dest_lang = dest_lang
+        self.src_lang = src_lang
+        self.model = model
+        self.profile = profile
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.stats = FileTranslationStats()
+        self._cancel_token = None
+
+    # === Checkpoints ===
+
+    def _job_signature(self) -> Dict[str, Any]:
+        """Settings a checkpoint is only valid for"""
+        stat = os.stat(self.input_path)
+        return {
+            "version": CHECKPOINT_VERSION,
+            "input": self.input_path,
+            "input_size": stat.st_size,
+            "input_mtime": stat.st_mtime,
+            "format": self.file_format,
+            "fields": self.fields,
+            "src": self.src_lang,
+            "dest": self.dest_lang,
+            "model": self.model,
+            "profile": self.profile,
+        }
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Get the saved position if it belongs to this job"""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Ignoring unreadable checkpoint: {e}")
+            return None
+        signature = self._job_signature()
+        if any(checkpoint.get(key) != value for key, value in signature.items()):
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to a different job; "
+                             f"use --restart to start over")
+        if (not os.path.exists(self.output_path)
+                or os.path.getsize(self.output_path) < checkpoint.get("output_offset", 0)):
+            raise ValueError(f"Output {self.output_path} is shorter than the checkpoint; use --restart")
+        return checkpoint
+
+    def _save_checkpoint(self, input_offset: int, output_offset: int):
+        """Atomically record the flushed position"""
+        checkpoint = dict(self._job_signature(), input_offset=input_offset, output_offset=output_offset,
+                          records=self.stats.records, failed=self.stats.failed)
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    # === Pipeline ===
+
+    def _read_batches(self, handle, reader, offset: int) -> Iterator[_Batch]:
+        """Group input records into batches"""
+        records: List[_Record] = []
+        end_offset = offset
+        for record, end_offset in reader.records(_LineReader(handle, offset)):
+            records.append(record)
+            if len(records) >= self.batch_size:
+                yield _Batch(records, end_offset)
+                records = []
+        if records:
+            yield _Batch(records, end_offset)
+
+    def _translate_batch(self, engine, batch: _Batch) -> Tuple[List[List[str]], List[str]]:
+        """Translate the distinct texts of a batch. Returns texts per record and errors"""
+        distinct = list(dict.fromkeys(text for record in batch.records for text in record.texts))
+        translations: Dict[str, str] = {}
+        errors: List[str] = []
+        if distinct:
+            results = engine.batch_translate(distinct, self.src_lang, self.dest_lang, self.model,
+                                             profile=self.profile, cancel_token=self._cancel_token)
+            for text, result in zip(distinct, results):
+                if result.error:
+                    errors.append(result.error)
+                else:
+                    translations[text] = result.text
+        # Failed texts are written untranslated
+        return [[translations.get(text, text) for text in record.texts] for record in batch.records], errors
+
+    def run(self, restart: bool = False, progress_interval: float = 2.0) -> FileTranslationStats:
+        """Translate the file, resuming from the checkpoint unless restart is set"""
+        from VezylTranslatorNeutron.scheduler_service import CancellationToken
+        from .translator import get_translation_engine
+
+        engine = get_translation_engine()
+        reader = _FORMATS[self.file_format](self.fields)
+        self._cancel_token = CancellationToken()
+
+        checkpoint = None if restart else self.load_checkpoint()
+        with open(self.input_path, "rb") as source:
+            header = reader.header(source)
+            if checkpoint:
+                input_offset, output_offset = checkpoint["input_offset"], checkpoint["output_offset"]
+                self.stats.records = self.stats.resumed_from = checkpoint.get("records", 0)
+                self.stats.failed = checkpoint.get("failed", 0)
+                print(f"[INFO] Resuming after {self.stats.records} lines")
+            else:
+                input_offset = getattr(reader, "header_offset", 0)
+                output_offset = 0
+
+            mode = "r+b" if checkpoint else "wb"
+            with open(self.output_path, mode) as output, \
+                    ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="FileTranslator") as pool:
+                output.truncate(output_offset)
+                output.seek(output_offset)
+                if not checkpoint and header:
+                    output.write(header.encode("utf-8"))
+
+                input_size = os.path.getsize(self.input_path)
+                started = last_report = last_checkpoint = time.perf_counter()
+                in_flight = deque()
+                batches = self._read_batches(source, reader, input_offset)
+
+                def write_oldest():
+                    nonlocal last_report, last_checkpoint
+                    batch, future = in_flight.popleft()
+                    translated, errors = future.result()
+                    self.stats.failed += len(errors)
+                    self.stats.errors.extend(errors[:5 - len(self.stats.errors)])
+                    output.write("".join(reader.render(record, texts)
+                                         for record, texts in zip(batch.records, translated)).encode("utf-8"))
+                    self.stats.records += len(batch.records)
+
+                    now = time.perf_counter()
+                    self.stats.elapsed = now - started
+                    if now - last_checkpoint >= PerformanceSettings.FILE_CHECKPOINT_INTERVAL:
+                        output.flush()
+                        self._save_checkpoint(batch.end_offset, output.tell())
+                        last_checkpoint = now
+                    if progress_interval and now - last_report >= progress_interval:
+                        percent = batch.end_offset * 100 / input_size if input_size else 100
+                        print(f"[INFO] {self.stats.records} lines, {self.stats.lines_per_second:.1f} lines/s "
+                              f"({percent:.1f}%)")
+                        last_report = now
+                    return batch
+
+                try:
+                    last_batch = None
+                    for batch in batches:
+                        in_flight.append((batch, pool.submit(self._translate_batch, engine, batch)))
+                        if len(in_flight) >= self.concurrency:
+                            last_batch = write_oldest()
+                    while in_flight:
+                        last_batch = write_oldest()
+                    output.flush()
+                    if last_batch is not None:
+                        self._save_checkpoint(last_batch.end_offset, output.tell())
+                except BaseException:
+                    # Keep the last checkpoint; later output is truncated on resume
+                    self._cancel_token.cancel()
+                    for _, future in in_flight:
+                        future.cancel()
+                    raise
+
+        self.stats.elapsed = time.perf_counter() - started
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return self.stats
+
+
+def default_output_path(input_path: str, dest_lang: str) -> str:
+    """input.jsonl -> input.vi.jsonl"""
+    stem, extension = os.path.splitext(input_path)
+    return f"{stem}.{dest_lang}{extension}"
+
+
+def _translate_subtitles(args, output_path: str) -> int:
+    """Subtitles are small and need cue context, so they are translated whole"""
+    from .subtitles import translate_subtitle_file
+    from .translator import get_translation_engine
+    try:
+        stats = translate_subtitle_file(args.input, output_path, args.dest, args.src, args.model, args.profile,
+                                        concurrency=args.concurrency)
+    finally:
+        get_translation_engine().shutdown()
+    print(f"[OK] Translated {stats.cues} cues ({stats.windows} context windows) to {output_path} "
+          f"in {stats.elapsed:.1f}s")
+    if stats.failed:
+        print(f"[WARNING] {stats.failed} windows failed and were kept untranslated")
+    return 0 if not stats.failed else 2
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for translate-file"""
+    parser = argparse.ArgumentParser(prog="VezylTranslator translate-file",
+                                     description="Translate a .txt, .jsonl or .csv file line by line")
+    parser.add_argument("input", help="Input file")
+    parser.add_argument("-o", "--output", help="Output file (default: <input>.<dest>.<ext>)")
+    parser.add_argument("--dest", required=True, help="Target language code")
+    parser.add_argument("--src", default="auto", help="Source language code")
+    parser.add_argument("--model", help="Translation model (google, marian, ...)")
+    parser.add_argument("--profile", choices=list(TRANSLATION_PROFILES),
+                        help=f"Translation profile (default: {DEFAULT_TRANSLATION_PROFILE})")
+    parser.add_argument("--format", choices=FILE_FORMATS + SUBTITLE_FORMATS, help="Input format (default: from extension)")
+    parser.add_argument("--fields", default="text", help="Comma-separated JSONL keys or CSV columns to translate")
+    parser.add_argument("--batch-size", type=int, default=PerformanceSettings.FILE_TRANSLATE_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=PerformanceSettings.FILE_TRANSLATE_CONCURRENCY)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start over")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.input):
+        print(f"[ERROR] Input file not found: {args.input}")
+        return 1
+
+    output_path = args.output or default_output_path(args.input, args.dest)
+    if (args.format or detect_file_format(args.input)) in SUBTITLE_FORMATS:
+        return _translate_subtitles(args, output_path)
+
+    try:
+        translator = FileTranslator(
+            args.input, output_path, args.dest, args.src,
+            args.model, args.profile, args.format,
+            [name.strip() for name in args.fields.split(",") if name.strip()],
+            args.checkpoint, args.batch_size, args.concurrency
+        )
+        stats = translator.run(restart=args.restart)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted - run the same command again to resume")
+        return 130
+    finally:
+        from .translator import get_translation_engine
+        get_translation_engine().shutdown()
+
+    print(f"[OK] Translated {stats.records} lines to {translator.output_path} "
+          f"in {stats.elapsed:.1f}s ({stats.lines_per_second:.1f} lines/s)")
+    if stats.failed:
+        print(f"[WARNING] {stats.failed} texts failed and were kept untranslated: {stats.errors}")
+    return 0 if not stats.failed else 2
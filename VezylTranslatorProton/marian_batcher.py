@@ -0,0 +1,135 @@
+"""
+Marian Micro-Batcher for VezylTranslator
+Groups concurrent Marian requests for the same model into one padded generate call
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class _BatchRequest:
+    """Single queued request"""
+    __slots__ = ("payload", "future", "enqueued_at")
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MarianMicroBatcher:
+    """
+    Collect requests per batch key for a short window, then run them together
+
+    A batch is flushed when its oldest request has waited `window_ms` or when
+    it reaches `max_batch_size`. Batches run one at a time on a dispatcher
+    thread, so concurrent callers never start competing generate calls.
+    """
+
+    def __init__(self, run_batch: Callable[[Hashable, List[Any]], List[Any]],
+                 window_ms: float = 10.0, max_batch_size: int = 8):
+        self.run_batch = run_batch
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queues: "OrderedDict[Hashable, List[_BatchRequest]]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._dispatch_loop, name="MarianMicroBatcher", daemon=True)
+        self._thread.start()
+
+        # Metrics for tuning the window
+        self._batch_sizes = Counter()
+        self._queue_delays_ms = deque(maxlen=1000)
+        self._batch_times_ms = deque(maxlen=1000)
+
+    def submit(self, key: Hashable, payload: Any) -> Future:
+        """Queue a request and return a future with its result"""
+        request = _BatchRequest(payload)
+        with self._condition:
+            if not self._running:
+                request.future.set_exception(RuntimeError("Micro-batcher is stopped"))
+                return request.future
+            self._queues.setdefault(key, []).append(request)
+            self._condition.notify()
+        return request.future
+
+    def _next_batch(self):
+        """Wait for a batch that is full or whose window expired"""
+        with self._condition:
+            while self._running:
+                now = time.perf_counter()
+                wait = None
+                for key, queue in self._queues.items():
+                    deadline = queue[0].enqueued_at + self.window
+                    if len(queue) >= self.max_batch_size or deadline <= now:
+                        batch = queue[:self.max_batch_size]
+                        del queue[:self.max_batch_size]
+                        if not queue:
+                            del self._queues[key]
+                        else:
+                            self._queues.move_to_end(key)  # Let other models go next
+                        return key, batch
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+                self._condition.wait(timeout=wait)
+        return None, []
+
+    def _dispatch_loop(self):
+        """Run batches until stopped"""
+        while True:
+            key, batch = self._next_batch()
+            if not batch:
+                return
+
+            started = time.perf_counter()
+            for request in batch:
+                self._queue_delays_ms.append((started - request.enqueued_at) * 1000)
+            self._batch_sizes[len(batch)] += 1
+
+            try:
+                results = self.run_batch(key, [request.payload for request in batch])
+                for request, result in zip(batch, results):
+                    request.future.set_result(result)
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+            finally:
+                self._batch_times_ms.append((time.perf_counter() - started) * 1000)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch size distribution and queueing delay"""
+        delays = sorted(self._queue_delays_ms)
+        batches = sum(self._batch_sizes.values())
+        requests = sum(size * count for size, count in self._batch_sizes.items())
+
+        def percentile(values, q):
+            return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batches": batches,
+            "requests": requests,
+            "avg_batch_size": requests / batches if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "queue_delay_p50_ms": percentile(delays, 0.5),
+            "queue_delay_p95_ms": percentile(delays, 0.95),
+            "queue_delay_max_ms": delays[-1] if delays else 0.0,
+            "avg_batch_time_ms": sum(self._batch_times_ms) / len(self._batch_times_ms) if self._batch_times_ms else 0.0,
+        }
+
+    def shutdown(self):
+        """Stop the dispatcher and fail queued requests"""
+        with self._condition:
+            self._running = False
+            pending = [request for queue in self._queues.values() for request in queue]
+            self._queues.clear()
+            self._condition.notify_all()
+        for request in pending:
+            request.future.set_exception(RuntimeError("Micro-batcher is stopped"))
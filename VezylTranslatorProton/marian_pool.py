@@ -0,0 +1,133 @@
+"""
+Marian Worker Pool for VezylTranslator
+Runs Marian inference in separate processes so batch jobs can use every core
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+
+# === Worker Process Side ===
+# Each worker process keeps its own Marian provider (and therefore its own models)
+
+_worker_provider = None
+_worker_threads = 1
+
+
+def _init_worker(threads: int):
+    """Initialize a worker process"""
+    global _worker_threads
+    _worker_threads = max(1, threads)
+
+
+def _worker_translate(text: str, src_lang: str, dest_lang: str, decoding_profile: Optional[str] = None):
+    """Translate text inside a worker process"""
+    global _worker_provider
+    if _worker_provider is None:
+        from VezylTranslatorProton.translator import MarianTranslationProvider
+        _worker_provider = MarianTranslationProvider()
+        _worker_provider.set_inference_threads(_worker_threads)
+    return _worker_provider.translate(text, src_lang, dest_lang, decoding_profile)
+
+
+def parse_affinity(spec: str) -> Dict[str, List[int]]:
+    """
+    Parse model affinity setting
+
+    Format: "en-vi:0,1; vi-en:2" pins each language pair to the listed workers
+    """
+    affinity = {}
+    if not spec:
+        return affinity
+
+    for item in spec.split(";"):
+        if ":" not in item:
+            continue
+        pair, workers = item.split(":", 1)
+        indexes = []
+        for worker in workers.split(","):
+            worker = worker.strip()
+            if worker.isdigit():
+                indexes.append(int(worker))
+        if pair.strip() and indexes:
+            affinity[pair.strip()] = indexes
+
+    return affinity
+
+
+# === Parent Process Side ===
+
+class MarianWorkerPool:
+    """Pool of Marian worker processes with per-language-pair affinity"""
+
+    def __init__(self, workers: int, affinity: Optional[Dict[str, List[int]]] = None):
+        self.workers = max(1, workers)
+        self.affinity = {
+            pair: [i for i in indexes if i < self.workers]
+            for pair, indexes in (affinity or {}).items()
+        }
+        # Split cores between workers so they do not oversubscribe the CPU
+        self.threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers)
+
+        # One single-process executor per worker keeps a language pair on the
+        # same process, so each model is only loaded where it is needed
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+        self._pending = [0] * self.workers
+        self._next_worker = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self, index: int) -> ProcessPoolExecutor:
+        """Get executor for worker, restarting it if the process crashed"""
+        executor = self._executors[index]
+        if executor is None or getattr(executor, "_broken", False):
+            if executor is not None:
+                print(f"[WARNING] Marian worker {index} crashed, restarting")
+                executor.shutdown(wait=False, cancel_futures=True)
+            executor = ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_init_worker,
+                initargs=(self.threads_per_worker,)
+            )
+            self._executors[index] = executor
+        return executor
+
+    def _pick_worker(self, model_key: str) -> int:
+        """Pick the least loaded worker allowed for this language pair"""
+        candidates = self.affinity.get(model_key) or list(range(self.workers))
+
+        # Rotate start position so ties are spread across workers
+        start = self._next_worker % len(candidates)
+        self._next_worker += 1
+        ordered = candidates[start:] + candidates[:start]
+        return min(ordered, key=lambda i: self._pending[i])
+
+    def submit(self, text: str, src_lang: str, dest_lang: str, decoding_profile: Optional[str] = None) -> Future:
+        """Submit a translation and return a future with the TranslationResult"""
+        with self._lock:
+            index = self._pick_worker(f"{src_lang}-{dest_lang}")
+            future = self._get_executor(index).submit(_worker_translate, text, src_lang, dest_lang, decoding_profile)
+            self._pending[index] += 1
+
+        def on_done(_):
+            with self._lock:
+                self._pending[index] -= 1
+
+        future.add_done_callback(on_done)
+        return future
+
+    def get_stats(self) -> Dict[str, List[int]]:
+        """Get pending request count per worker"""
+        with self._lock:
+            return {"pending": list(self._pending)}
+
+    def shutdown(self, wait: bool = False):
+        """Stop all worker processes"""
+        with self._lock:
+            for executor in self._executors:
+                if executor is not None:
+                    executor.shutdown(wait=wait, cancel_futures=True)
+            self._executors = [None] * self.workers
@@ -0,0 +1,131 @@
+"""
+Placeholder Masking for VezylTranslator
+Replaces URLs, paths and code with short placeholders before translation
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional
+
+# Default placeholder, rarely found in real text
+DEFAULT_PLACEHOLDER_TEMPLATE = "⟦{}⟧"
+
+_FILE_EXTENSIONS = (
+    "py|pyw|js|jsx|ts|tsx|json|yaml|yml|toml|ini|cfg|xml|html|htm|css|md|txt|csv|log|"
+    "exe|dll|bat|cmd|ps1|sh|c|h|cpp|hpp|cs|java|go|rs|rb|php|sql|zip|tar|gz|png|jpg|jpeg|gif|svg|pdf"
+)
+
+# Spans that must come through translation unchanged, most specific first.
+# Only code, paths and URLs: dates, times, numbers and brand names stay translatable.
+_MASK_PATTERN = re.compile("|".join((
+    r"`[^`\n]+`",                                              # Inline code
+    r"\b(?:https?|ftp)://[^\s<>\"'`]+[^\s<>\"'`.,;:!?)\]]",    # URLs
+    r"\bwww\.[^\s<>\"'`]+[^\s<>\"'`.,;:!?)\]]",
+    r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b",                       # Emails
+    r"\b[A-Za-z]:\\[^\s\"'<>|]*[^\s\"'<>|.,;:!?)]",            # Windows paths
+    r"\\\\[^\s\"'<>|]+[^\s\"'<>|.,;:!?)]",                     # UNC paths
+    r"(?<![\w/])(?:~|\.{1,2})?(?:/[\w.@+-]+){2,}/?",           # Unix paths
+    r"(?<![\w/])~/[\w.@+-]+",
+    r"\b[\w.-]+(?:[/\\][\w.-]+)+\.(?:" + _FILE_EXTENSIONS + r")\b",  # Relative paths
+    r"\b[A-Za-z_][\w-]*\.(?:" + _FILE_EXTENSIONS + r")\b",              # File names
+    r"\b[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*\(\)",                  # Calls: foo(), os.path.join()
+    r"\b[A-Za-z_]\w+(?:\.[A-Za-z_]\w+){2,}\b",                 # Dotted names: os.path.join (not U.S.A)
+    r"\b[A-Za-z][A-Za-z0-9]*_\w+\b",                           # snake_case
+    r"\b[a-z]{2,}(?:[A-Z][a-z0-9]+)+\b",                       # camelCase (not iPhone, eBay)
+    r"\b0x[0-9A-Fa-f]+\b",                                     # Hex
+)))
+
+_LETTER = re.compile(r"[^\W\d_]")
+
+
+@dataclass
+class MaskedText:
+    """Text with protected spans replaced by numbered placeholders"""
+    text: str
+    spans: List[str] = field(default_factory=list)
+    template: str = DEFAULT_PLACEHOLDER_TEMPLATE
+    original_length: int = 0
+
+    @property
+    def chars_saved(self) -> int:
+        """Characters not sent to the provider"""
+        return max(0, self.original_length - len(self.text))
+
+    @property
+    def is_linguistic(self) -> bool:
+        """Check if anything besides placeholders, digits and punctuation is left to translate"""
+        return is_linguistic(self.text, self.template)
+
+
+@lru_cache(maxsize=8)
+def _placeholder_regex(template: str) -> "re.Pattern":
+    """Regex matching placeholders of template, tolerant of spaces added by providers"""
+    prefix, _, suffix = template.partition("{}")
+    return re.compile(re.escape(prefix.strip()) + r"\s*(\d+)\s*" + re.escape(suffix.strip()))
+
+
+@lru_cache(maxsize=8)
+def _mask_regex(template: str) -> "re.Pattern":
+    """Protected spans plus text that already looks like a placeholder (e.g. "[1]" footnotes)"""
+    return re.compile(f"(?P<lookalike>{_placeholder_regex(template).pattern})|{_MASK_PATTERN.pattern}")
+
+
+def strip_placeholders(text: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> str:
+    """Text with placeholders removed"""
+    return _placeholder_regex(template).sub("", text)
+
+
+def split_at_placeholders(text: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> List[str]:
+    """Split into [text, placeholder, text, ..., text]: placeholders are at odd positions"""
+    parts = []
+    position = 0
+    for match in _placeholder_regex(template).finditer(text):
+        parts.append(text[position:match.start()])
+        parts.append(match.group())
+        position = match.end()
+    parts.append(text[position:])
+    return parts
+
+
+def is_linguistic(text: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> bool:
+    """Check if text has letters outside placeholders"""
+    return bool(_LETTER.search(strip_placeholders(text, template)))
+
+
+def mask_text(text: str, template: str = DEFAULT_PLACEHOLDER_TEMPLATE) -> Optional[MaskedText]:
+    """Mask protected spans. Returns None if nothing is worth masking"""
+    spans: List[str] = []
+
+    def replace_span(match):
+        span = match.group()
+        placeholder = template.format(len(spans))
+        # Lookalikes are always masked, so every placeholder in the output is one of ours
+        if len(span) <= len(placeholder) and not span.startswith("`") and match.group("lookalike") is None:
+            return span  # Not worth it
+        spans.append(span)
+        return placeholder
+
+    masked = _mask_regex(template).sub(replace_span, text)
+    if not spans:
+        return None
+    return MaskedText(text=masked, spans=spans, template=template, original_length=len(text))
+
+
+def unmask_text(translated: str, masked: MaskedText) -> Optional[str]:
+    """Restore the masked spans. Returns None if the provider lost or duplicated a placeholder"""
+    seen = []
+
+    def restore_span(match):
+        index = int(match.group(1))
+        if index >= len(masked.spans):
+            return match.group()
+        seen.append(index)
+        return masked.spans[index]
+
+    restored = _placeholder_regex(masked.template).sub(restore_span, translated)
+    if sorted(seen) != list(range(len(masked.spans))):
+        return None
+    return restored
@@ -0,0 +1,133 @@
+"""
+Speculative Translation Prefetch for VezylTranslator
+Translates new clipboard text in the background so the popup opens with a ready result
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from VezylTranslatorNeutron import constant
+from VezylTranslatorNeutron.scheduler_service import (
+    CancellationToken, TaskPriority, TranslationCancelled, get_scheduler
+)
+
+
+class TranslationPrefetcher:
+    """
+    Run at most one speculative translation at a time
+
+    Results land in the translation engine cache (and identical requests
+    join the running one), so the real request made on click returns at once.
+    A newer clipboard value replaces the current prefetch, stopping it even
+    if it is already running.
+    """
+
+    def __init__(self, max_chars: int = constant.PerformanceSettings.PREFETCH_MAX_CHARS,
+                 chars_per_minute: int = constant.PerformanceSettings.PREFETCH_CHARS_PER_MINUTE,
+                 max_cpu_percent: float = constant.PerformanceSettings.PREFETCH_MAX_CPU_PERCENT):
+        self.max_chars = max_chars
+        self.chars_per_minute = chars_per_minute
+        self.max_cpu_percent = max_cpu_percent
+
+        # Background priority keeps speculative work from competing with real requests
+        self._lock = threading.Lock()
+        self._current_text: Optional[str] = None
+        self._current_future: Optional[Future] = None
+        self._current_token: Optional[CancellationToken] = None
+
+        # Character budget for the current one-minute window
+        self._window_start = time.monotonic()
+        self._window_chars = 0
+
+        self.stats: Dict[str, int] = {"started": 0, "completed": 0, "cancelled": 0, "skipped": 0}
+
+    def _take_budget(self, chars: int) -> bool:
+        """Reserve characters from the per-minute budget"""
+        now = time.monotonic()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_chars = 0
+        if self._window_chars + chars > self.chars_per_minute:
+            return False
+        self._window_chars += chars
+        return True
+
+    def _cpu_busy(self) -> bool:
+        """Check if the CPU is too busy for speculative work (needs psutil)"""
+        try:
+            import psutil
+            return psutil.cpu_percent(interval=None) > self.max_cpu_percent
+        except ImportError:
+            return False
+
+    def prefetch(self, text: str, src_lang: str, dest_lang: str, model: str = None, profile: str = None) -> bool:
+        """Start a speculative translation. Returns False if it was skipped"""
+        if not text or not text.strip() or len(text) > self.max_chars:
+            self.stats["skipped"] += 1
+            return False
+
+        with self._lock:
+            if text == self._current_text and self._current_future and not self._current_future.done():
+                return True  # Already prefetching this text
+
+            if self._cpu_busy() or not self._take_budget(len(text)):
+                self.stats["skipped"] += 1
+                return False
+
+            self._cancel_current()
+            self._current_text = text
+            self._current_token = CancellationToken()
+            self._current_future = get_scheduler().submit(self._run, text, src_lang, dest_lang, model, profile,
+                                                          self._current_token, priority=TaskPriority.BACKGROUND,
+                                                          key="prefetch", cancel_token=self._current_token)
+            self.stats["started"] += 1
+            return True
+
+    def _run(self, text: str, src_lang: str, dest_lang: str, model: Optional[str], profile: Optional[str],
+             cancel_token: CancellationToken):
+        """Translate through the engine so the result is cached"""
+        from .translator import get_translation_engine
+        try:
+            get_translation_engine().translate(text, src_lang, dest_lang, model, profile, cancel_token)
+            self.stats["completed"] += 1
+        except TranslationCancelled:
+            pass  # Counted when it was cancelled
+        except Exception as e:
+            print(f"[WARNING] Prefetch translation failed: {e}")
+
+    def _cancel_current(self):
+        """Cancel the current prefetch, queued or running (lock must be held)"""
+        if self._current_future is not None and not self._current_future.done():
+            self._current_future.cancel()
+            self._current_token.cancel()
+            self.stats["cancelled"] += 1
+        self._current_text = None
+        self._current_future = None
+        self._current_token = None
+
+    def cancel(self, text: Optional[str] = None):
+        """Cancel prefetch for text (or whatever is pending)"""
+        with self._lock:
+            if text is None or text == self._current_text:
+                self._cancel_current()
+
+    def shutdown(self):
+        """Cancel pending speculative work"""
+        with self._lock:
+            self._cancel_current()
+
+
+# === Global Prefetcher Instance ===
+_global_prefetcher: Optional[TranslationPrefetcher] = None
+
+
+def get_prefetcher() -> TranslationPrefetcher:
+    """Get the global prefetcher instance"""
+    global _global_prefetcher
+    if _global_prefetcher is None:
+        _global_prefetcher = TranslationPrefetcher()
+    return _global_prefetcher
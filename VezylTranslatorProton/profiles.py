@@ -0,0 +1,59 @@
+"""
+Translation Profiles for VezylTranslator
+Named quality/latency presets that govern the whole translation pipeline
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class TranslationProfile:
+    """Settings bundle resolved by TranslationEngine for every request"""
+    name: str
+    provider_preference: Tuple[str, ...]  # Tried in order when no/unavailable model is requested
+    decoding_profile: str                 # Marian DecodingPolicy (beams, max lengths)
+    timeout: float                        # Seconds to wait for a provider (0 = provider default)
+    hedge_after: float                    # Seconds before a backup provider is started (0 = no hedging)
+    use_cache: bool = True                # Serve repeated requests from the translation cache
+    cache_results: bool = True            # Store successful results in the cache
+    chunk_size: int = 0                   # Max characters per chunk for long text (0 = no chunking)
+
+
+TRANSLATION_PROFILES: Dict[str, TranslationProfile] = {
+    # Popup: answer fast, prefer local models, race a backup when the first one stalls
+    "instant": TranslationProfile(
+        name="instant",
+        provider_preference=("marian", "google"),
+        decoding_profile="instant",
+        timeout=10.0,
+        hedge_after=1.5,
+        chunk_size=0,
+    ),
+    "balanced": TranslationProfile(
+        name="balanced",
+        provider_preference=("google", "marian"),
+        decoding_profile="balanced",
+        timeout=15.0,
+        hedge_after=0.0,
+        chunk_size=2000,
+    ),
+    # Homepage and batch jobs: best output, smaller chunks keep Marian inside its context
+    "quality": TranslationProfile(
+        name="quality",
+        provider_preference=("google", "marian"),
+        decoding_profile="quality",
+        timeout=30.0,
+        hedge_after=0.0,
+        chunk_size=1000,
+    ),
+}
+DEFAULT_TRANSLATION_PROFILE = "balanced"
+
+
+def get_translation_profile(name: str = None) -> TranslationProfile:
+    """Get profile by name, falling back to the default profile"""
+    return TRANSLATION_PROFILES.get(name or DEFAULT_TRANSLATION_PROFILE,
+                                    TRANSLATION_PROFILES[DEFAULT_TRANSLATION_PROFILE])
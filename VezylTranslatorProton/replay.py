@@ -0,0 +1,445 @@
+"""
+Record/Replay Providers for VezylTranslator
+Captures real provider responses with their latencies and plays them back for offline load testing
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Record real traffic, then run the whole app against the recording:
+    set VEZYL_REPLAY_MODE=record  (use the app, run benchmarks...)
+    set VEZYL_REPLAY_MODE=replay
+    set VEZYL_REPLAY_LATENCY=normal:120,40
+    set VEZYL_REPLAY_ERROR_RATE=0.02
+The [replay] section of advanced_config.ini holds the same settings.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from VezylTranslatorNeutron import constant
+from VezylTranslatorNeutron.constant import EnvVars, PerformanceSettings
+from VezylTranslatorNeutron.scheduler_service import CancellationToken, TranslationCancelled
+from . import stage_timings
+from .config import get_advanced_config
+from .translator import BaseTranslationProvider, TranslationResult
+
+REPLAY_MODES = ("off", "record", "replay")
+_RESULT_FIELDS = {f.name for f in fields(TranslationResult)}
+
+
+@dataclass
+class ReplaySettings:
+    """Record/replay configuration (environment overrides advanced_config.ini)"""
+    mode: str = "off"
+    cassette: str = ""
+    latency: str = "recorded"
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    miss: str = "error"
+    seed: Optional[int] = None
+    timeout: float = PerformanceSettings.TRANSLATION_TIMEOUT  # seconds an injected timeout hangs
+
+
+def _load_replay_settings() -> ReplaySettings:
+    config = get_advanced_config()
+    env = os.environ.get
+    settings = ReplaySettings(
+        mode=env(EnvVars.VEZYL_REPLAY_MODE, config.replay_mode).strip().lower() or "off",
+        cassette=env(EnvVars.VEZYL_REPLAY_CASSETTE, config.replay_cassette).strip(),
+        latency=env(EnvVars.VEZYL_REPLAY_LATENCY, config.replay_latency).strip().lower(),
+        miss=env(EnvVars.VEZYL_REPLAY_MISS, config.replay_miss).strip().lower(),
+    )
+    try:
+        settings.error_rate = float(env(EnvVars.VEZYL_REPLAY_ERROR_RATE, config.replay_error_rate))
+        settings.timeout_rate = float(env(EnvVars.VEZYL_REPLAY_TIMEOUT_RATE, config.replay_timeout_rate))
+        seed = env(EnvVars.VEZYL_REPLAY_SEED)
+        settings.seed = int(seed) if seed else None
+    except ValueError as e:
+        print(f"[WARNING] Invalid replay setting: {e}")
+
+    if settings.mode not in REPLAY_MODES:
+        print(f"[WARNING] Unknown replay mode '{settings.mode}', providers run normally")
+        settings.mode = "off"
+    if not settings.cassette:
+        settings.cassette = os.path.join(constant.LOCAL_DIR, "replay", "cassette.jsonl")
+    if settings.mode != "off":
+        print(f"[INFO] Translation providers in {settings.mode} mode: {settings.cassette}")
+    return settings
+
+
+# === Latency models ===
+
+class LatencyModel:
+    """Sample call latency from the recording or from an injected distribution"""
+
+    def __init__(self, spec: str = "recorded", seed: Optional[int] = None):
+        self.spec = spec
+        self.kind, _, params = spec.partition(":")
+        try:
+            self.params = [float(value) for value in params.split(",") if value.strip()]
+        except ValueError:
+            print(f"[WARNING] Invalid replay latency '{spec}', using recorded latencies")
+            self.kind, self.params = "recorded", []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def uniform(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def sample_ms(self, recorded: List[Tuple[float, int]], size: int = 1) -> float:
+        """Latency in milliseconds for one call of `size` texts"""
+        with self._lock:
+            if self.kind == "fixed" and self.params:
+                return self.params[0]
+            if self.kind == "uniform" and len(self.params) >= 2:
+                return self._random.uniform(self.params[0], self.params[1])
+            if self.kind == "normal" and len(self.params) >= 2:
+                return max(0.0, self._random.gauss(self.params[0], self.params[1]))
+            if self.kind == "recorded" and recorded:
+                # Recorded calls are scaled to the number of texts in this call
+                latency, recorded_size = self._random.choice(recorded)
+                return latency * size / recorded_size
+            return 0.0
+
+
+# === Cassette ===
+
+class Cassette:
+    """
+    JSONL recording of provider calls
+
+    Each line is a provider "meta" entry (languages, placeholder format), a
+    "detect" entry with a detected language, or a "call" entry with the
+    texts, results or exception, and latency. Results are indexed per text
+    so replay works however texts are batched; a failed call never hides an
+    earlier successful recording of the same text.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._results: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        self._latencies: Dict[Tuple[str, str], List[Tuple[float, int]]] = defaultdict(list)
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._detections: Dict[Tuple[str, str], str] = {}
+        self.recorded = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    self._index(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"[WARNING] Skipping bad cassette line {number}: {e}")
+        print(f"[OK] Loaded {len(self._results)} recorded translations from {self.path}")
+
+    def _index(self, entry: Dict[str, Any]):
+        provider = entry["provider"]
+        if entry.get("type") == "meta":
+            self._meta[provider] = entry
+            return
+        if entry.get("type") == "detect":
+            self._detections[(provider, entry["text"])] = entry["language"]
+            return
+        texts = entry["texts"]
+        self._latencies[(provider, entry["kind"])].append((float(entry["latency_ms"]), max(1, len(texts))))
+        results = entry.get("results") or [{"exception": entry.get("exception") or "Unknown error"}] * len(texts)
+        for text, result in zip(texts, results):
+            key = (provider, entry["src"], entry["dest"], text)
+            if _is_failure(result) and key in self._results and not _is_failure(self._results[key]):
+                continue  # Keep the successful recording
+            self._results[key] = result
+
+    def _append(self, entry: Dict[str, Any]):
+        with self._lock:
+            self._index(entry)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.recorded += 1
+
+    def record_meta(self, provider: str, meta: Dict[str, Any]):
+        """Store provider details needed to replay it without the real provider"""
+        if provider not in self._meta:
+            self._append(dict(meta, type="meta", provider=provider))
+
+    def record_call(self, provider: str, kind: str, src_lang: str, dest_lang: str, texts: List[str],
+                    latency_ms: float, results: Optional[List[TranslationResult]] = None,
+                    exception: Optional[str] = None):
+        """Store one provider call"""
+        self._append({
+            "type": "call", "provider": provider, "kind": kind, "src": src_lang, "dest": dest_lang,
+            "texts": texts, "latency_ms": round(latency_ms, 3),
+            "results": [asdict(result) for result in results] if results is not None else None,
+            "exception": exception,
+        })
+
+    def record_detection(self, provider: str, text: str, language: str):
+        """Store one source language detection (unless already recorded)"""
+        if self._detections.get((provider, text)) != language:
+            self._append({"type": "detect", "provider": provider, "text": text, "language": language})
+
+    def lookup(self, provider: str, src_lang: str, dest_lang: str, text: str) -> Optional[Dict[str, Any]]:
+        return self._results.get((provider, src_lang, dest_lang, text))
+
+    def lookup_detection(self, provider: str, text: str) -> Optional[str]:
+        return self._detections.get((provider, text))
+
+    def latencies(self, provider: str, kind: str) -> List[Tuple[float, int]]:
+        """Recorded (latency_ms, texts) pairs for a call kind, or another kind if there are none"""
+        recorded = self._latencies.get((provider, kind))
+        if recorded:
+            return recorded
+        return next((recorded for (name, _), recorded in self._latencies.items() if name == provider and recorded), [])
+
+    def meta(self, provider: str) -> Dict[str, Any]:
+        return self._meta.get(provider, {})
+
+    def has_provider(self, provider: str) -> bool:
+        return provider in self._meta or any(key[0] == provider for key in self._latencies)
+
+
+def _is_failure(result: Dict[str, Any]) -> bool:
+    """Whether a recorded result is an exception or an error result"""
+    return "exception" in result or bool(result.get("error"))
+
+
+# === Provider wrapper ===
+
+def _sleep(seconds: float, cancel_token: Optional[CancellationToken]):
+    """Sleep, waking early if the request is cancelled"""
+    if seconds <= 0:
+        return
+    if cancel_token is None:
+        time.sleep(seconds)
+        return
+    woke = threading.Event()
+    cancel_token.add_callback(woke.set)
+    try:
+        woke.wait(seconds)
+    finally:
+        cancel_token.remove_callback(woke.set)
+    cancel_token.raise_if_cancelled()
+
+
+class RecordReplayProvider(BaseTranslationProvider):
+    """
+    Provider that records calls to a real provider, or replays them
+
+    In record mode every call is passed to the wrapped provider and saved
+    with its latency. In replay mode no real provider is built: results come
+    from the cassette after a sampled latency, with optional injected errors
+    and timeouts. Multi-target calls are replayed per target.
+    """
+
+    def __init__(self, name: str, inner: Optional[BaseTranslationProvider], settings: ReplaySettings,
+                 cassette: Cassette):
+        self.inner = inner
+        self.settings = settings
+        self.cassette = cassette
+        self.latency = LatencyModel(settings.latency, settings.seed)
+        self.stats = defaultdict(int)
+        if inner is not None:
+            self.placeholder_template = inner.placeholder_template
+            cassette.record_meta(name, {"placeholder_template": inner.placeholder_template,
+                                        "languages": inner.get_supported_languages()})
+        else:
+            self.placeholder_template = cassette.meta(name).get("placeholder_template", self.placeholder_template)
+        # Only offer a batch path when the real provider has one (or when replaying)
+        if inner is None or hasattr(inner, "translate_batch"):
+            self.translate_batch = self._translate_batch
+        if inner is not None and hasattr(inner, "translate_multi"):
+            self.translate_multi = self._translate_multi
+        super().__init__(name)
+
+    def __getattr__(self, item):
+        inner = self.__dict__.get("inner")
+        if inner is None:
+            raise AttributeError(item)
+        return getattr(inner, item)
+
+    def _check_availability(self):
+        if self.inner is not None:
+            self.is_available = self.inner.is_available
+        else:
+            self.is_available = self.cassette.has_provider(self.name) or self.settings.miss == "echo"
+
+    def get_supported_languages(self) -> Dict[str, str]:
+        if self.inner is not None:
+            return self.inner.get_supported_languages()
+        return dict(self.cassette.meta(self.name).get("languages", {}))
+
+    # === Recording ===
+
+    def _record(self, kind: str, src_lang: str, dest_lang: str, texts: List[str], call):
+        started = time.perf_counter()
+        try:
+            results = call()
+        except TranslationCancelled:
+            raise
+        except Exception as e:
+            self.cassette.record_call(self.name, kind, src_lang, dest_lang, texts,
+                                      (time.perf_counter() - started) * 1000, exception=str(e))
+            raise
+        recorded = results if isinstance(results, list) else [results]
+        self.cassette.record_call(self.name, kind, src_lang, dest_lang, texts,
+                                  (time.perf_counter() - started) * 1000, results=recorded)
+        return results
+
+    # === Replay ===
+
+    def _replayed_result(self, text: str, src_lang: str, dest_lang: str) -> TranslationResult:
+        entry = self.cassette.lookup(self.name, src_lang, dest_lang, text)
+        if entry is None:
+            self.stats["misses"] += 1
+            if self.settings.miss == "echo":
+                return TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang, model=self.name,
+                                         confidence=0.5)
+            return TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang, model=self.name,
+                                     error=f"No recording for {self.name} {src_lang}->{dest_lang}")
+        self.stats["hits"] += 1
+        if "exception" in entry:
+            raise RuntimeError(entry["exception"])
+        return TranslationResult(**{key: value for key, value in entry.items() if key in _RESULT_FIELDS})
+
+    def _replay(self, kind: str, texts: List[str], src_lang: str, dest_lang: str,
+                cancel_token: Optional[CancellationToken]) -> List[TranslationResult]:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+        # Injected faults apply to the whole call, like a failed request
+        roll = self.latency.uniform()
+        if roll < self.settings.timeout_rate:
+            self.stats["injected_timeouts"] += 1
+            _sleep(self.settings.timeout, cancel_token)
+            return [TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang, model=self.name,
+                                      error="Injected timeout") for text in texts]
+
+        with stage_timings.stage("network"):  # Simulated provider round trip
+            _sleep(self.latency.sample_ms(self.cassette.latencies(self.name, kind), len(texts)) / 1000, cancel_token)
+        if roll < self.settings.timeout_rate + self.settings.error_rate:
+            self.stats["injected_errors"] += 1
+            return [TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang, model=self.name,
+                                      error="Injected error") for text in texts]
+        return [self._replayed_result(text, src_lang, dest_lang) for text in texts]
+
+    # === Provider interface ===
+
+    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi") -> TranslationResult:
+        if self.inner is None:
+            return self._replay("translate", [text], src_lang, dest_lang, None)[0]
+        return self._record("translate", src_lang, dest_lang, [text],
+                            lambda: self.inner.translate(text, src_lang, dest_lang))
+
+    def translate_with_profile(self, text: str, src_lang: str, dest_lang: str, profile,
+                               cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        if self.inner is None:
+            return self._replay("translate", [text], src_lang, dest_lang, cancel_token)[0]
+        return self._record("translate", src_lang, dest_lang, [text],
+                            lambda: self.inner.translate_with_profile(text, src_lang, dest_lang, profile,
+                                                                      cancel_token))
+
+    def _translate_multi(self, text: str, src_lang: str, dest_langs: List[str],
+                         decoding_profile: Optional[str] = None) -> Dict[str, TranslationResult]:
+        # Recorded as one call per target so replay finds them through the single-target path
+        started = time.perf_counter()
+        try:
+            results = self.inner.translate_multi(text, src_lang, dest_langs, decoding_profile)
+        except Exception as e:
+            latency_ms = (time.perf_counter() - started) * 1000 / max(1, len(dest_langs))
+            for dest_lang in dest_langs:
+                self.cassette.record_call(self.name, "multi", src_lang, dest_lang, [text], latency_ms,
+                                          exception=str(e))
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000 / max(1, len(results))
+        for dest_lang, result in results.items():
+            self.cassette.record_call(self.name, "multi", src_lang, dest_lang, [text], latency_ms, results=[result])
+        return results
+
+    def detect_language(self, text: str) -> str:
+        if self.inner is None:
+            language = self.cassette.lookup_detection(self.name, text)
+            return language if language is not None else super().detect_language(text)
+        language = self.inner.detect_language(text)
+        self.cassette.record_detection(self.name, text, language)
+        return language
+
+    def _translate_batch(self, texts: List[str], src_lang: str = "auto", dest_lang: str = "vi",
+                         decoding_profile: Optional[str] = None,
+                         cancel_token: Optional[CancellationToken] = None) -> List[TranslationResult]:
+        if self.inner is None:
+            return self._replay("batch", texts, src_lang, dest_lang, cancel_token)
+        return self._record("batch", src_lang, dest_lang, list(texts),
+                            lambda: self.inner.translate_batch(texts, src_lang, dest_lang,
+                                                               decoding_profile=decoding_profile,
+                                                               cancel_token=cancel_token))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Replay hits, misses and injected faults"""
+        return dict(self.stats, mode=self.settings.mode, recorded=self.cassette.recorded)
+
+    def shutdown(self):
+        if self.inner is not None and hasattr(self.inner, "shutdown"):
+            self.inner.shutdown()
+
+
+# === Global state ===
+_settings: Optional[ReplaySettings] = None
+_cassette: Optional[Cassette] = None
+_state_lock = threading.Lock()
+
+
+def get_replay_settings() -> ReplaySettings:
+    """Get the record/replay settings (read once)"""
+    global _settings
+    if _settings is None:
+        with _state_lock:
+            if _settings is None:
+                _settings = _load_replay_settings()
+    return _settings
+
+
+def get_cassette() -> Cassette:
+    """Get the shared cassette for the configured path"""
+    global _cassette
+    with _state_lock:
+        if _cassette is None:
+            _cassette = Cassette(get_replay_settings().cassette)
+        return _cassette
+
+
+def reset_replay():
+    """Re-read settings and the cassette (after changing env vars)"""
+    global _settings, _cassette
+    with _state_lock:
+        _settings = None
+        _cassette = None
+
+
+def is_replay_provider_available(name: str, check_available=None) -> bool:
+    """Whether a provider can be replayed: it was recorded, or echo mode stands in for a usable provider"""
+    if get_cassette().has_provider(name):
+        return True
+    return get_replay_settings().miss == "echo" and bool(check_available and check_available())
+
+
+def create_provider(name: str, factory) -> BaseTranslationProvider:
+    """Build a provider according to the record/replay mode"""
+    settings = get_replay_settings()
+    if settings.mode == "replay":
+        return RecordReplayProvider(name, None, settings, get_cassette())
+    provider = factory()
+    if settings.mode == "record":
+        return RecordReplayProvider(name, provider, settings, get_cassette())
+    return provider
@@ -0,0 +1,225 @@
+"""
+Language Segmenter for VezylTranslator
+Splits mixed-language text into runs that can be translated separately
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import importlib.util
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# Sentence boundaries: end punctuation followed by space, CJK end punctuation, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*|\s*\n\s*")
+
+# Chunks of text written in CJK, Hangul or Thai scripts
+_NON_LATIN_CHUNK = re.compile(r"[぀-ヿ㐀-䶿一-鿿ｦ-ﾟ가-힯฀-๿]"
+                              r"[぀-ヿ㐀-䶿一-鿿ｦ-ﾟ가-힯฀-๿"
+                              r"　-〿！-／\s\d]*")
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Letters only used by Vietnamese among the supported Latin-script languages
+_VIETNAMESE_CHARS = set(
+    "ăâđêôơưĂÂĐÊÔƠƯ"
+    "ảãạắằẳẵặấầẩẫậẻẽẹếềểễệỉĩịỏọốồổỗộớờởỡợủũụứừửữựỳỷỹỵ"
+    "ẢÃẠẮẰẲẴẶẤẦẨẪẬẺẼẸẾỀỂỄỆỈĨỊỎỌỐỒỔỖỘỚỜỞỠỢỦŨỤỨỪỬỮỰỲỶỸỴ"
+)
+
+# Frequent function words per Latin-script language
+_STOPWORDS: Dict[str, set] = {
+    "en": {"the", "and", "is", "are", "was", "were", "to", "of", "in", "for", "on", "with", "that",
+           "this", "it", "you", "i", "we", "be", "have", "has", "not", "please", "will", "can", "at",
+           "from", "your", "my", "our", "they", "an", "a", "do", "does", "if", "as", "by", "about",
+           "thanks", "hello", "hi", "yes"},
+    "vi": {"la", "va", "cua", "co", "khong", "nhung", "cac", "mot", "duoc", "cho", "voi", "nay",
+           "toi", "ban", "anh", "em", "chung", "ta", "se", "da", "dang", "thi", "nhe", "nha", "roi"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "ich", "sie", "es", "ein", "eine", "zu",
+           "mit", "auf", "für", "von", "den", "dem", "wir", "bitte", "sind", "auch", "wie"},
+    "fr": {"le", "la", "les", "et", "est", "de", "des", "un", "une", "pour", "dans", "que", "qui",
+           "pas", "vous", "nous", "je", "avec", "sur", "au", "aux", "ce", "merci"},
+    "es": {"el", "la", "los", "las", "y", "es", "de", "que", "en", "un", "una", "por", "para",
+           "con", "no", "se", "del", "al", "lo", "como", "pero", "gracias"},
+}
+
+# Languages langdetect may report that we can translate
+_SUPPORTED_LANGS = {"en", "vi", "ja", "ko", "zh", "fr", "de", "ru", "es", "th"}
+
+
+@dataclass
+class Segment:
+    """Run of text in one language, followed by the separator that came after it"""
+    text: str
+    lang: Optional[str] = None
+    separator: str = ""
+
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """Split text into (sentence, separator) pairs that join back to the original text"""
+    pieces = []
+    position = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        if match.end() == position:
+            continue  # Empty match right after the previous boundary
+        pieces.append((text[position:match.start()], match.group()))
+        position = match.end()
+    pieces.append((text[position:], ""))
+
+    return [(sentence, separator) for sentence, separator in pieces if sentence or separator]
+
+
+_detect_langs = None
+
+
+def _get_detect_langs():
+    """Import langdetect on first use (None if it is not installed)"""
+    global _detect_langs
+    if _detect_langs is None:
+        _detect_langs = False
+        if importlib.util.find_spec("langdetect") is not None:
+            from langdetect import detect_langs
+            _detect_langs = detect_langs
+    return _detect_langs or None
+
+
+def _script_language(text: str) -> Optional[str]:
+    """Detect language from the writing system alone"""
+    kana = hangul = han = thai = cyrillic = 0
+    for char in text:
+        code = ord(char)
+        if 0x3040 <= code <= 0x30FF or 0xFF66 <= code <= 0xFF9F:
+            kana += 1
+        elif 0xAC00 <= code <= 0xD7AF:
+            hangul += 1
+        elif 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            han += 1
+        elif 0x0E00 <= code <= 0x0E7F:
+            thai += 1
+        elif 0x0400 <= code <= 0x04FF:
+            cyrillic += 1
+
+    if kana:
+        return "ja"
+    if hangul:
+        return "ko"
+    if han:
+        return "zh"
+    if thai:
+        return "th"
+    if cyrillic:
+        return "ru"
+    return None
+
+
+def _latin_language(text: str) -> Optional[str]:
+    """Detect a Latin-script language from diacritics and function words"""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+
+    if any(char in _VIETNAMESE_CHARS for char in text):
+        return "vi"
+
+    scores = {lang: sum(1 for word in words if word in stopwords) for lang, stopwords in _STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    best_score = scores[best]
+    runner_up = max(score for lang, score in scores.items() if lang != best)
+    if best_score > 0 and best_score > runner_up:
+        return best
+
+    # Let n-gram detection decide longer ambiguous sentences
+    detect_langs = _get_detect_langs() if len(words) >= 3 else None
+    if detect_langs:
+        try:
+            candidate = detect_langs(text)[0]
+            lang = candidate.lang.split("-")[0]
+            if candidate.prob >= 0.9 and lang in _SUPPORTED_LANGS:
+                return lang
+        except Exception:
+            pass
+
+    return None
+
+
+def detect_segment_language(text: str) -> Optional[str]:
+    """Detect language of a short run (None if there is no clear signal)"""
+    return _script_language(text) or _latin_language(text)
+
+
+class LanguageSegmenter:
+    """Split text into runs of the same language"""
+
+    def __init__(self, min_words: int = 3):
+        # Latin chunks shorter than this inside a CJK sentence stay with it (names, terms)
+        self.min_words = min_words
+
+    def _split_scripts(self, sentence: str) -> List[Tuple[str, str]]:
+        """Split a sentence where it switches between Latin and CJK/Hangul/Thai text"""
+        parts = []
+        position = 0
+        for match in _NON_LATIN_CHUNK.finditer(sentence):
+            if match.start() > position:
+                parts.append(sentence[position:match.start()])
+            parts.append(match.group())
+            position = match.end()
+        if position < len(sentence):
+            parts.append(sentence[position:])
+
+        # Short Latin chunks stay with the text around them
+        merged: List[str] = []
+        for part in parts:
+            is_latin = not _NON_LATIN_CHUNK.match(part)
+            if merged and (
+                (is_latin and len(_WORD.findall(part)) < self.min_words)
+                or (not _NON_LATIN_CHUNK.match(merged[-1]) and len(_WORD.findall(merged[-1])) < self.min_words)
+            ):
+                merged[-1] += part
+            else:
+                merged.append(part)
+
+        pieces = []
+        for part in merged:
+            stripped = part.rstrip()
+            pieces.append((stripped, part[len(stripped):]))
+        return pieces or [(sentence, "")]
+
+    def segment(self, text: str) -> List[Segment]:
+        """Split text into language runs; adjacent runs in one language are merged"""
+        segments: List[Segment] = []
+        for sentence, separator in split_sentences(text):
+            pieces = self._split_scripts(sentence)
+            pieces[-1] = (pieces[-1][0], pieces[-1][1] + separator)
+            for piece, piece_separator in pieces:
+                segments.append(Segment(piece, detect_segment_language(piece), piece_separator))
+
+        # Runs without a clear signal (numbers, names, short replies) join their neighbour
+        for index, segment in enumerate(segments):
+            if segment.lang is None:
+                neighbour = segments[index - 1] if index > 0 else None
+                if neighbour is None or neighbour.lang is None:
+                    neighbour = next((s for s in segments[index + 1:] if s.lang), None)
+                segment.lang = neighbour.lang if neighbour else None
+
+        merged: List[Segment] = []
+        for segment in segments:
+            if merged and merged[-1].lang == segment.lang:
+                merged[-1].text += merged[-1].separator + segment.text
+                merged[-1].separator = segment.separator
+            else:
+                merged.append(segment)
+        return merged
+
+    def languages(self, text: str) -> List[str]:
+        """Get the distinct languages found in text, in order of appearance"""
+        found = []
+        for segment in self.segment(text):
+            if segment.lang and segment.lang not in found:
+                found.append(segment.lang)
+        return found
+
+
+def join_segments(segments: List[Segment]) -> str:
+    """Join segments back into text"""
+    return "".join(segment.text + segment.separator for segment in segments)
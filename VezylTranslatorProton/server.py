@@ -0,0 +1,274 @@
+"""
+Local Translation Server for VezylTranslator
+Headless HTTP API on localhost so other tools can share the loaded engine and models
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import ipaddress
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from VezylTranslatorNeutron import constant
+from VezylTranslatorNeutron.constant import ServerSettings
+
+
+class _RequestError(Exception):
+    """Client error reported as a JSON response"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API handler
+
+    GET  /health           engine status
+    GET  /stats/timings    per-stage timing histograms (stage_timings enabled)
+    POST /translate        {"text", "dest", "src"?, "model"?, "profile"?}
+    POST /translate/batch  {"texts": [...], ...} - NDJSON stream when "stream" is true
+    POST /detect           {"text"}
+    """
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    # Buffer headers and body into one write; separate small writes stall
+    # keep-alive clients on delayed ACKs (~40ms per request)
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    server_version = f"{constant.SOFTWARE}/{constant.SOFTWARE_VERSION}"
+    timeout = ServerSettings.KEEP_ALIVE_TIMEOUT
+    _streaming = False  # Set once a chunked response has started: errors can no longer change the status
+
+    def log_message(self, format, *args):
+        """Silence per-request logging"""
+        pass
+
+    # === Responses ===
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """Send a complete JSON response"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: Dict[str, Any]):
+        """Write one NDJSON line as an HTTP chunk"""
+        data = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_error(self, status: int, message: str):
+        """Report an error as a JSON response, or as a last NDJSON line if a stream has started"""
+        if not self._streaming:
+            self._send_json(status, {"error": message})
+            return
+        self._write_chunk({"error": message, "status": status})
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.close_connection = True  # The client may not expect more after an error line
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Read and parse the JSON request body"""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True  # Body size unknown, the stream cannot be resynchronised
+            raise _RequestError(400, "Invalid Content-Length")
+        if length > ServerSettings.MAX_BODY_BYTES:
+            self.close_connection = True  # Body is not read
+            raise _RequestError(413, "Request body too large")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            raise _RequestError(400, "Invalid JSON body")
+        if not isinstance(payload, dict):
+            raise _RequestError(400, "JSON body must be an object")
+        return payload
+
+    # === Routing ===
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/health":
+            self._send_json(200, self.server.health())
+        elif path == "/stats/timings":
+            self._send_json(200, self.server.engine.get_stage_timings())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        routes = {
+            "/translate": self._handle_translate,
+            "/translate/batch": self._handle_batch,
+            "/detect": self._handle_detect,
+        }
+        handler = routes.get(self.path.split("?")[0])
+        if handler is None:
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        self._streaming = False
+        try:
+            payload = self._read_json()
+            if not self.server.acquire_slot():
+                self._send_json(503, {"error": "Server busy"}, {"Retry-After": "1"})
+                return
+            try:
+                handler(payload)
+            finally:
+                self.server.release_slot()
+        except _RequestError as e:
+            self._send_error(e.status, str(e))
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            print(f"[ERROR] Server request failed: {e}")
+            self._send_error(500, str(e))
+
+    # === Endpoints ===
+
+    @staticmethod
+    def _options(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Read common translation options"""
+        dest = payload.get("dest") or payload.get("dest_lang")
+        if not dest:
+            raise _RequestError(400, "Missing 'dest'")
+        return {
+            "src_lang": payload.get("src") or payload.get("src_lang") or "auto",
+            "dest_lang": dest,
+            "model": payload.get("model"),
+            "profile": payload.get("profile"),
+        }
+
+    @staticmethod
+    def _result_dict(result) -> Dict[str, Any]:
+        data = result.to_dict()
+        data["chars_saved"] = result.chars_saved
+        return data
+
+    def _handle_translate(self, payload: Dict[str, Any]):
+        text = payload.get("text")
+        if not isinstance(text, str):
+            raise _RequestError(400, "Missing 'text'")
+        options = self._options(payload)
+        result = self.server.engine.translate(text, options["src_lang"], options["dest_lang"],
+                                              options["model"], options["profile"])
+        self._send_json(200, self._result_dict(result))
+
+    def _handle_batch(self, payload: Dict[str, Any]):
+        texts = payload.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise _RequestError(400, "'texts' must be a list of strings")
+        options = self._options(payload)
+        engine = self.server.engine
+
+        if not payload.get("stream"):
+            results = engine.batch_translate(texts, options["src_lang"], options["dest_lang"],
+                                             options["model"], profile=options["profile"])
+            self._send_json(200, {"results": [self._result_dict(result) for result in results]})
+            return
+
+        # Stream one JSON line per result as each slice finishes
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._streaming = True
+        step = ServerSettings.STREAM_BATCH_SIZE
+        for start in range(0, len(texts), step):
+            results = engine.batch_translate(texts[start:start + step], options["src_lang"], options["dest_lang"],
+                                             options["model"], profile=options["profile"])
+            for offset, result in enumerate(results):
+                self._write_chunk(dict(self._result_dict(result), index=start + offset))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _handle_detect(self, payload: Dict[str, Any]):
+        text = payload.get("text")
+        if not isinstance(text, str):
+            raise _RequestError(400, "Missing 'text'")
+        from .translator import detect_language
+        self._send_json(200, {"lang": detect_language(text)})
+
+
+class TranslationServer(ThreadingHTTPServer):
+    """Threaded HTTP server sharing one TranslationEngine"""
+    daemon_threads = True
+
+    def __init__(self, host: str = ServerSettings.HOST, port: int = ServerSettings.PORT,
+                 max_concurrency: int = ServerSettings.MAX_CONCURRENCY):
+        if not self._is_loopback(host):
+            raise ValueError(f"Refusing to listen on non-loopback address {host}")
+        from .translator import get_translation_engine
+        self.engine = get_translation_engine()
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self.started_at = time.time()
+        super().__init__((host, port), TranslationRequestHandler)
+
+    @staticmethod
+    def _is_loopback(host: str) -> bool:
+        """Check that host (an address or a name such as "localhost") only resolves to loopback addresses"""
+        try:
+            addresses = {info[4][0] for info in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)}
+        except socket.gaierror:
+            return False
+        return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback
+                                       for address in addresses)
+
+    def acquire_slot(self) -> bool:
+        """Wait for a free translation slot"""
+        if not self._slots.acquire(timeout=ServerSettings.QUEUE_TIMEOUT):
+            return False
+        with self._active_lock:
+            self._active += 1
+        return True
+
+    def release_slot(self):
+        """Free a translation slot"""
+        with self._active_lock:
+            self._active -= 1
+        self._slots.release()
+
+    def health(self) -> Dict[str, Any]:
+        """Get server and engine status"""
+        return {
+            "status": "ok",
+            "version": constant.SOFTWARE_VERSION,
+            "uptime": round(time.time() - self.started_at, 1),
+            "default_model": self.engine.default_model,
+            "models": self.engine.get_available_models(),
+            "active_requests": self._active,
+            "max_concurrency": self.max_concurrency,
+            "cache_entries": len(self.engine.cache),
+        }
+
+
+def run_server(host: str = ServerSettings.HOST, port: int = ServerSettings.PORT,
+               max_concurrency: int = ServerSettings.MAX_CONCURRENCY):
+    """Run the translation server until interrupted"""
+    server = TranslationServer(host, port, max_concurrency)
+    print(f"[OK] Translation server listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[INFO] Translation server stopping")
+    finally:
+        server.server_close()
+        server.engine.shutdown()
@@ -0,0 +1,226 @@
+"""
+Per-Stage Timing Instrumentation for VezylTranslator
+Records where a translation spends its time and keeps rolling histograms per provider and stage
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Enable with stage_timings = true under [performance] in advanced_config.ini
+(VEZYL_STAGE_TIMINGS=1 overrides, VEZYL_STAGE_TIMINGS=log also prints a line per request).
+Timed translations carry TranslationResult.timings in milliseconds, e.g.
+    {"routing": 0.04, "cache": 0.01, "masking": 0.02, "network": 183.5, "postprocess": 0.03, "total": 183.8}
+Stages that run in parallel (chunks, hedged requests) are summed, so they can exceed
+the total. When disabled, stage() returns a shared no-op context manager.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from VezylTranslatorNeutron.constant import EnvVars, PerformanceSettings
+
+# Stages in report order ("total" is the whole engine call)
+STAGES = (
+    "routing", "cache", "detection", "masking", "model_load", "tokenization",
+    "generation", "decode", "network", "postprocess",
+)
+
+
+class StageTrace:
+    """Stage durations of one translate call (shared with helper threads via bind)"""
+    __slots__ = ("stages", "started", "previous", "_lock")
+
+    def __init__(self, previous: Optional["StageTrace"] = None):
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.previous = previous
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, elapsed_ms: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed_ms
+
+    def finish(self) -> Dict[str, float]:
+        """Stage durations in report order plus the total"""
+        with self._lock:
+            timings = {name: round(self.stages[name], 3) for name in STAGES if name in self.stages}
+        timings["total"] = round((time.perf_counter() - self.started) * 1000, 3)
+        return timings
+
+
+class _Stage:
+    """Adds the time spent in the with-block to a trace"""
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: StageTrace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class _NullStage:
+    """No-op stage used when no trace is active"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _TraceLocal(threading.local):
+    """Current trace per thread (class default avoids a failing attribute lookup per stage)"""
+    trace: Optional[StageTrace] = None
+
+
+_NULL_STAGE = _NullStage()
+_local = _TraceLocal()
+
+
+def stage(name: str):
+    """Context manager timing one stage of the current thread's trace"""
+    trace = _local.trace
+    return _NULL_STAGE if trace is None else _Stage(trace, name)
+
+
+def bind(fn: Callable) -> Callable:
+    """Run fn on another thread with the caller's trace active"""
+    trace = _local.trace
+    if trace is None:
+        return fn
+
+    def run(*args, **kwargs):
+        previous = _local.trace
+        _local.trace = trace
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.trace = previous
+
+    return run
+
+
+# === Settings ===
+
+_settings: Optional[Tuple[bool, bool]] = None
+
+
+def _load_settings() -> Tuple[bool, bool]:
+    """(enabled, log) from the environment, falling back to advanced_config.ini"""
+    global _settings
+    if _settings is None:
+        value = os.environ.get(EnvVars.VEZYL_STAGE_TIMINGS, "").strip().lower()
+        if value:
+            _settings = (value not in ("0", "false", "off", "no"), value == "log")
+        else:
+            from .config import get_advanced_config
+            config = get_advanced_config()
+            _settings = (config.stage_timings, config.stage_timings and config.stage_timings_log)
+    return _settings
+
+
+def is_enabled() -> bool:
+    """Check if translations are timed"""
+    return _load_settings()[0]
+
+
+def set_enabled(enabled: bool, log: bool = False):
+    """Turn timing on or off at runtime (overrides config until reset_stage_timings)"""
+    global _settings
+    _settings = (enabled, enabled and log)
+
+
+# === Traces ===
+
+def begin() -> Optional[StageTrace]:
+    """Start a trace for the current thread (None when timing is disabled)"""
+    if not _load_settings()[0]:
+        return None
+    trace = StageTrace(_local.trace)
+    _local.trace = trace
+    return trace
+
+
+def end(trace: StageTrace, provider: Optional[str] = None) -> Dict[str, float]:
+    """Stop the trace, record it under provider and return its timings"""
+    _local.trace = trace.previous
+    timings = trace.finish()
+    if provider:
+        get_stage_histograms().record(provider, timings)
+        if _load_settings()[1]:
+            stages = " | ".join(f"{name} {ms:.2f}" for name, ms in timings.items() if name != "total")
+            print(f"[INFO] Stage timings ({provider}): total {timings['total']:.2f}ms | {stages}")
+    return timings
+
+
+class StageHistograms:
+    """Rolling window of stage durations per provider"""
+
+    def __init__(self, window: int = PerformanceSettings.STAGE_TIMING_WINDOW):
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, timings: Dict[str, float]):
+        with self._lock:
+            for name, elapsed_ms in timings.items():
+                samples = self._samples.get((provider, name))
+                if samples is None:
+                    samples = self._samples[(provider, name)] = deque(maxlen=self.window)
+                samples.append(elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Count, mean and percentiles per provider and stage"""
+        def percentile(values, q):
+            return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+        with self._lock:
+            snapshot = {key: sorted(samples) for key, samples in self._samples.items()}
+
+        order = {name: index for index, name in enumerate(STAGES + ("total",))}
+        stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (provider, name), values in sorted(snapshot.items(), key=lambda item: (item[0][0], order.get(item[0][1], 99))):
+            stats.setdefault(provider, {})[name] = {
+                "count": len(values),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "p50_ms": percentile(values, 0.5),
+                "p95_ms": percentile(values, 0.95),
+                "p99_ms": percentile(values, 0.99),
+                "max_ms": values[-1],
+            }
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+_stage_histograms: Optional[StageHistograms] = None
+
+
+def get_stage_histograms() -> StageHistograms:
+    """Get the global stage histograms"""
+    global _stage_histograms
+    if _stage_histograms is None:
+        _stage_histograms = StageHistograms()
+    return _stage_histograms
+
+
+def get_stage_stats() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Get rolling stage statistics per provider"""
+    return get_stage_histograms().get_stats()
+
+
+def reset_stage_timings():
+    """Clear recorded samples and reload settings (for testing)"""
+    global _settings
+    _settings = None
+    get_stage_histograms().clear()
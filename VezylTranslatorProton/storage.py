@@ -10,6 +10,7 @@ import json
 import base64
 from datetime import datetime
 from pathlib import Path
+from collections.abc import Mapping
 from typing import Dict, Any, List, Optional, Union, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -33,7 +34,7 @@ class StorageType(Enum):
     FAVORITE = "favorite"
 
 
-@dataclass
+@dataclass(slots=True)
 class StorageEntry:
     """Base storage entry container"""
     entry_id: str
@@ -56,7 +57,7 @@ class StorageEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoryEntry:
     """History entry container"""
     time: str
@@ -64,6 +65,7 @@ class HistoryEntry:
     src_lang: str
     dest_lang: str
     source: str  # "homepage" or "popup"
+    original_text: str = ""  # Source text (missing in entries written by older versions)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for backward compatibility"""
@@ -77,11 +79,12 @@ class HistoryEntry:
             last_translated_text=data.get("last_translated_text", ""),
             src_lang=data.get("src_lang", ""),
             dest_lang=data.get("dest_lang", ""),
-            source=data.get("source", "homepage")
+            source=data.get("source", "homepage"),
+            original_text=data.get("original_text", "")
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FavoriteEntry:
     """Favorite entry container"""
     time: str
@@ -108,6 +111,37 @@ class FavoriteEntry:
         )
 
 
+class RecordView(Mapping):
+    """Read-only dict view of a record for legacy callers (reads the record's slots, no copy)"""
+    __slots__ = ("_record",)
+    
+    def __init__(self, record):
+        self._record = record
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._record.__dataclass_fields__:
+            return getattr(self._record, key)
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Same as dict.get, without raising KeyError for missing keys"""
+        if key in self._record.__dataclass_fields__:
+            return getattr(self._record, key)
+        return default
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._record.__dataclass_fields__
+    
+    def __iter__(self):
+        return iter(self._record.__dataclass_fields__)
+    
+    def __len__(self) -> int:
+        return len(self._record.__dataclass_fields__)
+    
+    def __repr__(self) -> str:
+        return f"RecordView({self._record!r})"
+
+
 class CryptoManager:
     """Handles encryption and decryption operations"""
     
@@ -185,6 +219,10 @@ class CryptoManager:
                 return base64.b64decode(enc_text).decode('utf-8')
             except:
                 return enc_text  # Return as-is if can't decrypt
+    
+    def decrypt_many(self, enc_texts: List[str], key: bytes) -> List[str]:
+        """Decrypt several texts with one key"""
+        return [self.decrypt_aes(enc_text, key) for enc_text in enc_texts]
 
 
 class StorageManager:
@@ -193,6 +231,7 @@ class StorageManager:
     def __init__(self):
         self.crypto = CryptoManager()
         self._cache = {}
+        self._view_cache: Dict[str, Tuple[list, Tuple[RecordView, ...]]] = {}  # cache_key -> (entries, views)
         self._cache_lock = threading.Lock()
     
     def _get_cache_key(self, log_file: str, entry_type: str) -> str:
@@ -205,6 +244,21 @@ class StorageManager:
         with self._cache_lock:
             if cache_key in self._cache:
                 del self._cache[cache_key]
+            self._view_cache.pop(cache_key, None)
+    
+    def _get_views(self, cache_key: str, entries: list) -> Tuple[RecordView, ...]:
+        """Views over cached entries, built once per cached list"""
+        with self._cache_lock:
+            cached = self._view_cache.get(cache_key)
+            if cached is not None and cached[0] is entries:
+                return cached[1]
+        
+        views = tuple(RecordView(entry) for entry in entries)
+        with self._cache_lock:
+            # Skip caching if the file changed while the views were built
+            if self._cache.get(cache_key) is entries:
+                self._view_cache[cache_key] = (entries, views)
+        return views
     
     def _read_encrypted_file(self, log_file: str, language_interface: str, theme_interface: str) -> List[str]:
         """Read and return raw encrypted lines from file"""
@@ -237,6 +291,19 @@ class StorageManager:
             print(f"Error decrypting entry: {e}")
             return None
     
+    def _decrypt_entries(self, encrypted_lines: List[str], language_interface: str,
+                         theme_interface: str) -> List[Optional[Dict[str, Any]]]:
+        """Decrypt and parse a whole file, deriving the key once"""
+        key = self.crypto.get_aes_key(language_interface, theme_interface)
+        entries = []
+        for log_json in self.crypto.decrypt_many(encrypted_lines, key):
+            try:
+                entries.append(json.loads(log_json))
+            except Exception as e:
+                print(f"Error decrypting entry: {e}")
+                entries.append(None)
+        return entries
+    
     def _encrypt_entry(self, entry_data: Dict[str, Any], language_interface: str, theme_interface: str) -> str:
         """Encrypt single entry"""
         try:
@@ -259,7 +326,8 @@ class StorageManager:
         language_interface: str, 
         theme_interface: str,
         save_translate_history: bool = True, 
-        max_items: int = 20
+        max_items: int = 20,
+        original_text: str = ""
     ) -> bool:
         """Write history entry to encrypted file"""
         if not save_translate_history:
@@ -274,6 +342,8 @@ class StorageManager:
                 "dest_lang": dest_lang,
                 "source": source
             }
+            if original_text:
+                entry_data["original_text"] = original_text  # Lets the cache be seeded from history
             
             # Read existing lines
             lines = self._read_encrypted_file(log_file, language_interface, theme_interface)
@@ -307,8 +377,7 @@ class StorageManager:
         entries = []
         lines = self._read_encrypted_file(log_file, language_interface, theme_interface)
         
-        for line in lines:
-            entry_data = self._decrypt_entry(line, language_interface, theme_interface)
+        for entry_data in self._decrypt_entries(lines, language_interface, theme_interface):
             if entry_data:
                 try:
                     history_entry = HistoryEntry.from_dict(entry_data)
@@ -322,6 +391,11 @@ class StorageManager:
         
         return entries
     
+    def read_history_views(self, log_file: str, language_interface: str, theme_interface: str) -> Tuple[RecordView, ...]:
+        """Read history entries as read-only dict views (shared between calls until the file changes)"""
+        entries = self.read_history_entries(log_file, language_interface, theme_interface)
+        return self._get_views(self._get_cache_key(log_file, "history"), entries)
+    
     def delete_history_entry(self, log_file: str, language_interface: str, theme_interface: str, time_str: str, last_translated_text: str) -> bool:
         """Delete specific history entry"""
         try:
@@ -421,8 +495,7 @@ class StorageManager:
         entries = []
         lines = self._read_encrypted_file(log_file, language_interface, theme_interface)
         
-        for line in lines:
-            entry_data = self._decrypt_entry(line, language_interface, theme_interface)
+        for entry_data in self._decrypt_entries(lines, language_interface, theme_interface):
             if entry_data:
                 try:
                     favorite_entry = FavoriteEntry.from_dict(entry_data)
@@ -436,6 +509,11 @@ class StorageManager:
         
         return entries
     
+    def read_favorite_views(self, log_file: str, language_interface: str, theme_interface: str) -> Tuple[RecordView, ...]:
+        """Read favorite entries as read-only dict views (shared between calls until the file changes)"""
+        entries = self.read_favorite_entries(log_file, language_interface, theme_interface)
+        return self._get_views(self._get_cache_key(log_file, "favorite"), entries)
+    
     def delete_favorite_entry(self, log_file: str, language_interface: str, theme_interface: str, time_str: str, original_text: str) -> bool:
         """Delete specific favorite entry"""
         try:
@@ -504,10 +582,13 @@ class StorageManager:
     
     # === UTILITY OPERATIONS ===
     
-    def clear_cache(self):
-        """Clear all cached entries"""
+    def clear_cache(self) -> int:
+        """Clear all cached entries. Returns the number of entry lists dropped"""
         with self._cache_lock:
+            dropped = len(self._cache)
             self._cache.clear()
+            self._view_cache.clear()
+        return dropped
     
     def get_file_size(self, log_file: str) -> int:
         """Get file size in bytes"""
@@ -569,22 +650,20 @@ def reset_storage_manager():
 
 # === Legacy Support Functions ===
 
-def write_log_entry(last_translated_text, src_lang, dest_lang, source, log_file, language_interface, theme_interface, save_translate_history=True, max_items=20):
+def write_log_entry(last_translated_text, src_lang, dest_lang, source, log_file, language_interface, theme_interface, save_translate_history=True, max_items=20, original_text=""):
     """Legacy function for writing history entries"""
     manager = get_storage_manager()
     return manager.write_history_entry(
         last_translated_text, src_lang, dest_lang, source, 
         log_file, language_interface, theme_interface,
-        save_translate_history, max_items
+        save_translate_history, max_items, original_text
     )
 
 
 def read_history_entries(log_file, language_interface, theme_interface):
-    """Legacy function for reading history entries"""
+    """Legacy function for reading history entries (read-only dict views)"""
     manager = get_storage_manager()
-    entries = manager.read_history_entries(log_file, language_interface, theme_interface)
-    # Convert to dict format for backward compatibility
-    return [entry.to_dict() for entry in entries]
+    return manager.read_history_views(log_file, language_interface, theme_interface)
 
 
 def delete_history_entry(log_file, language_interface, theme_interface, time_str, last_translated_text):
@@ -609,11 +688,9 @@ def write_favorite_entry(original_text, translated_text, src_lang, dest_lang, no
 
 
 def read_favorite_entries(log_file, language_interface, theme_interface):
-    """Legacy function for reading favorite entries"""
+    """Legacy function for reading favorite entries (read-only dict views)"""
     manager = get_storage_manager()
-    entries = manager.read_favorite_entries(log_file, language_interface, theme_interface)
-    # Convert to dict format for backward compatibility
-    return [entry.to_dict() for entry in entries]
+    return manager.read_favorite_views(log_file, language_interface, theme_interface)
 
 
 def delete_favorite_entry(log_file, language_interface, theme_interface, time_str, original_text):
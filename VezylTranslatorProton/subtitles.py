@@ -0,0 +1,301 @@
+"""
+Subtitle Translation for VezylTranslator
+Translates SRT/VTT cues in context windows and re-flows the text into the original timings
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+SUBTITLE_FORMATS = ("srt", "vtt")
+
+# Context windows: neighbouring cues are joined until a sentence ends or a limit is hit
+DEFAULT_WINDOW_CUES = 4
+DEFAULT_WINDOW_CHARS = 300
+DEFAULT_MAX_GAP_MS = 2000
+# Windows per batch_translate call, and calls in flight
+DEFAULT_BATCH_WINDOWS = 32
+DEFAULT_CONCURRENCY = 4
+# Characters per subtitle line before the text is wrapped onto a second line
+LINE_LENGTH = 42
+
+_TIMING = re.compile(r"^\s*((?:\d{1,2}:)?\d{1,2}:\d{2}[,.]\d{1,3})\s*-->\s*((?:\d{1,2}:)?\d{1,2}:\d{2}[,.]\d{1,3})")
+_TAG = re.compile(r"</?[A-Za-z][^>]*>|\{\\[^}]*\}")
+_LEADING_TAGS = re.compile(r"^(?:\s*(?:</?[A-Za-z][^>]*>|\{\\[^}]*\}))+")
+_TRAILING_TAGS = re.compile(r"(?:(?:</?[A-Za-z][^>]*>|\{\\[^}]*\})\s*)+$")
+_SENTENCE_END = re.compile(r"[.!?…。！？♪][\"'”’»)\]]*$")
+_DIALOGUE_LINE = re.compile(r"^\s*[-–—]\s*")
+_BREAK_AFTER = re.compile(r"[.!?…,;:。！？、，]$")
+
+
+@dataclass
+class SubtitleCue:
+    """One timed cue; identifier and timing lines are kept verbatim"""
+    header: List[str]
+    lines: List[str]
+    start_ms: int
+    end_ms: int
+    opening_tags: str = ""
+    closing_tags: str = ""
+    segments: List[str] = field(default_factory=list)  # Plain text to translate
+    dialogue: bool = False  # One segment per "- " speaker line
+
+    def __post_init__(self):
+        joined = "\n".join(self.lines)
+        opening = _LEADING_TAGS.match(joined)
+        closing = _TRAILING_TAGS.search(joined)
+        self.opening_tags = opening.group().strip() if opening else ""
+        self.closing_tags = closing.group().strip() if closing and closing.start() > 0 else ""
+
+        plain_lines = [_TAG.sub("", line).strip() for line in self.lines]
+        plain_lines = [line for line in plain_lines if line]
+        self.dialogue = len(plain_lines) > 1 and all(_DIALOGUE_LINE.match(line) for line in plain_lines)
+        if self.dialogue:
+            self.segments = [_DIALOGUE_LINE.sub("", line) for line in plain_lines]
+        else:
+            self.segments = [" ".join(plain_lines)] if plain_lines else []
+
+
+@dataclass
+class SubtitleDocument:
+    """Parsed subtitle file: cues and verbatim blocks (WEBVTT header, NOTE, STYLE) in order"""
+    format: str
+    blocks: List[Union[str, SubtitleCue]]
+    newline: str = "\n"
+    bom: bool = False
+
+    @property
+    def cues(self) -> List[SubtitleCue]:
+        return [block for block in self.blocks if isinstance(block, SubtitleCue)]
+
+
+@dataclass
+class SubtitleStats:
+    """Work done by a subtitle translation"""
+    cues: int = 0
+    windows: int = 0
+    distinct_windows: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+
+# === Parsing ===
+
+def _timestamp_ms(value: str) -> int:
+    """Convert 00:01:02,500 / 01:02.500 to milliseconds"""
+    clock, _, fraction = value.replace(",", ".").partition(".")
+    parts = [int(part) for part in clock.split(":")]
+    while len(parts) < 3:
+        parts.insert(0, 0)
+    hours, minutes, seconds = parts
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000 + int(fraction.ljust(3, "0")[:3])
+
+
+def detect_subtitle_format(text: str) -> str:
+    """SRT or WebVTT, from the file signature"""
+    return "vtt" if text.lstrip("\ufeff").startswith("WEBVTT") else "srt"
+
+
+def parse_subtitles(text: str, subtitle_format: Optional[str] = None) -> SubtitleDocument:
+    """Parse SRT or WebVTT text"""
+    bom = text.startswith("\ufeff")
+    text = text.lstrip("\ufeff")
+    newline = "\r\n" if "\r\n" in text else "\n"
+    document = SubtitleDocument(subtitle_format or detect_subtitle_format(text), [], newline, bom)
+
+    for block in re.split(r"\n[ \t]*\n+", text.replace("\r\n", "\n").strip("\n")):
+        lines = block.split("\n")
+        timing_index = next((i for i, line in enumerate(lines[:2]) if _TIMING.match(line)), None)
+        if timing_index is None or block.startswith(("NOTE", "STYLE", "REGION")):
+            document.blocks.append(block)
+            continue
+        start, end = _TIMING.match(lines[timing_index]).groups()
+        document.blocks.append(SubtitleCue(lines[:timing_index + 1], lines[timing_index + 1:],
+                                           _timestamp_ms(start), _timestamp_ms(end)))
+    return document
+
+
+def render_subtitles(document: SubtitleDocument) -> str:
+    """Serialize a subtitle document"""
+    blocks = ["\n".join(block.header + block.lines) if isinstance(block, SubtitleCue) else block
+              for block in document.blocks]
+    text = "\n\n".join(blocks) + "\n"
+    if document.newline != "\n":
+        text = text.replace("\n", document.newline)
+    return ("\ufeff" if document.bom else "") + text
+
+
+# === Context windows ===
+
+def build_windows(cues: List[SubtitleCue], window_cues: int = DEFAULT_WINDOW_CUES,
+                  window_chars: int = DEFAULT_WINDOW_CHARS,
+                  max_gap_ms: int = DEFAULT_MAX_GAP_MS) -> List[List[Tuple[SubtitleCue, int]]]:
+    """
+    Group neighbouring cue segments that belong to the same sentence
+
+    A window is closed when its text ends a sentence, the next cue starts
+    after a long pause, or the cue/character limits are reached. Dialogue
+    cues (one speaker per line) are never merged.
+    """
+    windows: List[List[Tuple[SubtitleCue, int]]] = []
+    current: List[Tuple[SubtitleCue, int]] = []
+    current_chars = 0
+    previous: Optional[SubtitleCue] = None
+
+    def close():
+        nonlocal current, current_chars
+        if current:
+            windows.append(current)
+        current, current_chars = [], 0
+
+    for cue in cues:
+        if cue.dialogue:
+            close()
+            windows.extend([(cue, index)] for index in range(len(cue.segments)))
+            previous = None
+            continue
+        if not cue.segments:
+            continue
+        text = cue.segments[0]
+        if current and (len(current) >= window_cues or current_chars + len(text) > window_chars
+                        or previous is None or cue.start_ms - previous.end_ms > max_gap_ms):
+            close()
+        current.append((cue, 0))
+        current_chars += len(text) + 1
+        previous = cue
+        if _SENTENCE_END.search(text):
+            close()
+    close()
+    return windows
+
+
+# === Re-flow ===
+
+def _cut_positions(text: str, weights: List[int]) -> List[int]:
+    """Pick cut points near each proportional boundary, preferring spaces after punctuation"""
+    spaces = [match.start() for match in re.finditer(r"\s+", text)]
+    total = sum(weights) or 1
+    cuts, cumulative, last = [], 0, 0
+    for weight in weights[:-1]:
+        cumulative += weight
+        target = round(len(text) * cumulative / total)
+        tolerance = max(4, len(text) * weight // total // 2)
+        # Without spaces (CJK) any character boundary is a candidate
+        candidates = [position for position in spaces if position > last] or list(range(last + 1, len(text)))
+        if not candidates:
+            position = len(text)
+        else:
+            def cost(position):
+                penalty = 0 if _BREAK_AFTER.search(text[:position]) else tolerance
+                return abs(position - target) + penalty
+            position = min(candidates, key=cost)
+        cuts.append(position)
+        last = position
+    return cuts
+
+
+def split_proportionally(text: str, weights: List[int]) -> List[str]:
+    """Split translated text into len(weights) parts sized like the source segments"""
+    if len(weights) <= 1:
+        return [text.strip()]
+    parts, start = [], 0
+    for position in _cut_positions(text, weights) + [len(text)]:
+        parts.append(text[start:position].strip())
+        start = position
+    return parts
+
+
+def wrap_line(text: str, line_length: int = LINE_LENGTH) -> List[str]:
+    """Wrap a cue onto two lines at the space nearest its middle when it is too long"""
+    if len(text) <= line_length:
+        return [text]
+    spaces = [match.start() for match in re.finditer(r" ", text)]
+    if not spaces:
+        return [text]
+    middle = min(spaces, key=lambda position: abs(position - len(text) // 2))
+    return [text[:middle].rstrip(), text[middle:].strip()]
+
+
+def _apply_translations(cue: SubtitleCue, segments: List[str]):
+    """Write translated segments back into the cue lines"""
+    if cue.dialogue:
+        lines = [f"- {segment}" for segment in segments]
+    else:
+        lines = wrap_line(segments[0]) if segments else []
+    if not lines:
+        return
+    lines[0] = cue.opening_tags + lines[0]
+    lines[-1] = lines[-1] + cue.closing_tags
+    cue.lines = lines
+
+
+# === Translation ===
+
+def translate_document_cues(document: SubtitleDocument, dest_lang: str, src_lang: str = "auto",
+                            model: str = None, profile: str = None,
+                            window_cues: int = DEFAULT_WINDOW_CUES, window_chars: int = DEFAULT_WINDOW_CHARS,
+                            batch_windows: int = DEFAULT_BATCH_WINDOWS, concurrency: int = DEFAULT_CONCURRENCY,
+                            cancel_token=None) -> SubtitleStats:
+    """Translate the cues of a parsed document in place"""
+    from .translator import get_translation_engine
+    engine = get_translation_engine()
+    started = time.perf_counter()
+
+    cues = document.cues
+    windows = build_windows(cues, window_cues, window_chars)
+    window_texts = [" ".join(cue.segments[index] for cue, index in window) for window in windows]
+    distinct = list(dict.fromkeys(window_texts))
+    stats = SubtitleStats(cues=len(cues), windows=len(windows), distinct_windows=len(distinct))
+
+    def translate_chunk(texts: List[str]):
+        return engine.batch_translate(texts, src_lang, dest_lang, model, profile=profile, cancel_token=cancel_token)
+
+    chunks = [distinct[start:start + batch_windows] for start in range(0, len(distinct), max(1, batch_windows))]
+    translations: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="SubtitleTranslator") as pool:
+        for chunk, results in zip(chunks, pool.map(translate_chunk, chunks)):
+            for text, result in zip(chunk, results):
+                if result.error:
+                    stats.failed += 1
+                else:
+                    translations[text] = result.text
+
+    # Re-flow each window into its cues, sized by the source text of each cue
+    translated_segments: Dict[int, Dict[int, str]] = {}
+    for window, text in zip(windows, window_texts):
+        if text not in translations:
+            continue  # Failed windows keep their original lines
+        parts = split_proportionally(translations[text], [len(cue.segments[index]) for cue, index in window])
+        for (cue, index), part in zip(window, parts):
+            translated_segments.setdefault(id(cue), {})[index] = part
+
+    for cue in cues:
+        segments = translated_segments.get(id(cue))
+        if segments and len(segments) == len(cue.segments):
+            _apply_translations(cue, [segments[index] for index in range(len(cue.segments))])
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def translate_subtitles(text: str, dest_lang: str, src_lang: str = "auto", model: str = None,
+                        profile: str = None, subtitle_format: Optional[str] = None, **options) -> str:
+    """Translate SRT/VTT text and return it with the original timings"""
+    document = parse_subtitles(text, subtitle_format)
+    translate_document_cues(document, dest_lang, src_lang, model, profile, **options)
+    return render_subtitles(document)
+
+
+def translate_subtitle_file(input_path: str, output_path: str, dest_lang: str, src_lang: str = "auto",
+                            model: str = None, profile: str = None, **options) -> SubtitleStats:
+    """Translate a subtitle file"""
+    with open(input_path, "r", encoding="utf-8", newline="") as f:
+        document = parse_subtitles(f.read(), "vtt" if input_path.lower().endswith(".vtt") else None)
+    stats = translate_document_cues(document, dest_lang, src_lang, model, profile, **options)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        f.write(render_subtitles(document))
+    return stats
@@ -10,26 +10,212 @@ import sys
 import threading
 import time
 import json
+import hashlib
+import importlib.util
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import (
+    Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union, Tuple
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Union, Tuple, Callable
+from dataclasses import dataclass, replace
 from abc import ABC, abstractmethod
 from enum import Enum
 
-# Language detection
-try:
-    from langdetect import detect
-except ImportError:
-    detect = None
+from VezylTranslatorNeutron import constant
+from VezylTranslatorNeutron.scheduler_service import CancellationToken, TranslationCancelled
+from .config import (
+    is_marian_enabled, should_lazy_load_transformers,
+    get_inference_threads, get_inference_interop_threads,
+    get_calibrated_inference_threads, update_calibrated_inference_threads,
+    get_marian_worker_processes, get_marian_worker_affinity,
+    get_decoding_settings, is_placeholder_masking_enabled,
+    get_marian_batch_window_ms, get_marian_max_batch_size,
+    get_libretranslate_settings, get_performance_config, get_app_config
+)
+from .segmenter import LanguageSegmenter, split_sentences
+from .profiles import TranslationProfile, get_translation_profile
+from .masking import DEFAULT_PLACEHOLDER_TEMPLATE, MaskedText, is_linguistic, mask_text, unmask_text
+from . import stage_timings
 
-# Google Translate
-try:
-    from googletrans import Translator as GoogleTranslator
-except ImportError:
-    GoogleTranslator = None
 
-from VezylTranslatorNeutron import constant
-from .config import is_marian_enabled, should_lazy_load_transformers
+# Fixed sample used to time Marian generation when calibrating thread counts
+MARIAN_CALIBRATION_SAMPLE = (
+    "The translator measures how quickly it can work on this computer "
+    "so that everyday translations stay fast and responsive."
+)
+
+# Maximum number of encoded Marian inputs kept in memory
+MARIAN_ENCODING_CACHE_SIZE = 512
+
+# Seconds a Marian generate may take before the request gives up: at least MARIAN_GENERATE_TIMEOUT,
+# more for large decoding budgets (max_length x num_beams). An opus-mt model on one CPU thread
+# needs ~23ms per budget token at 256x2 and ~15ms at 512x5
+MARIAN_GENERATE_TIMEOUT = 5.0
+MARIAN_GENERATE_SECONDS_PER_TOKEN = 0.03
+
+
+# === Lazy Dependencies ===
+# Optional libraries are only imported when a provider actually needs them
+
+_module_availability: Dict[str, bool] = {}
+_language_detector = None
+
+
+def is_module_available(module_name: str) -> bool:
+    """Check if a module can be imported, without importing it"""
+    if module_name not in _module_availability:
+        try:
+            _module_availability[module_name] = importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            _module_availability[module_name] = False
+    return _module_availability[module_name]
+
+
+def get_language_detector() -> Optional[Callable[[str], str]]:
+    """Get langdetect's detect function, importing it on first use"""
+    global _language_detector
+    if _language_detector is None:
+        _language_detector = False
+        if is_module_available("langdetect"):
+            try:
+                from langdetect import detect
+                _language_detector = detect
+            except ImportError:
+                pass
+    return _language_detector or None
+
+
+def cancellation_future(cancel_token: Optional[CancellationToken], until: Future) -> Optional[Future]:
+    """Future that completes when the token is cancelled, for use in wait() sets next to `until`"""
+    if cancel_token is None:
+        return None
+    future = Future()
+    
+    def on_cancel():
+        if not future.done():
+            future.set_result(None)
+    
+    cancel_token.add_callback(on_cancel)
+    # Long-lived tokens must not keep finished work alive
+    until.add_done_callback(lambda _: cancel_token.remove_callback(on_cancel))
+    return future
+
+
+_cancel_criteria_class = None
+
+
+def make_cancel_stopping_criteria(cancel_tokens: List[Optional[CancellationToken]]):
+    """Build a StoppingCriteriaList that ends generation once every request in the batch is cancelled"""
+    global _cancel_criteria_class
+    if not any(cancel_tokens):
+        return None
+    
+    from transformers import StoppingCriteria, StoppingCriteriaList
+    if _cancel_criteria_class is None:
+        class CancelStoppingCriteria(StoppingCriteria):
+            """Stop generate between decoding steps when all requests were cancelled"""
+            def __init__(self, tokens):
+                self.tokens = tokens
+            
+            def __call__(self, input_ids, scores, **kwargs):
+                import torch
+                stop = all(token is not None and token.cancelled for token in self.tokens)
+                return torch.full((input_ids.shape[0],), stop, dtype=torch.bool, device=input_ids.device)
+        
+        _cancel_criteria_class = CancelStoppingCriteria
+    return StoppingCriteriaList([_cancel_criteria_class(list(cancel_tokens))])
+
+
+# === Marian Decoding Policy ===
+
+@dataclass
+class DecodingPolicy:
+    """
+    Marian decoding settings sized from the input token count
+    
+    Short inputs use greedy decoding, longer ones use beam search.
+    max_length grows with the number of input tokens, so scripts written
+    without spaces (zh, ja, th) are not truncated.
+    """
+    short_input_tokens: int = 16   # Inputs up to this many tokens decode greedily
+    num_beams: int = 4             # Beams for longer inputs
+    length_ratio: float = 2.0      # Output tokens allowed per input token
+    length_margin: int = 10        # Extra output tokens on top of the ratio
+    max_length_cap: int = 512
+    no_repeat_ngram_size: int = 3
+    repetition_penalty: float = 1.5
+    
+    def get_max_length(self, input_tokens: int) -> int:
+        """Get max output length for an input of this many tokens"""
+        return max(1, min(int(input_tokens * self.length_ratio) + self.length_margin, self.max_length_cap))
+    
+    def get_num_beams(self, input_tokens: int) -> int:
+        """Get beam count for an input of this many tokens"""
+        return 1 if input_tokens <= self.short_input_tokens else max(1, self.num_beams)
+    
+    def generate_kwargs(self, input_tokens: int) -> Dict[str, Any]:
+        """Build model.generate() arguments for an input of this many tokens"""
+        num_beams = self.get_num_beams(input_tokens)
+        kwargs = {
+            "max_length": self.get_max_length(input_tokens),
+            "min_length": 1,
+            "num_beams": num_beams,
+            "do_sample": False,
+            "no_repeat_ngram_size": self.no_repeat_ngram_size,
+            "repetition_penalty": self.repetition_penalty,
+        }
+        if num_beams > 1:
+            kwargs["early_stopping"] = True
+        return kwargs
+
+
+def get_generate_timeout(generate_kwargs: Dict[str, Any]) -> float:
+    """Seconds a generate with these settings may take, scaled with its max_length x num_beams budget"""
+    budget = generate_kwargs["max_length"] * max(1, generate_kwargs.get("num_beams", 1))
+    return max(MARIAN_GENERATE_TIMEOUT, budget * MARIAN_GENERATE_SECONDS_PER_TOKEN)
+
+
+# Built-in decoding profiles, selectable with [decoding] profile = ...
+DECODING_PROFILES: Dict[str, DecodingPolicy] = {
+    "instant": DecodingPolicy(short_input_tokens=64, num_beams=2, length_ratio=1.6, max_length_cap=256),
+    "balanced": DecodingPolicy(),
+    "quality": DecodingPolicy(short_input_tokens=4, num_beams=5, length_ratio=2.5),
+}
+DEFAULT_DECODING_PROFILE = "balanced"
+
+
+def _apply_decoding_settings(policy: DecodingPolicy, settings: Dict[str, str]) -> DecodingPolicy:
+    """Apply raw INI overrides on top of a policy"""
+    updates = {}
+    for name, field_info in DecodingPolicy.__dataclass_fields__.items():
+        if name in settings:
+            try:
+                updates[name] = field_info.type(settings[name]) if callable(field_info.type) else settings[name]
+            except (TypeError, ValueError):
+                print(f"[WARNING] Invalid decoding setting {name} = {settings[name]}")
+    return replace(policy, **updates) if updates else policy
+
+
+def resolve_decoding_policy(model_key: str = "", profile: Optional[str] = None) -> DecodingPolicy:
+    """
+    Resolve decoding policy for a language pair
+    
+    Order: profile -> [decoding] overrides -> [decoding:<pair>] overrides.
+    An explicit profile argument wins over the profile set in config.
+    """
+    global_settings = get_decoding_settings("")
+    pair_settings = get_decoding_settings(model_key) if model_key else {}
+    
+    profile_name = profile or pair_settings.get("profile") or global_settings.get("profile") or DEFAULT_DECODING_PROFILE
+    policy = DECODING_PROFILES.get(profile_name)
+    if policy is None:
+        print(f"[WARNING] Unknown decoding profile: {profile_name}, using {DEFAULT_DECODING_PROFILE}")
+        policy = DECODING_PROFILES[DEFAULT_DECODING_PROFILE]
+    
+    policy = _apply_decoding_settings(policy, global_settings)
+    return _apply_decoding_settings(policy, pair_settings)
 
 
 # === Marian Model Manager (merged from marian_module.py) ===
@@ -132,9 +318,10 @@ class TranslationModel(Enum):
     BING = "bing"
     MARIAN = "marian"
     OPUS = "opus"
+    LIBRETRANSLATE = "libretranslate"
 
 
-@dataclass
+@dataclass(slots=True)
 class TranslationResult:
     """Translation result container"""
     text: str
@@ -143,10 +330,12 @@ class TranslationResult:
     model: str
     confidence: float = 0.0
     error: Optional[str] = None
+    chars_saved: int = 0  # Characters kept out of the provider request by placeholder masking
+    timings: Optional[Dict[str, float]] = None  # Milliseconds per stage when stage timing is enabled
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for backward compatibility"""
-        return {
+        data = {
             "text": self.text,
             "src": self.src_lang,
             "dest": self.dest_lang,
@@ -154,11 +343,52 @@ class TranslationResult:
             "confidence": self.confidence,
             "error": self.error
         }
+        if self.timings is not None:
+            data["timings"] = self.timings
+        return data
+    
+    def as_mapping(self) -> 'TranslationResultView':
+        """Read-only view with the to_dict() keys, without building a dict"""
+        return TranslationResultView(self)
+
+
+class TranslationResultView(Mapping):
+    """Legacy dict view of a TranslationResult (keys match to_dict)"""
+    __slots__ = ("_result",)
+    
+    _ATTRIBUTES = {
+        "text": "text",
+        "src": "src_lang",
+        "dest": "dest_lang",
+        "model": "model",
+        "confidence": "confidence",
+        "error": "error",
+        "timings": "timings",
+    }
+    
+    def __init__(self, result: TranslationResult):
+        self._result = result
+    
+    def __getitem__(self, key: str) -> Any:
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is None or (key == "timings" and self._result.timings is None):
+            raise KeyError(key)
+        return getattr(self._result, attribute)
+    
+    def __iter__(self):
+        keys = iter(self._ATTRIBUTES)
+        return keys if self._result.timings is not None else (key for key in keys if key != "timings")
+    
+    def __len__(self) -> int:
+        return len(self._ATTRIBUTES) - (self._result.timings is None)
 
 
 class BaseTranslationProvider(ABC):
     """Abstract base class for translation providers"""
     
+    # Placeholder format for masked spans; it must survive the provider unchanged
+    placeholder_template = DEFAULT_PLACEHOLDER_TEMPLATE
+    
     def __init__(self, name: str):
         self.name = name
         self.is_available = False
@@ -178,37 +408,110 @@ class BaseTranslationProvider(ABC):
     def get_supported_languages(self) -> Dict[str, str]:
         """Get supported language pairs"""
         pass
+    
+    def translate_with_profile(self, text: str, src_lang: str, dest_lang: str, profile: TranslationProfile,
+                               cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate with provider-specific settings from a translation profile"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        result = self.translate(text, src_lang, dest_lang)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        return result
+    
+    def detect_language(self, text: str) -> str:
+        """Detect source language once for several targets ("auto" if unsure)"""
+        detected = detect_language(text)
+        return "auto" if detected == "unknown" else detected
+
+
+class TranslationCache:
+    """Thread-safe LRU cache of translation results"""
+    
+    def __init__(self, max_size: int = 100):
+        self.max_size = max(0, max_size)
+        self._entries: "OrderedDict[Tuple[str, str, str, str], TranslationResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[TranslationResult]:
+        """Get a copy of a cached result"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return replace(result)
+    
+    def put(self, key: Tuple[str, str, str, str], result: TranslationResult):
+        """Store a result (failed translations are not cached)"""
+        if self.max_size == 0 or result.error:
+            return
+        with self._lock:
+            self._entries[key] = replace(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def shrink(self, keep_ratio: float) -> int:
+        """Drop the least recently used entries, keeping keep_ratio of them. Returns the number dropped"""
+        with self._lock:
+            drop = len(self._entries) - int(len(self._entries) * keep_ratio)
+            for _ in range(drop):
+                self._entries.popitem(last=False)
+            return drop
+    
+    def seed(self, key: Tuple[str, str, str, str], result: TranslationResult) -> bool:
+        """Add a known result as least recently used, only into free space and never over an entry"""
+        with self._lock:
+            if key in self._entries or len(self._entries) >= self.max_size:
+                return False
+            self._entries[key] = replace(result)
+            self._entries.move_to_end(key, last=False)
+            return True
+    
+    def clear(self):
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class GoogleTranslationProvider(BaseTranslationProvider):
     """Google Translation provider"""
     
     def __init__(self):
-        self.translator = None
         super().__init__("google")
     
     def _check_availability(self):
-        """Check if Google Translate is available"""
-        try:
-            if GoogleTranslator is not None:
-                self.translator = GoogleTranslator()
-                if self.translator is not None:
-                    self.is_available = True
-                    print("[OK] Google Translator available")
-                else:
-                    self.is_available = False
-                    print("[ERROR] Google Translator creation returned None")
-            else:
-                print("[WARNING] Google Translator library not imported")
-                self.is_available = False
-        except Exception as e:
-            print(f"[ERROR] Google Translator initialization failed: {e}")
-            self.is_available = False
-            self.translator = None
+        """Check if Google Translate is available (googletrans is imported on first translation)"""
+        self.is_available = is_module_available("googletrans")
+        if self.is_available:
+            print("[OK] Google Translator available")
+        else:
+            print("[WARNING] Google Translator library not installed")
     
     def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi") -> TranslationResult:
         """Translate using Google Translate"""
-        if not self.is_available or not self.translator:
+        return self._translate(text, src_lang, dest_lang)
+    
+    def translate_with_profile(self, text: str, src_lang: str, dest_lang: str, profile: TranslationProfile,
+                               cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate, aborting the HTTP request if the token is cancelled"""
+        return self._translate(text, src_lang, dest_lang, cancel_token)
+    
+    def _translate(self, text: str, src_lang: str, dest_lang: str,
+                   cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Run one Google request"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        
+        if not self.is_available:
             return TranslationResult(
                 text=f"Google Translate không khả dụng: {text}",
                 src_lang=src_lang,
@@ -233,6 +536,7 @@ class GoogleTranslationProvider(BaseTranslationProvider):
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
                     
+                    abort = None
                     try:
                         # Call translate method
                         if src_lang == "auto":
@@ -240,18 +544,31 @@ class GoogleTranslationProvider(BaseTranslationProvider):
                         else:
                             coro = thread_translator.translate(text, src=src_lang, dest=dest_lang)
                         
-                        # Run the coroutine
-                        result = loop.run_until_complete(coro)
+                        # Run the coroutine as a task so cancellation aborts the HTTP request
+                        task = loop.create_task(coro)
+                        if cancel_token is not None:
+                            def abort():
+                                try:
+                                    loop.call_soon_threadsafe(task.cancel)
+                                except RuntimeError:
+                                    pass  # Loop already closed
+                            cancel_token.add_callback(abort)
+                        try:
+                            result = loop.run_until_complete(task)
+                        except asyncio.CancelledError:
+                            raise TranslationCancelled()
                         return result
                         
                     finally:
+                        if abort is not None:
+                            cancel_token.remove_callback(abort)
                         loop.close()
                         
                 except Exception as e:
                     raise e
             
             # Always use thread for Google Translate to avoid async conflicts
-            with concurrent.futures.ThreadPoolExecutor() as executor:
+            with concurrent.futures.ThreadPoolExecutor() as executor, stage_timings.stage("network"):
                 future = executor.submit(run_translation_in_thread)
                 result = future.result(timeout=15)  # 15 second timeout
             
@@ -274,6 +591,8 @@ class GoogleTranslationProvider(BaseTranslationProvider):
                     confidence=0.5
                 )
                 
+        except TranslationCancelled:
+            raise
         except Exception as e:
             return TranslationResult(
                 text=f"Lỗi dịch Google: {text}",
@@ -304,11 +623,40 @@ class GoogleTranslationProvider(BaseTranslationProvider):
 class MarianTranslationProvider(BaseTranslationProvider):
     """Marian MT translation provider"""
     
+    # SentencePiece vocabularies have no ⟦⟧, and unknown pieces are dropped on decode
+    placeholder_template = "[{}]"
+    
     def __init__(self):
         self.model_manager = None
         self.transformers_available = False
         self.model_cache = {}
         self.tokenizer_cache = {}
+        self._model_last_used: Dict[str, float] = {}
+        self._model_load_lock = threading.RLock()
+        
+        # Encoded inputs keyed by (model path, text hash)
+        self._encoding_cache = OrderedDict()
+        self._encoding_cache_lock = threading.Lock()
+        self._pivot_vocab_match = {}
+        
+        # Torch threading profile (applied once, before the first generate)
+        self._inference_threads = None
+        self._thread_profile_lock = threading.Lock()
+        
+        # Decoding profile override (None = profile from advanced config)
+        self.decoding_profile = None
+        
+        # Optional multi-process worker pool for batch jobs
+        self._worker_pool = None
+        self._worker_pool_lock = threading.Lock()
+        
+        # Splits mixed-language input into runs per language
+        self.segmenter = LanguageSegmenter()
+        
+        # Micro-batcher for concurrent in-process requests
+        self._batcher = None
+        self._batcher_disabled = False
+        self._batcher_lock = threading.Lock()
         
         # Check if Marian is enabled in advanced config
         if not is_marian_enabled():
@@ -371,18 +719,20 @@ class MarianTranslationProvider(BaseTranslationProvider):
                 
     def _lazy_load_transformers(self):
         """Lazy load transformers library when needed"""
-        if not hasattr(self, 'MarianMTModel') or not hasattr(self, 'MarianTokenizer'):
-            try:
-                from transformers import MarianMTModel, MarianTokenizer
-                self.MarianMTModel = MarianMTModel
-                self.MarianTokenizer = MarianTokenizer
-                print("[OK] Transformers library lazy loaded for Marian MT")
-                return True
-            except ImportError as e:
-                print(f"[ERROR] Failed to lazy load transformers: {e}")
-                self.transformers_available = False
-                return False
-        return True
+        # Concurrent runs (mixed-language segments) must not import transformers twice
+        with self._model_load_lock:
+            if not hasattr(self, 'MarianMTModel') or not hasattr(self, 'MarianTokenizer'):
+                try:
+                    from transformers import MarianMTModel, MarianTokenizer
+                    self.MarianMTModel = MarianMTModel
+                    self.MarianTokenizer = MarianTokenizer
+                    print("[OK] Transformers library lazy loaded for Marian MT")
+                    return True
+                except ImportError as e:
+                    print(f"[ERROR] Failed to lazy load transformers: {e}")
+                    self.transformers_available = False
+                    return False
+            return True
     
     def _load_dictionaries(self):
         """Load simple translation dictionaries for fallback"""
@@ -451,7 +801,9 @@ class MarianTranslationProvider(BaseTranslationProvider):
             }
         }
     
-    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi") -> TranslationResult:
+    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi",
+                  decoding_profile: Optional[str] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
         """Translate using Marian MT"""
         if not self.is_available or not self.model_manager:
             return TranslationResult(
@@ -465,31 +817,23 @@ class MarianTranslationProvider(BaseTranslationProvider):
         try:
             # Auto-detect language if needed
             if src_lang == "auto":
-                detected = self._detect_language(text)
+                with stage_timings.stage("detection"):
+                    detected = self._detect_language(text)
                 if detected == 'unknown':
                     src_lang = "en"  # Fallback
                 elif detected == 'mixed':
-                    return self._handle_mixed_language(text, dest_lang)
+                    return self._handle_mixed_language(text, dest_lang, decoding_profile, cancel_token)
                 else:
                     src_lang = detected
             
             # Try dictionary first for simple/common phrases
-            dict_key = (src_lang, dest_lang)
-            if dict_key in self.dictionaries:
-                text_lower = text.lower().strip()
-                if text_lower in self.dictionaries[dict_key]:
-                    translated = self.dictionaries[dict_key][text_lower]
-                    return TranslationResult(
-                        text=translated,
-                        src_lang=src_lang,
-                        dest_lang=dest_lang,
-                        model="marian",
-                        confidence=0.9
-                    )
+            dictionary_result = self._lookup_dictionary(text, src_lang, dest_lang)
+            if dictionary_result:
+                return dictionary_result
             
             # Try AI model if transformers available
             if self.transformers_available:
-                result = self._translate_with_ai_model(text, src_lang, dest_lang)
+                result = self._translate_with_ai_model(text, src_lang, dest_lang, decoding_profile, cancel_token)
                 if result:
                     return result
             
@@ -503,6 +847,8 @@ class MarianTranslationProvider(BaseTranslationProvider):
                 error="No suitable model found"
             )
             
+        except TranslationCancelled:
+            raise
         except Exception as e:
             return TranslationResult(
                 text=f"Lỗi Marian: {text}",
@@ -512,8 +858,183 @@ class MarianTranslationProvider(BaseTranslationProvider):
                 error=str(e)
             )
     
+    def _lookup_dictionary(self, text: str, src_lang: str, dest_lang: str) -> Optional[TranslationResult]:
+        """Look up simple/common phrases in the built-in dictionaries"""
+        dict_key = (src_lang, dest_lang)
+        if dict_key in self.dictionaries:
+            text_lower = text.lower().strip()
+            if text_lower in self.dictionaries[dict_key]:
+                return TranslationResult(
+                    text=self.dictionaries[dict_key][text_lower],
+                    src_lang=src_lang,
+                    dest_lang=dest_lang,
+                    model="marian",
+                    confidence=0.9
+                )
+        return None
+    
+    def detect_language(self, text: str) -> str:
+        """Detect source language once for several targets ("auto" if unsure or mixed)"""
+        detected = self._detect_language(text)
+        return "auto" if detected in ("unknown", "mixed") else detected
+    
+    def translate_with_profile(self, text: str, src_lang: str, dest_lang: str, profile: TranslationProfile,
+                               cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate with the profile's decoding settings"""
+        return self.translate(text, src_lang, dest_lang, profile.decoding_profile, cancel_token)
+    
+    def translate_multi(self, text: str, src_lang: str, dest_langs: List[str],
+                        decoding_profile: Optional[str] = None) -> Dict[str, TranslationResult]:
+        """Translate one text into several languages, sharing the src->en pivot hop"""
+        results: Dict[str, TranslationResult] = {}
+        pivot_targets = []
+        
+        # Targets in the source language need no model at all
+        for dest_lang in dest_langs:
+            if dest_lang == src_lang:
+                results[dest_lang] = TranslationResult(
+                    text=text, src_lang=src_lang, dest_lang=dest_lang, model="marian", confidence=1.0
+                )
+        
+        if self.is_available and self.transformers_available and src_lang not in ("auto", "en"):
+            for dest_lang in dest_langs:
+                if (dest_lang not in (src_lang, "en")
+                        and not self._lookup_dictionary(text, src_lang, dest_lang)
+                        and not self.model_manager.get_model_path(f"{src_lang}-{dest_lang}")
+                        and self.model_manager.get_model_path(f"en-{dest_lang}")):
+                    pivot_targets.append(dest_lang)
+        
+        en_model_path = self.model_manager.get_model_path(f"{src_lang}-en") if pivot_targets else None
+        if en_model_path:
+            # Run the first hop once for every target that needs it
+            en_ids, en_text = self._run_model(text, en_model_path, src_lang, "en", decoding_profile=decoding_profile)
+            if en_ids is not None and en_text:
+                if "en" in dest_langs:
+                    results["en"] = TranslationResult(
+                        text=en_text, src_lang=src_lang, dest_lang="en", model="marian", confidence=0.8
+                    )
+                
+                def second_hop(dest_lang):
+                    dest_model_path = self.model_manager.get_model_path(f"en-{dest_lang}")
+                    input_ids = None
+                    if self._can_reuse_pivot_ids(en_model_path, dest_model_path):
+                        input_ids = self._output_to_input_ids(en_model_path, en_ids)
+                    result = self._translate_with_model(en_text, dest_model_path, "en", dest_lang,
+                                                        input_ids=input_ids, decoding_profile=decoding_profile)
+                    if result:
+                        result.src_lang = src_lang  # Keep original source
+                    return result
+                
+                with ThreadPoolExecutor(max_workers=min(len(pivot_targets), 4)) as executor:
+                    for dest_lang, result in zip(pivot_targets, executor.map(second_hop, pivot_targets)):
+                        if result:
+                            results[dest_lang] = result
+        
+        # Everything else goes through the regular path concurrently
+        remaining = [dest_lang for dest_lang in dest_langs if dest_lang not in results]
+        if remaining:
+            with ThreadPoolExecutor(max_workers=min(len(remaining), 4)) as executor:
+                for dest_lang, result in zip(remaining, executor.map(lambda d: self.translate(text, src_lang, d, decoding_profile), remaining)):
+                    results[dest_lang] = result
+        
+        return results
+    
+    def translate_batch(self, texts: List[str], src_lang: str = "auto", dest_lang: str = "vi",
+                        decoding_profile: Optional[str] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> List[TranslationResult]:
+        """Translate many texts, spreading them across worker processes when enabled"""
+        pool = self._get_worker_pool()
+        if pool is None or len(texts) < 2:
+            batcher = self._get_batcher() if len(texts) > 1 else None
+            if batcher is None:
+                return [self.translate(text, src_lang, dest_lang, decoding_profile, cancel_token) for text in texts]
+            
+            # Submit together so the micro-batcher fills whole batches
+            translate_one = stage_timings.bind(
+                lambda text: self.translate(text, src_lang, dest_lang, decoding_profile, cancel_token)
+            )
+            with ThreadPoolExecutor(max_workers=min(len(texts), batcher.max_batch_size)) as executor:
+                return list(executor.map(translate_one, texts))
+        
+        futures = [self.submit_translation(text, src_lang, dest_lang, decoding_profile) for text in texts]
+        results = []
+        for future in futures:
+            if cancel_token is not None and cancel_token.cancelled:
+                for pending in futures:
+                    pending.cancel()
+                cancel_token.raise_if_cancelled()
+            results.append(future.result())
+        return results
+    
+    def submit_translation(self, text: str, src_lang: str = "auto", dest_lang: str = "vi",
+                           decoding_profile: Optional[str] = None) -> Future:
+        """Submit a translation to the worker pool and return a future"""
+        result_future = Future()
+        pool = self._get_worker_pool()
+        
+        if pool is None:
+            result_future.set_result(self.translate(text, src_lang, dest_lang, decoding_profile))
+            return result_future
+        
+        def on_done(worker_future):
+            try:
+                result_future.set_result(worker_future.result())
+            except Exception as e:
+                # Worker crashed or failed - fall back to in-process inference
+                print(f"[WARNING] Marian worker failed ({e}), translating in-process")
+                try:
+                    result_future.set_result(self.translate(text, src_lang, dest_lang, decoding_profile))
+                except Exception as fallback_error:
+                    result_future.set_exception(fallback_error)
+        
+        try:
+            pool.submit(text, src_lang, dest_lang, decoding_profile).add_done_callback(on_done)
+        except Exception as e:
+            print(f"[WARNING] Cannot submit to Marian worker pool ({e}), translating in-process")
+            result_future.set_result(self.translate(text, src_lang, dest_lang, decoding_profile))
+        
+        return result_future
+    
+    def _get_worker_pool(self):
+        """Get the worker pool, creating it on first use if configured"""
+        if not self.is_available:
+            return None
+        
+        workers = get_marian_worker_processes()
+        if workers <= 0:
+            return None
+        
+        with self._worker_pool_lock:
+            if self._worker_pool is None:
+                from .marian_pool import MarianWorkerPool, parse_affinity
+                self._worker_pool = MarianWorkerPool(workers, parse_affinity(get_marian_worker_affinity()))
+                print(f"[OK] Marian worker pool started with {workers} processes")
+            return self._worker_pool
+    
+    def shutdown_worker_pool(self):
+        """Stop Marian worker processes"""
+        with self._worker_pool_lock:
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+                self._worker_pool = None
+    
+    def shutdown(self):
+        """Stop worker processes and the micro-batcher"""
+        self.shutdown_worker_pool()
+        with self._batcher_lock:
+            if self._batcher is not None:
+                self._batcher.shutdown()
+                self._batcher = None
+    
     def _detect_language(self, text: str) -> str:
-        """Detect language of text"""
+        """Detect language of text ('mixed' when it contains several languages)"""
+        languages = self.segmenter.languages(text)
+        if len(languages) > 1:
+            return "mixed"
+        if len(languages) == 1:
+            return languages[0]
+        
+        detect = get_language_detector()
         if not detect:
             return "unknown"
         
@@ -523,132 +1044,447 @@ class MarianTranslationProvider(BaseTranslationProvider):
         except:
             return "unknown"
     
-    def _handle_mixed_language(self, text: str, dest_lang: str) -> TranslationResult:
-        """Handle mixed language text"""
-        # Simple mixed language handling
+    def _handle_mixed_language(self, text: str, dest_lang: str, decoding_profile: Optional[str] = None,
+                               cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate each language run with its own source language and reassemble in order"""
+        segments = self.segmenter.segment(text)
+        dest_base = dest_lang.split("-")[0]
+        
+        # Runs already in the target language are kept as they are
+        pending = [s for s in segments if s.lang and s.lang != dest_base and s.text.strip()]
+        
+        def translate_segment(segment):
+            return self.translate(segment.text, segment.lang, dest_lang, decoding_profile, cancel_token)
+        
+        if len(pending) > 1:
+            # Concurrent runs are grouped by the micro-batcher
+            with ThreadPoolExecutor(max_workers=min(len(pending), 4)) as executor:
+                results = list(executor.map(translate_segment, pending))
+        else:
+            results = [translate_segment(segment) for segment in pending]
+        
+        translated = {}
+        confidence = 1.0
+        errors = []
+        for segment, result in zip(pending, results):
+            if result.error:
+                errors.append(f"{segment.lang}: {result.error}")
+                confidence = min(confidence, 0.3)
+            else:
+                translated[id(segment)] = result.text
+                confidence = min(confidence, result.confidence)
+        
+        output = "".join(translated.get(id(s), s.text) + s.separator for s in segments)
         return TranslationResult(
-            text=f"[Mixed] {text}",
+            text=output,
             src_lang="mixed",
             dest_lang=dest_lang,
             model="marian",
-            confidence=0.3
+            confidence=confidence,
+            error="; ".join(errors) if len(errors) == len(pending) and errors else None
         )
     
-    def _translate_with_ai_model(self, text: str, src_lang: str, dest_lang: str) -> Optional[TranslationResult]:
+    def _translate_with_ai_model(self, text: str, src_lang: str, dest_lang: str,
+                                 decoding_profile: Optional[str] = None,
+                                 cancel_token: Optional[CancellationToken] = None) -> Optional[TranslationResult]:
         """Translate using AI model"""
         model_key = f"{src_lang}-{dest_lang}"
         model_path = self.model_manager.get_model_path(model_key)
         
         # Try direct translation
         if model_path:
-            result = self._translate_with_model(text, model_path, src_lang, dest_lang)
+            result = self._translate_with_model(text, model_path, src_lang, dest_lang, decoding_profile=decoding_profile,
+                                                cancel_token=cancel_token)
             if result:
                 return result
         
         # Try two-step translation through English
         if src_lang != "en" and dest_lang != "en":
-            # Step 1: src -> en
-            en_model_key = f"{src_lang}-en"
-            en_model_path = self.model_manager.get_model_path(en_model_key)
-            
-            if en_model_path:
-                en_result = self._translate_with_model(text, en_model_path, src_lang, "en")
-                if en_result and en_result.text:
-                    # Step 2: en -> dest
-                    dest_model_key = f"en-{dest_lang}"
-                    dest_model_path = self.model_manager.get_model_path(dest_model_key)
+            en_model_path = self.model_manager.get_model_path(f"{src_lang}-en")
+            dest_model_path = self.model_manager.get_model_path(f"en-{dest_lang}")
+            
+            if en_model_path and dest_model_path:
+                # Step 1: src -> en
+                en_ids, en_text = self._run_model(text, en_model_path, src_lang, "en", decoding_profile=decoding_profile,
+                                                  cancel_token=cancel_token)
+                if en_ids is not None and en_text:
+                    # Step 2: en -> dest, reusing token IDs when vocabularies match
+                    if self._can_reuse_pivot_ids(en_model_path, dest_model_path):
+                        final_result = self._translate_with_model(
+                            en_text, dest_model_path, "en", dest_lang,
+                            input_ids=self._output_to_input_ids(en_model_path, en_ids),
+                            decoding_profile=decoding_profile,
+                            cancel_token=cancel_token
+                        )
+                    else:
+                        final_result = self._translate_with_model(en_text, dest_model_path, "en", dest_lang,
+                                                                  decoding_profile=decoding_profile,
+                                                                  cancel_token=cancel_token)
                     
-                    if dest_model_path:
-                        final_result = self._translate_with_model(en_result.text, dest_model_path, "en", dest_lang)
-                        if final_result:
-                            final_result.src_lang = src_lang  # Keep original source
-                            return final_result
+                    if final_result:
+                        final_result.src_lang = src_lang  # Keep original source
+                        return final_result
         
         return None
     
-    def _translate_with_model(self, text: str, model_path: str, src_lang: str, dest_lang: str) -> Optional[TranslationResult]:
+    def _translate_with_model(self, text: str, model_path: str, src_lang: str, dest_lang: str,
+                              input_ids: Optional[List[int]] = None,
+                              decoding_profile: Optional[str] = None,
+                              cancel_token: Optional[CancellationToken] = None) -> Optional[TranslationResult]:
         """Translate using specific model"""
+        output_ids, translated_text = self._run_model(text, model_path, src_lang, dest_lang, input_ids,
+                                                      decoding_profile, cancel_token)
+        if output_ids is None:
+            return None
+        
+        # Check for repetition
+        words = translated_text.split()
+        if len(words) > 10:
+            unique_words = set(words)
+            if len(unique_words) / len(words) < 0.5:
+                return None  # Too much repetition
+        
+        return TranslationResult(
+            text=translated_text,
+            src_lang=src_lang,
+            dest_lang=dest_lang,
+            model="marian",
+            confidence=0.8
+        )
+    
+    def _run_model(self, text: str, model_path: str, src_lang: str, dest_lang: str,
+                   input_ids: Optional[List[int]] = None, decoding_profile: Optional[str] = None,
+                   cancel_token: Optional[CancellationToken] = None) -> Tuple[Optional[List[int]], str]:
+        """Encode, generate and decode with one model. Returns (output token IDs, text)"""
         try:
-            # Lazy load transformers if needed
-            if should_lazy_load_transformers() and not self._lazy_load_transformers():
-                return None
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+
+            with stage_timings.stage("model_load"):
+                loaded = self._load_model(model_path)
+                if loaded is None:
+                    return None, ""
+                model, tokenizer = loaded
                 
-            # Check required files
-            required_files = ["pytorch_model.bin", "config.json"]
-            for file in required_files:
-                if not os.path.exists(os.path.join(model_path, file)):
-                    return None
+                # Configure torch threads before the first generate
+                self._apply_thread_profile(model, tokenizer)
             
-            # Load model and tokenizer with caching
-            if model_path not in self.model_cache:
-                print(f"Loading Marian model: {model_path}")
-                self.model_cache[model_path] = self.MarianMTModel.from_pretrained(model_path, local_files_only=True)
-                self.tokenizer_cache[model_path] = self.MarianTokenizer.from_pretrained(model_path, local_files_only=True)
+            # Prepare inputs (cached per model and text)
+            if input_ids is None:
+                with stage_timings.stage("tokenization"):
+                    input_ids = self._encode(model_path, tokenizer, text)
             
-            model = self.model_cache[model_path]
-            tokenizer = self.tokenizer_cache[model_path]
+            # Size decoding from the real token count, not whitespace words
+            model_key = f"{src_lang}-{dest_lang}"
+            policy = resolve_decoding_policy(model_key, decoding_profile or self.decoding_profile)
+            generate_kwargs = policy.generate_kwargs(len(input_ids))
             
-            # Prepare inputs
-            inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-            
-            # Generate with timeout
-            result_container = [None]
-            exception_container = [None]
+            batcher = self._get_batcher()
+            if batcher is not None:
+                # Requests with the same model and beam count share one generate
+                future = batcher.submit((model_path, generate_kwargs["num_beams"]),
+                                        (input_ids, generate_kwargs, cancel_token))
+                cancelled = cancellation_future(cancel_token, future)
+                # The batch decodes up to its longest input's max_length, at most the policy cap
+                timeout = get_generate_timeout(dict(generate_kwargs, max_length=policy.max_length_cap))
+                with stage_timings.stage("generation"):  # Includes the batching window
+                    wait([f for f in (future, cancelled) if f is not None],
+                         timeout=timeout + batcher.window, return_when=FIRST_COMPLETED)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                if not future.done():
+                    print(f"Model generation timeout: {text}")
+                    return None, ""
+                output_ids = future.result()
+            else:
+                with stage_timings.stage("generation"):
+                    output_ids = self._generate_with_timeout(model, tokenizer, input_ids, generate_kwargs,
+                                                             cancel_token)
+                if output_ids is None:
+                    print(f"Model generation timeout: {text}")
+                    return None, ""
             
-            def generate_with_timeout():
-                try:
-                    outputs = model.generate(
-                        **inputs,
-                        max_length=min(len(text.split()) * 3 + 10, 128),
-                        min_length=1,
-                        num_beams=2,
-                        early_stopping=True,
-                        no_repeat_ngram_size=3,
-                        repetition_penalty=1.5,
-                        do_sample=False,
-                        pad_token_id=tokenizer.pad_token_id,
-                        eos_token_id=tokenizer.eos_token_id
-                    )
-                    result_container[0] = outputs
-                except Exception as e:
-                    exception_container[0] = e
+            # Generation stopped early for a cancelled request: skip decoding
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             
-            thread = threading.Thread(target=generate_with_timeout)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=5.0)
+            with stage_timings.stage("decode"):
+                return output_ids, tokenizer.decode(output_ids, skip_special_tokens=True)
             
-            if thread.is_alive():
-                print(f"Model generation timeout: {text}")
+        except TranslationCancelled:
+            raise
+        except Exception as e:
+            print(f"Model translation error: {e}")
+            return None, ""
+    
+    def _load_model(self, model_path: str) -> Optional[Tuple[Any, Any]]:
+        """Load model and tokenizer with caching. Returns (model, tokenizer)"""
+        # Lazy load transformers if needed
+        if should_lazy_load_transformers() and not self._lazy_load_transformers():
+            return None
+        
+        # Check required files
+        required_files = ["pytorch_model.bin", "config.json"]
+        for file in required_files:
+            if not os.path.exists(os.path.join(model_path, file)):
                 return None
+        
+        with self._model_load_lock:
+            if model_path not in self.model_cache:
+                print(f"Loading Marian model: {model_path}")
+                self.model_cache[model_path] = self.MarianMTModel.from_pretrained(model_path, local_files_only=True)
+                self.tokenizer_cache[model_path] = self.MarianTokenizer.from_pretrained(model_path, local_files_only=True)
+            self._model_last_used[model_path] = time.monotonic()
+            return self.model_cache[model_path], self.tokenizer_cache[model_path]
+    
+    def evict_models(self, idle_seconds: float = 0.0) -> List[str]:
+        """Unload models unused for idle_seconds (they reload on next use). Returns evicted paths"""
+        now = time.monotonic()
+        with self._model_load_lock:
+            evicted = [path for path in self.model_cache
+                       if now - self._model_last_used.get(path, 0.0) >= idle_seconds]
+            for path in evicted:
+                del self.model_cache[path]
+                del self.tokenizer_cache[path]
+                self._model_last_used.pop(path, None)
+        if evicted:
+            with self._encoding_cache_lock:
+                for key in [key for key in self._encoding_cache if key[0] in evicted]:
+                    del self._encoding_cache[key]
+        return evicted
+    
+    def _generate_with_timeout(self, model, tokenizer, input_ids: List[int],
+                               generate_kwargs: Dict[str, Any],
+                               cancel_token: Optional[CancellationToken] = None) -> Optional[List[int]]:
+        """Run generate for one input on a separate thread. Returns None on timeout (see get_generate_timeout)"""
+        result_container = [None]
+        exception_container = [None]
+        
+        def generate_with_timeout():
+            try:
+                self._set_torch_threads()
+                result_container[0] = self._generate_batch(
+                    model, tokenizer, [input_ids], generate_kwargs,
+                    make_cancel_stopping_criteria([cancel_token])
+                )[0]
+            except Exception as e:
+                exception_container[0] = e
+        
+        thread = threading.Thread(target=generate_with_timeout)
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout=get_generate_timeout(generate_kwargs))
+        
+        if thread.is_alive():
+            return None
+        
+        if exception_container[0]:
+            raise exception_container[0]
+        
+        return result_container[0]
+    
+    @staticmethod
+    def _generate_batch(model, tokenizer, ids_batch: List[List[int]],
+                        generate_kwargs: Dict[str, Any], stopping_criteria=None) -> List[List[int]]:
+        """Run one padded generate over several encoded inputs"""
+        inputs = tokenizer.pad({"input_ids": ids_batch}, return_tensors="pt")
+        if stopping_criteria is not None:
+            generate_kwargs = dict(generate_kwargs, stopping_criteria=stopping_criteria)
+        outputs = model.generate(
+            **inputs,
+            **generate_kwargs,
+            pad_token_id=tokenizer.pad_token_id,
+            eos_token_id=tokenizer.eos_token_id
+        )
+        return [row.tolist() for row in outputs]
+    
+    def _run_micro_batch(self, key: Tuple[str, int],
+                         payloads: List[Tuple[List[int], Dict[str, Any], Optional[CancellationToken]]]) -> List[List[int]]:
+        """Run a micro-batch collected by the batcher"""
+        model_path = key[0]
+        loaded = self._load_model(model_path)  # Reloads if evicted since submit
+        if loaded is None:
+            # Fails every request in the batch; each falls back like a single request without a model
+            raise RuntimeError(f"Marian model not available: {model_path}")
+        model, tokenizer = loaded
+        self._set_torch_threads()
+        
+        # The longest input decides the output budget for the whole batch
+        generate_kwargs = max((kwargs for _, kwargs, _ in payloads), key=lambda kwargs: kwargs["max_length"])
+        return self._generate_batch(model, tokenizer, [ids for ids, _, _ in payloads], generate_kwargs,
+                                    make_cancel_stopping_criteria([token for _, _, token in payloads]))
+    
+    def _get_batcher(self):
+        """Get micro-batcher, creating it on first use (None when disabled)"""
+        if self._batcher is None and not self._batcher_disabled:
+            with self._batcher_lock:
+                if self._batcher is None and not self._batcher_disabled:
+                    window_ms = get_marian_batch_window_ms()
+                    if window_ms <= 0:
+                        self._batcher_disabled = True
+                        return None
+                    from .marian_batcher import MarianMicroBatcher
+                    self._batcher = MarianMicroBatcher(
+                        self._run_micro_batch, window_ms, get_marian_max_batch_size()
+                    )
+        return self._batcher
+    
+    def get_batcher_stats(self) -> Optional[Dict[str, Any]]:
+        """Get micro-batching metrics (batch sizes, queueing delay)"""
+        return self._batcher.get_stats() if self._batcher is not None else None
+    
+    def _encode(self, model_path: str, tokenizer, text: str) -> List[int]:
+        """Encode text to token IDs, with a bounded cache keyed by (model, text hash)"""
+        cache_key = (model_path, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        
+        with self._encoding_cache_lock:
+            input_ids = self._encoding_cache.get(cache_key)
+            if input_ids is not None:
+                self._encoding_cache.move_to_end(cache_key)
+                return input_ids
+        
+        input_ids = tokenizer(text, truncation=True, max_length=512)["input_ids"]
+        
+        with self._encoding_cache_lock:
+            self._encoding_cache[cache_key] = input_ids
+            while len(self._encoding_cache) > MARIAN_ENCODING_CACHE_SIZE:
+                self._encoding_cache.popitem(last=False)
+        
+        return input_ids
+    
+    def _output_to_input_ids(self, model_path: str, output_ids: List[int]) -> List[int]:
+        """Turn generated token IDs into encoder input IDs for the next pivot hop"""
+        model, tokenizer = self._load_model(model_path)
+        start_id = model.config.decoder_start_token_id
+        eos_id = tokenizer.eos_token_id
+        
+        ids = list(output_ids)
+        if ids and ids[0] == start_id:
+            ids = ids[1:]
+        if eos_id in ids:
+            ids = ids[:ids.index(eos_id)]
+        ids = [i for i in ids if i != tokenizer.pad_token_id]
+        return ids + [eos_id]
+    
+    def _can_reuse_pivot_ids(self, first_model_path: str, second_model_path: str) -> bool:
+        """Check if the first model's output vocabulary is the second model's input vocabulary"""
+        cache_key = (first_model_path, second_model_path)
+        if cache_key not in self._pivot_vocab_match:
+            first = self._file_digest(os.path.join(first_model_path, "target.spm"))
+            second = self._file_digest(os.path.join(second_model_path, "source.spm"))
+            first_vocab = self._file_digest(os.path.join(first_model_path, "vocab.json"))
+            second_vocab = self._file_digest(os.path.join(second_model_path, "vocab.json"))
+            self._pivot_vocab_match[cache_key] = bool(first and first == second and first_vocab and first_vocab == second_vocab)
+        return self._pivot_vocab_match[cache_key]
+    
+    @staticmethod
+    def _file_digest(path: str) -> Optional[str]:
+        """Get SHA-256 of a file, or None if it does not exist"""
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+    
+    def set_inference_threads(self, threads: int):
+        """Use a fixed torch thread count instead of the configured profile"""
+        with self._thread_profile_lock:
+            self._inference_threads = max(1, threads)
+    
+    def _apply_thread_profile(self, model, tokenizer):
+        """Apply the configured torch thread counts (calibrating once in "auto" mode)"""
+        if self._inference_threads is not None:
+            return
+        
+        with self._thread_profile_lock:
+            if self._inference_threads is not None:
+                return
             
-            if exception_container[0]:
-                raise exception_container[0]
-            
-            if result_container[0] is None:
-                return None
+            try:
+                import torch
+            except ImportError:
+                self._inference_threads = 0
+                return
             
-            outputs = result_container[0]
-            translated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
+            # Inter-op threads can only be set before torch starts parallel work
+            interop_threads = get_inference_interop_threads()
+            if interop_threads > 0:
+                try:
+                    torch.set_num_interop_threads(interop_threads)
+                except RuntimeError as e:
+                    print(f"[WARNING] Cannot set torch inter-op threads: {e}")
             
-            # Check for repetition
-            words = translated_text.split()
-            if len(words) > 10:
-                unique_words = set(words)
-                if len(unique_words) / len(words) < 0.5:
-                    return None  # Too much repetition
+            max_threads = os.cpu_count() or 1
+            setting = get_inference_threads()
             
-            return TranslationResult(
-                text=translated_text,
-                src_lang=src_lang,
-                dest_lang=dest_lang,
-                model="marian",
-                confidence=0.8
-            )
+            if setting == "auto":
+                threads = get_calibrated_inference_threads()
+                if threads <= 0 or threads > max_threads:
+                    threads = self._calibrate_inference_threads(model, tokenizer, torch)
+                    update_calibrated_inference_threads(threads)
+            else:
+                try:
+                    threads = min(max(int(setting), 1), max_threads)
+                except ValueError:
+                    print(f"[WARNING] Invalid inference_threads value: {setting}, using torch default")
+                    threads = torch.get_num_threads()
             
+            self._inference_threads = threads
+            self._set_torch_threads()
+            print(f"[OK] Marian inference threads: {threads} (inter-op: {interop_threads or 'default'})")
+    
+    def _set_torch_threads(self):
+        """Set torch intra-op threads for the calling thread"""
+        if not self._inference_threads:
+            return
+        try:
+            import torch
+            if torch.get_num_threads() != self._inference_threads:
+                torch.set_num_threads(self._inference_threads)
         except Exception as e:
-            print(f"Model translation error: {e}")
-            return None
+            print(f"[WARNING] Cannot set torch threads: {e}")
+    
+    def _calibrate_inference_threads(self, model, tokenizer, torch) -> int:
+        """Time a fixed sample at several thread counts and return the fastest"""
+        # Leave one core for the Tk thread and the clipboard watcher
+        max_threads = max(1, (os.cpu_count() or 1) - 1)
+        candidates = sorted({t for t in (1, 2, 4, 8, 16) if t <= max_threads} | {max_threads})
+        
+        inputs = tokenizer(MARIAN_CALIBRATION_SAMPLE, return_tensors="pt")
+        generate_kwargs = dict(
+            max_length=64,
+            num_beams=2,
+            do_sample=False,
+            pad_token_id=tokenizer.pad_token_id,
+            eos_token_id=tokenizer.eos_token_id
+        )
+        
+        print(f"[INFO] Calibrating Marian inference threads: {candidates}")
+        best_threads, best_time = candidates[0], float("inf")
+        
+        for threads in candidates:
+            try:
+                torch.set_num_threads(threads)
+                with torch.no_grad():
+                    model.generate(**inputs, **generate_kwargs)  # Warm-up
+                    start = time.perf_counter()
+                    for _ in range(2):
+                        model.generate(**inputs, **generate_kwargs)
+                    elapsed = (time.perf_counter() - start) / 2
+            except Exception as e:
+                print(f"[WARNING] Calibration failed at {threads} threads: {e}")
+                continue
+            
+            print(f"[INFO]   {threads} threads: {elapsed * 1000:.0f} ms")
+            # Prefer fewer threads unless more threads are clearly faster
+            if elapsed < best_time * 0.95:
+                best_threads, best_time = threads, elapsed
+        
+        if best_time == float("inf"):
+            return torch.get_num_threads()
+        
+        print(f"[OK] Calibrated Marian inference threads: {best_threads}")
+        return best_threads
     
     def get_supported_languages(self) -> Dict[str, str]:
         """Get Marian supported languages"""
@@ -752,33 +1588,545 @@ class BingTranslationProvider(BaseTranslationProvider):
         return {"bing": "Bing (Chưa hỗ trợ)"}
 
 
+class LibreTranslateProvider(BaseTranslationProvider):
+    """
+    Provider for a self-hosted LibreTranslate-compatible server
+
+    Requests go through one pooled requests.Session so connections stay
+    open between translations, and batches use the array form of `q` so
+    many texts cost one round trip.
+    """
+    
+    # Codes that differ from the ones used in the app
+    LANGUAGE_CODES = {"zh-cn": "zh", "zh-tw": "zt"}
+    
+    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None,
+                 timeout: Optional[float] = None, pool_size: Optional[int] = None,
+                 batch_size: Optional[int] = None):
+        settings = get_libretranslate_settings()
+        self.url = (url if url is not None else settings["url"]).rstrip("/")
+        self.api_key = api_key if api_key is not None else settings["api_key"]
+        self.timeout = timeout or settings["timeout"]
+        self.pool_size = pool_size or settings["pool_size"]
+        self.batch_size = max(1, batch_size or settings["batch_size"])
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._languages: Optional[Dict[str, str]] = None
+        super().__init__("libretranslate")
+    
+    def _check_availability(self):
+        """Available when a server URL is configured and requests is installed"""
+        self.is_available = bool(self.url) and is_module_available("requests")
+        if self.is_available:
+            print(f"[OK] LibreTranslate server configured: {self.url}")
+        else:
+            print("[WARNING] LibreTranslate server not configured")
+    
+    def _get_session(self):
+        """Create the pooled HTTP session on first use"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                # Translation is idempotent, so POSTs are retried on overload and gateway errors
+                retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504),
+                              allowed_methods=frozenset({"GET", "POST"}), respect_retry_after_header=True)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = constant.APIConstants.USER_AGENT
+                self._session = session
+            return self._session
+    
+    def _language_code(self, lang: str) -> str:
+        return self.LANGUAGE_CODES.get(lang, lang or "auto")
+    
+    def _request(self, texts: Union[str, List[str]], src_lang: str, dest_lang: str,
+                 cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
+        """POST /translate and return the decoded JSON body"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        payload = {
+            "q": texts,
+            "source": self._language_code(src_lang),
+            "target": self._language_code(dest_lang),
+            "format": "text",
+        }
+        if self.api_key:
+            payload["api_key"] = self.api_key
+        
+        with stage_timings.stage("network"):
+            response = self._get_session().post(f"{self.url}/translate", json=payload, timeout=self.timeout)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if response.status_code != 200:
+            try:
+                message = response.json().get("error", response.text)
+            except ValueError:
+                message = response.text
+            raise RuntimeError(f"HTTP {response.status_code}: {message}")
+        return response.json()
+    
+    def _result(self, text: str, detected: Any, src_lang: str, dest_lang: str) -> TranslationResult:
+        if src_lang == "auto" and isinstance(detected, dict):
+            src_lang = detected.get("language", src_lang)
+            confidence = float(detected.get("confidence", 100)) / 100
+        else:
+            confidence = 1.0
+        return TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang,
+                                 model="libretranslate", confidence=confidence)
+    
+    def _error_result(self, text: str, src_lang: str, dest_lang: str, error: Exception) -> TranslationResult:
+        return TranslationResult(
+            text=f"Lỗi dịch LibreTranslate: {text}",
+            src_lang=src_lang,
+            dest_lang=dest_lang,
+            model="libretranslate",
+            error=str(error)
+        )
+    
+    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi") -> TranslationResult:
+        """Translate one text"""
+        return self._translate(text, src_lang, dest_lang)
+    
+    def translate_with_profile(self, text: str, src_lang: str, dest_lang: str, profile: TranslationProfile,
+                               cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate one text (profiles only affect Marian decoding)"""
+        return self._translate(text, src_lang, dest_lang, cancel_token)
+    
+    def _translate(self, text: str, src_lang: str, dest_lang: str,
+                   cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        if not self.is_available:
+            return self._error_result(text, src_lang, dest_lang, RuntimeError("LibreTranslate not configured"))
+        try:
+            data = self._request(text, src_lang, dest_lang, cancel_token)
+            return self._result(data["translatedText"], data.get("detectedLanguage"), src_lang, dest_lang)
+        except TranslationCancelled:
+            raise
+        except Exception as e:
+            return self._error_result(text, src_lang, dest_lang, e)
+    
+    def translate_batch(self, texts: List[str], src_lang: str = "auto", dest_lang: str = "vi",
+                        decoding_profile: Optional[str] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> List[TranslationResult]:
+        """Translate texts with one request per `batch_size` texts"""
+        results: List[TranslationResult] = []
+        for start in range(0, len(texts), self.batch_size):
+            chunk = texts[start:start + self.batch_size]
+            if not self.is_available:
+                error = RuntimeError("LibreTranslate not configured")
+                results.extend(self._error_result(text, src_lang, dest_lang, error) for text in chunk)
+                continue
+            try:
+                data = self._request(chunk, src_lang, dest_lang, cancel_token)
+                translated = data["translatedText"]
+                detected = data.get("detectedLanguage")
+                if not isinstance(translated, list) or len(translated) != len(chunk):
+                    raise RuntimeError("Server does not support batch requests")
+                if not isinstance(detected, list):
+                    detected = [detected] * len(chunk)
+                results.extend(self._result(text, language, src_lang, dest_lang)
+                               for text, language in zip(translated, detected))
+            except TranslationCancelled:
+                raise
+            except Exception as e:
+                results.extend(self._error_result(text, src_lang, dest_lang, e) for text in chunk)
+        return results
+    
+    async def translate_async(self, text: str, src_lang: str = "auto", dest_lang: str = "vi",
+                              cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate from asyncio code without blocking the event loop"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._translate, text, src_lang, dest_lang, cancel_token)
+    
+    async def translate_batch_async(self, texts: List[str], src_lang: str = "auto", dest_lang: str = "vi",
+                                    cancel_token: Optional[CancellationToken] = None) -> List[TranslationResult]:
+        """Translate a batch from asyncio code; chunks are sent concurrently over the pool"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        chunks = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(None, lambda chunk=chunk: self.translate_batch(chunk, src_lang, dest_lang,
+                                                                                cancel_token=cancel_token))
+            for chunk in chunks
+        ))
+        return [result for chunk_results in results for result in chunk_results]
+    
+    def get_supported_languages(self) -> Dict[str, str]:
+        """Get languages from the server's /languages endpoint"""
+        if self._languages is None and self.is_available:
+            try:
+                response = self._get_session().get(f"{self.url}/languages", timeout=self.timeout)
+                response.raise_for_status()
+                codes = {code: app_code for app_code, code in self.LANGUAGE_CODES.items()}
+                self._languages = {"auto": "🔍 Tự động phát hiện"}
+                self._languages.update({codes.get(item["code"], item["code"]): item["name"]
+                                        for item in response.json()})
+            except Exception as e:
+                print(f"[WARNING] Could not load LibreTranslate languages: {e}")
+                return {"auto": "🔍 Tự động phát hiện"}
+        return dict(self._languages or {})
+    
+    def shutdown(self):
+        """Close pooled connections"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def _marian_models_present() -> bool:
+    """Cheap Marian check: enabled and at least one model folder, without loading anything"""
+    if not is_marian_enabled():
+        return False
+    try:
+        with os.scandir(constant.MARIAN_MODELS_DIR) as entries:
+            return any(entry.is_dir() and "-" in entry.name for entry in entries)
+    except OSError:
+        return False
+
+
+# === Provider Registry ===
+# name -> (factory, cheap availability check); providers are built on first use
+
+_PROVIDER_REGISTRY: Dict[str, Tuple[Callable[[], BaseTranslationProvider], Callable[[], bool]]] = {}
+
+
+def register_provider(name: str, factory: Callable[[], BaseTranslationProvider],
+                      check_available: Optional[Callable[[], bool]] = None):
+    """Register a translation provider factory"""
+    _PROVIDER_REGISTRY[name] = (factory, check_available or (lambda: True))
+
+
+register_provider("google", GoogleTranslationProvider, lambda: is_module_available("googletrans"))
+register_provider("marian", MarianTranslationProvider, _marian_models_present)
+register_provider("deepl", DeepLTranslationProvider, lambda: False)
+register_provider("bing", BingTranslationProvider, lambda: False)
+register_provider("libretranslate", LibreTranslateProvider, lambda: bool(get_libretranslate_settings()["url"]))
+
+
 class TranslationEngine:
     """Main translation engine that coordinates all providers"""
     
     def __init__(self):
+        # Providers constructed so far (see get_provider)
         self.providers: Dict[str, BaseTranslationProvider] = {}
+        self._providers_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[Tuple[str, str, str, str, str], Future] = {}
+        self._in_flight_lock = threading.Lock()
         self.default_model = "google"
+        self.cache = TranslationCache(get_performance_config().translation_cache_size)
+        self._masking_lock = threading.Lock()
+        self.masking_stats = {"requests": 0, "masked": 0, "short_circuited": 0, "fallbacks": 0,
+                              "chars_in": 0, "chars_sent": 0}
         self._initialize_providers()
     
     def _initialize_providers(self):
-        """Initialize all translation providers"""
-        print("Initializing translation providers...")
-        
-        # Initialize providers
-        self.providers["google"] = GoogleTranslationProvider()
-        self.providers["marian"] = MarianTranslationProvider()
-        self.providers["deepl"] = DeepLTranslationProvider()
-        self.providers["bing"] = BingTranslationProvider()
-        
-        # Set default to first available provider
-        for name, provider in self.providers.items():
-            if provider.is_available:
+        """Pick the default provider from cheap availability checks (nothing is constructed)"""
+        for name in _PROVIDER_REGISTRY:
+            if self._is_provider_available(name):
                 self.default_model = name
                 print(f"Set default translation model to: {name}")
                 break
     
-    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi", model: str = None) -> TranslationResult:
-        """Translate text using specified or default model"""
+    def _is_provider_available(self, name: str) -> bool:
+        """Check availability without constructing the provider if it does not exist yet"""
+        if name in self.providers:
+            return self.providers[name].is_available
+        if name not in _PROVIDER_REGISTRY:
+            return False
+        from .replay import get_replay_settings, is_replay_provider_available
+        if get_replay_settings().mode == "replay":
+            return is_replay_provider_available(name, _PROVIDER_REGISTRY[name][1])
+        try:
+            return bool(_PROVIDER_REGISTRY[name][1]())
+        except Exception:
+            return False
+    
+    def get_provider(self, model: str) -> Optional[BaseTranslationProvider]:
+        """Get specific provider, constructing it on first use"""
+        provider = self.providers.get(model)
+        if provider is not None or model not in _PROVIDER_REGISTRY:
+            return provider
+        
+        with self._providers_lock:
+            if model not in self.providers:
+                # Wrapped for recording, or replaced by a recording, when record/replay is on
+                from .replay import create_provider
+                self.providers[model] = create_provider(model, _PROVIDER_REGISTRY[model][0])
+            return self.providers[model]
+    
+    def _resolve_profile(self, profile: Optional[str] = None) -> TranslationProfile:
+        """Resolve named profile, defaulting to the one selected in general.json"""
+        if profile is None:
+            profile = getattr(get_app_config(), "translation_profile", None)
+        return get_translation_profile(profile)
+    
+    def _resolve_provider(self, model: str = None,
+                          profile: Optional[TranslationProfile] = None) -> Tuple[Optional[BaseTranslationProvider], str]:
+        """Resolve provider for model, falling back along the profile's provider preference"""
+        preference = profile.provider_preference if profile else ("google",)
+        
+        # Use specified model, the profile's preferred model, or the default
+        model_name = model
+        if model_name not in _PROVIDER_REGISTRY:
+            model_name = next((name for name in preference if self._is_provider_available(name)), self.default_model)
+        
+        provider = self.get_provider(model_name)
+        
+        if provider is None or not provider.is_available:
+            for fallback_name in preference:
+                if fallback_name != model_name and self._is_provider_available(fallback_name):
+                    fallback = self.get_provider(fallback_name)
+                    if fallback is not None and fallback.is_available:
+                        return fallback, fallback_name
+            return None, model_name
+        
+        return provider, model_name
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get executor used for provider timeouts and hedging"""
+        if self._executor is None:
+            with self._providers_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(2, get_performance_config().max_concurrent_translations * 2),
+                        thread_name_prefix="TranslationEngine"
+                    )
+        return self._executor
+    
+    def _call_provider(self, provider: BaseTranslationProvider, model_name: str, text: str,
+                       src_lang: str, dest_lang: str, profile: TranslationProfile,
+                       cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Call provider with the profile's timeout, hedging with a backup provider if it stalls"""
+        if not profile.timeout and not profile.hedge_after:
+            result = provider.translate_with_profile(text, src_lang, dest_lang, profile, cancel_token)
+            result.model = model_name
+            return result
+        
+        executor = self._get_executor()
+        primary = executor.submit(stage_timings.bind(provider.translate_with_profile),
+                                  text, src_lang, dest_lang, profile, cancel_token)
+        futures = {primary: model_name}
+        deadline = time.monotonic() + profile.timeout if profile.timeout else None
+        last_result = None
+        
+        # Wake up as soon as the request is cancelled, not when the provider returns
+        cancelled = cancellation_future(cancel_token, primary)
+        watch = {cancelled} if cancelled is not None else set()
+        
+        if profile.hedge_after:
+            done, _ = wait(set(futures) | watch, timeout=profile.hedge_after, return_when=FIRST_COMPLETED)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            if not done:
+                backup_name = next((
+                    name for name in profile.provider_preference
+                    if name != model_name and self._is_provider_available(name)
+                ), None)
+                backup = self.get_provider(backup_name) if backup_name else None
+                if backup is not None and backup.is_available:
+                    futures[executor.submit(stage_timings.bind(backup.translate_with_profile),
+                                            text, src_lang, dest_lang, profile, cancel_token)] = backup_name
+        
+        pending = set(futures)
+        while pending:
+            remaining = max(0.0, deadline - time.monotonic()) if deadline else None
+            done, pending = wait(pending | watch, timeout=remaining, return_when=FIRST_COMPLETED)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            pending -= watch
+            if not done:
+                break  # Timed out
+            
+            for future in done:
+                name = futures[future]
+                try:
+                    result = future.result()
+                except TranslationCancelled:
+                    raise
+                except Exception as e:
+                    result = TranslationResult(
+                        text=f"Lỗi dịch: {text}",
+                        src_lang=src_lang,
+                        dest_lang=dest_lang,
+                        model=name,
+                        error=str(e)
+                    )
+                result.model = name  # Ensure correct model name
+                if not result.error:
+                    return result
+                last_result = result
+        
+        if last_result is not None and not pending:
+            return last_result
+        
+        if profile.cache_results:
+            # Keep a late answer so the next identical request is served from the cache
+            def cache_late_result(future):
+                try:
+                    result = future.result()
+                except Exception:
+                    return
+                result.model = model_name
+                self.cache.put((text, src_lang, dest_lang, model_name, profile.name), result)
+            
+            primary.add_done_callback(cache_late_result)
+        
+        return TranslationResult(
+            text=f"Lỗi dịch: {text}",
+            src_lang=src_lang,
+            dest_lang=dest_lang,
+            model=model_name,
+            error=f"Translation timed out after {profile.timeout:g}s"
+        )
+    
+    def _translate_chunked(self, provider: BaseTranslationProvider, model_name: str, text: str,
+                           src_lang: str, dest_lang: str, profile: TranslationProfile,
+                           cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate long text in sentence-aligned chunks of at most profile.chunk_size characters"""
+        chunks: List[Tuple[str, str]] = []
+        current, current_separator = "", ""
+        for sentence, separator in split_sentences(text):
+            if current and len(current) + len(current_separator) + len(sentence) > profile.chunk_size:
+                chunks.append((current, current_separator))
+                current, current_separator = sentence, separator
+            else:
+                current = current + current_separator + sentence if current else sentence
+                current_separator = separator
+        if current or current_separator:
+            chunks.append((current, current_separator))
+        
+        def translate_chunk(chunk: str) -> Optional[TranslationResult]:
+            if not chunk.strip():
+                return None
+            return self._call_provider(provider, model_name, chunk, src_lang, dest_lang, profile, cancel_token)
+        
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
+            results = list(executor.map(stage_timings.bind(translate_chunk), [chunk for chunk, _ in chunks]))
+        
+        translated = [r for r in results if r is not None]
+        errors = [r.error for r in translated if r.error]
+        detected = next((r.src_lang for r in translated if r.src_lang not in ("auto", "mixed")), src_lang)
+        return TranslationResult(
+            text="".join((r.text if r is not None else chunk) + separator
+                         for r, (chunk, separator) in zip(results, chunks)),
+            src_lang=detected,
+            dest_lang=dest_lang,
+            model=model_name,
+            confidence=min((r.confidence for r in translated), default=0.0),
+            error=errors[0] if errors else None
+        )
+    
+    def _mask(self, provider: BaseTranslationProvider, text: str) -> Optional[MaskedText]:
+        """Mask URLs, paths and code, recording the savings"""
+        masked = mask_text(text, provider.placeholder_template) if is_placeholder_masking_enabled() else None
+        with self._masking_lock:
+            self.masking_stats["requests"] += 1
+            self.masking_stats["chars_in"] += len(text)
+            if masked is not None:
+                self.masking_stats["masked"] += 1
+                if masked.is_linguistic:
+                    self.masking_stats["chars_sent"] += len(masked.text)
+            elif is_linguistic(text):
+                self.masking_stats["chars_sent"] += len(text)
+        return masked
+    
+    def _count_masking(self, name: str, chars_sent: int = 0):
+        """Increment a masking counter"""
+        with self._masking_lock:
+            self.masking_stats[name] += 1
+            self.masking_stats["chars_sent"] += chars_sent
+    
+    def get_masking_stats(self) -> Dict[str, Any]:
+        """Get placeholder masking counters and the share of characters saved"""
+        with self._masking_lock:
+            stats = dict(self.masking_stats)
+        stats["chars_saved"] = stats["chars_in"] - stats["chars_sent"]
+        stats["saved_ratio"] = stats["chars_saved"] / stats["chars_in"] if stats["chars_in"] else 0.0
+        return stats
+    
+    def _translate_masked(self, provider: BaseTranslationProvider, model_name: str, text: str,
+                          src_lang: str, dest_lang: str, settings: TranslationProfile,
+                          cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Translate with protected spans replaced by placeholders, then restore them"""
+        with stage_timings.stage("masking"):
+            masked = self._mask(provider, text)
+        payload = masked.text if masked is not None else text
+        
+        # URLs, paths and code only: nothing for a provider to do
+        if not is_linguistic(payload, provider.placeholder_template):
+            self._count_masking("short_circuited")
+            return TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang, model=model_name,
+                                     confidence=1.0, chars_saved=len(text))
+        
+        result = self._send(provider, model_name, payload, src_lang, dest_lang, settings, cancel_token)
+        return self._unmask_result(provider, model_name, text, src_lang, dest_lang, masked, result, settings,
+                                   cancel_token)
+    
+    def _send(self, provider: BaseTranslationProvider, model_name: str, source: str,
+              src_lang: str, dest_lang: str, settings: TranslationProfile,
+              cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Call the provider, in chunks when the text is longer than the profile's chunk size"""
+        if settings.chunk_size and len(source) > settings.chunk_size:
+            return self._translate_chunked(provider, model_name, source, src_lang, dest_lang, settings, cancel_token)
+        return self._call_provider(provider, model_name, source, src_lang, dest_lang, settings, cancel_token)
+    
+    def _unmask_result(self, provider: BaseTranslationProvider, model_name: str, text: str,
+                       src_lang: str, dest_lang: str, masked: Optional[MaskedText], result: TranslationResult,
+                       settings: TranslationProfile,
+                       cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """Restore masked spans in a result, translating the original text if a placeholder was lost"""
+        if masked is None:
+            return result
+        
+        with stage_timings.stage("postprocess"):
+            restored = unmask_text(result.text, masked)
+        if restored is not None:
+            result.text = restored
+            result.chars_saved = masked.chars_saved
+        elif not result.error:
+            # Provider dropped or mangled a placeholder: translate the original text instead
+            self._count_masking("fallbacks", len(text))
+            result = self._send(provider, model_name, text, src_lang, dest_lang, settings, cancel_token)
+        return result
+    
+    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi", model: str = None,
+                  profile: Optional[str] = None,
+                  cancel_token: Optional[CancellationToken] = None) -> TranslationResult:
+        """
+        Translate text using specified or default model, governed by a translation profile
+        
+        Raises TranslationCancelled if cancel_token is cancelled before the result is ready.
+        With stage timing enabled the result carries per-stage timings.
+        """
+        trace = stage_timings.begin()
+        if trace is None:
+            return self._translate(text, src_lang, dest_lang, model, profile, cancel_token)
+        
+        result = None
+        try:
+            result = self._translate(text, src_lang, dest_lang, model, profile, cancel_token)
+        finally:
+            # Cancelled requests are not recorded
+            timings = stage_timings.end(trace, result.model if result is not None else None)
+        return replace(result, timings=timings)  # Copy: the result may be the cached object
+    
+    def get_stage_timings(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get rolling per-stage timing statistics per provider (empty unless stage timing is enabled)"""
+        return stage_timings.get_stage_stats()
+    
+    def _translate(self, text: str, src_lang: str, dest_lang: str, model: Optional[str],
+                   profile: Optional[str], cancel_token: Optional[CancellationToken]) -> TranslationResult:
+        """Translate one text (see translate)"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        
         if not text.strip():
             return TranslationResult(
                 text="",
@@ -787,52 +2135,365 @@ class TranslationEngine:
                 model=model or self.default_model
             )
         
-        # Use specified model or default
-        model_name = model or self.default_model
+        with stage_timings.stage("routing"):
+            settings = self._resolve_profile(profile)
+            provider, model_name = self._resolve_provider(model, settings)
+        
+        if provider is None:
+            # Return error result
+            return TranslationResult(
+                text=f"Không có provider khả dụng: {text}",
+                src_lang=src_lang,
+                dest_lang=dest_lang,
+                model=model_name,
+                error="No available translation provider"
+            )
+        
+        cache_key = (text, src_lang, dest_lang, model_name, settings.name)
+        in_flight = None
+        if settings.use_cache:
+            with stage_timings.stage("cache"):
+                cached = self.cache.get(cache_key)
+            if cached:
+                return cached
+            
+            # Join an identical request that is already running (e.g. a clipboard prefetch)
+            with self._in_flight_lock:
+                in_flight = self._in_flight.get(cache_key)
+                if in_flight is None:
+                    self._in_flight[cache_key] = owned = Future()
+            if in_flight is not None:
+                cancelled = cancellation_future(cancel_token, in_flight)
+                with stage_timings.stage("cache"):  # Waiting for the identical request counts as a cache hit
+                    wait([f for f in (in_flight, cancelled) if f is not None],
+                         timeout=settings.timeout or None, return_when=FIRST_COMPLETED)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                try:
+                    return replace(in_flight.result(timeout=0))
+                except Exception:
+                    pass  # Translate on our own below
+        
+        result = None
+        try:
+            result = self._translate_masked(provider, model_name, text, src_lang, dest_lang, settings, cancel_token)
+            if settings.cache_results:
+                with stage_timings.stage("postprocess"):
+                    self.cache.put(cache_key, result)
+            return result
+        except TranslationCancelled:
+            raise
+        except Exception as e:
+            result = TranslationResult(
+                text=f"Lỗi dịch: {text}",
+                src_lang=src_lang,
+                dest_lang=dest_lang,
+                model=model_name,
+                error=str(e)
+            )
+            return result
+        finally:
+            if settings.use_cache and in_flight is None:
+                with self._in_flight_lock:
+                    self._in_flight.pop(cache_key, None)
+                if result is None:
+                    owned.set_exception(TranslationCancelled())  # Joined requests translate on their own
+                else:
+                    owned.set_result(result)
+    
+    def get_placeholder_template(self, model: str = None, profile: Optional[str] = None) -> str:
+        """Placeholder form that the provider for model keeps intact"""
+        provider, _ = self._resolve_provider(model, self._resolve_profile(profile))
+        return provider.placeholder_template if provider is not None else DEFAULT_PLACEHOLDER_TEMPLATE
+    
+    def get_cached(self, text: str, src_lang: str = "auto", dest_lang: str = "vi", model: str = None,
+                   profile: Optional[str] = None) -> Optional[TranslationResult]:
+        """Get a cached translation without calling any provider"""
+        settings = self._resolve_profile(profile)
+        if not settings.use_cache:
+            return None
+        provider, model_name = self._resolve_provider(model, settings)
+        if provider is None:
+            return None
+        return self.cache.get((text, src_lang, dest_lang, model_name, settings.name))
+    
+    def seed_cache(self, pairs: List[Tuple[str, str, str, str]], model: str = None,
+                   profiles: Tuple[Optional[str], ...] = (None,)) -> int:
+        """
+        Pre-populate the cache with known (original, translation, src_lang, dest_lang) pairs
+        
+        Each pair is stored for its source language and for "auto", under every profile
+        given. Pass the most valuable pairs first: once the cache is full the rest are skipped.
+        Pairs whose translation is just the original text are skipped.
+        Returns the number of entries added.
+        """
+        keys = []
+        for profile in dict.fromkeys(profiles):
+            settings = self._resolve_profile(profile)
+            if not settings.use_cache:
+                continue
+            provider, model_name = self._resolve_provider(model, settings)
+            if provider is not None:
+                keys.append((model_name, settings.name))
         
-        if model_name not in self.providers:
-            model_name = self.default_model
+        seeded = 0
+        for original, translated, src_lang, dest_lang in pairs:
+            if (not original.strip() or not translated.strip() or translated.startswith("Lỗi dịch")
+                    or translated.strip() == original.strip()):
+                continue
+            for model_name, profile_name in keys:
+                result = TranslationResult(text=translated, src_lang=src_lang or "auto", dest_lang=dest_lang,
+                                           model=model_name, confidence=1.0)
+                for key_src in dict.fromkeys((src_lang or "auto", "auto")):
+                    if len(self.cache) >= self.cache.max_size:
+                        return seeded
+                    seeded += self.cache.seed((original, key_src, dest_lang, model_name, profile_name), result)
+        return seeded
+    
+    def batch_translate(self, texts: List[str], src_lang: str = "auto", dest_lang: str = "vi", model: str = None,
+                        profile: Optional[str] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> List[TranslationResult]:
+        """Translate multiple texts, using the provider's batch path when it has one"""
+        settings = self._resolve_profile(profile)
+        provider, model_name = self._resolve_provider(model, settings)
         
-        provider = self.providers[model_name]
+        if provider is None:
+            return [self.translate(text, src_lang, dest_lang, model, settings.name, cancel_token) for text in texts]
+        if not hasattr(provider, "translate_batch"):
+            return self._batch_translate_joined(provider, model_name, texts, src_lang, dest_lang, settings,
+                                                cancel_token)
         
-        if not provider.is_available:
-            # Fall back to Google if available
-            if "google" in self.providers and self.providers["google"].is_available:
-                provider = self.providers["google"]
-                model_name = "google"
+        results: List[Optional[TranslationResult]] = [None] * len(texts)
+        pending_indexes = []
+        masks: Dict[int, MaskedText] = {}
+        for index, text in enumerate(texts):
+            cached = self.cache.get((text, src_lang, dest_lang, model_name, settings.name)) if settings.use_cache else None
+            if not text.strip():
+                results[index] = TranslationResult(text="", src_lang=src_lang, dest_lang=dest_lang, model=model_name)
+            elif cached:
+                results[index] = cached
             else:
-                # Return error result
-                return TranslationResult(
-                    text=f"Không có provider khả dụng: {text}",
-                    src_lang=src_lang,
-                    dest_lang=dest_lang,
-                    model=model_name,
-                    error="No available translation provider"
-                )
+                masked = self._mask(provider, text)
+                if not is_linguistic(masked.text if masked else text, provider.placeholder_template):
+                    self._count_masking("short_circuited")
+                    results[index] = TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang,
+                                                       model=model_name, confidence=1.0, chars_saved=len(text))
+                    continue
+                if masked is not None:
+                    masks[index] = masked
+                pending_indexes.append(index)
+        
+        if not pending_indexes:
+            return results
         
         try:
-            result = provider.translate(text, src_lang, dest_lang)
-            result.model = model_name  # Ensure correct model name
-            return result
+            translated = provider.translate_batch(
+                [masks[i].text if i in masks else texts[i] for i in pending_indexes], src_lang, dest_lang,
+                decoding_profile=settings.decoding_profile,
+                cancel_token=cancel_token
+            )
+            
+            # Restore placeholders; texts whose placeholders were lost go again unmasked
+            retry_indexes = []
+            for position, (index, result) in enumerate(zip(pending_indexes, translated)):
+                if index not in masks:
+                    continue
+                restored = unmask_text(result.text, masks[index])
+                if restored is not None:
+                    result.text = restored
+                    result.chars_saved = masks[index].chars_saved
+                elif not result.error:
+                    self._count_masking("fallbacks", len(texts[index]))
+                    retry_indexes.append(position)
+            if retry_indexes:
+                retried = provider.translate_batch(
+                    [texts[pending_indexes[position]] for position in retry_indexes], src_lang, dest_lang,
+                    decoding_profile=settings.decoding_profile,
+                    cancel_token=cancel_token
+                )
+                for position, result in zip(retry_indexes, retried):
+                    translated[position] = result
+        except TranslationCancelled:
+            raise
         except Exception as e:
+            print(f"Batch translation error: {e}")
+            return [self.translate(text, src_lang, dest_lang, model, settings.name, cancel_token) for text in texts]
+        
+        for index, result in zip(pending_indexes, translated):
+            result.model = model_name
+            if settings.cache_results:
+                self.cache.put((texts[index], src_lang, dest_lang, model_name, settings.name), result)
+            results[index] = result
+        
+        return results
+    
+    def _batch_translate_joined(self, provider: BaseTranslationProvider, model_name: str, texts: List[str],
+                                src_lang: str, dest_lang: str, settings: TranslationProfile,
+                                cancel_token: Optional[CancellationToken] = None) -> List[TranslationResult]:
+        """Batch for providers without translate_batch: one request with a text per line, checked line by line"""
+        results: List[Optional[TranslationResult]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}  # Distinct uncached text -> indexes
+        for index, text in enumerate(texts):
+            cached = self.cache.get((text, src_lang, dest_lang, model_name, settings.name)) if settings.use_cache else None
+            if not text.strip():
+                results[index] = TranslationResult(text="", src_lang=src_lang, dest_lang=dest_lang, model=model_name)
+            elif cached:
+                results[index] = cached
+            else:
+                pending.setdefault(text, []).append(index)
+        
+        distinct = list(pending)
+        translated: Optional[List[TranslationResult]] = None
+        if len(distinct) > 1 and not any("\n" in text or "\r" in text for text in distinct):
+            joined = self._translate_masked(provider, model_name, "\n".join(distinct), src_lang, dest_lang,
+                                            settings, cancel_token)
+            lines = joined.text.split("\n")
+            if joined.error:
+                # Provider is failing: don't repeat the request once per text
+                translated = [
+                    TranslationResult(text=f"Lỗi dịch: {text}", src_lang=src_lang, dest_lang=dest_lang,
+                                      model=model_name, error=joined.error)
+                    for text in distinct
+                ]
+            elif len(lines) == len(distinct):
+                translated = [
+                    TranslationResult(text=line.strip() if text == text.strip() else line,
+                                      src_lang=joined.src_lang, dest_lang=dest_lang, model=model_name,
+                                      confidence=joined.confidence)
+                    for text, line in zip(distinct, lines)
+                ]
+                if settings.cache_results:
+                    for text, result in zip(distinct, translated):
+                        self.cache.put((text, src_lang, dest_lang, model_name, settings.name), result)
+            else:
+                print(f"[WARNING] Provider changed the line count of a batch ({len(distinct)} -> {len(lines)}), "
+                      f"translating texts separately")
+        
+        if translated is None and distinct:
+            # Multi-line texts or a mismatched reply: separate requests, a few at a time
+            translate_one = stage_timings.bind(
+                lambda text: self.translate(text, src_lang, dest_lang, model_name, settings.name, cancel_token)
+            )
+            with ThreadPoolExecutor(max_workers=min(len(distinct), 4)) as executor:
+                translated = list(executor.map(translate_one, distinct))
+        
+        for text, result in zip(distinct, translated or []):
+            for index in pending[text]:
+                results[index] = result
+        return results
+    
+    def translate_multi(self, text: str, dest_langs: List[str], src_lang: str = "auto", model: str = None,
+                        profile: Optional[str] = None,
+                        cancel_token: Optional[CancellationToken] = None) -> Dict[str, TranslationResult]:
+        """
+        Translate one text into several languages, detecting the source only once
+        
+        Masking, chunking and cancellation work as in translate. The provider's
+        own multi-target path is used when the text fits in one chunk.
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        dest_langs = list(dict.fromkeys(dest_langs))
+        settings = self._resolve_profile(profile)
+        provider, model_name = self._resolve_provider(model, settings)
+        
+        if not text.strip() or provider is None:
+            return {dest_lang: self.translate(text, src_lang, dest_lang, model, settings.name, cancel_token)
+                    for dest_lang in dest_langs}
+        
+        requested_src = src_lang
+        if src_lang == "auto":
+            src_lang = provider.detect_language(text)
+        
+        def cache_key(source: str, dest_lang: str):
+            return (text, source, dest_lang, model_name, settings.name)
+        
+        def error_result(dest_lang: str, error: str) -> TranslationResult:
             return TranslationResult(
                 text=f"Lỗi dịch: {text}",
                 src_lang=src_lang,
                 dest_lang=dest_lang,
                 model=model_name,
-                error=str(e)
+                error=error
             )
+        
+        results: Dict[str, TranslationResult] = {}
+        pending = []
+        for dest_lang in dest_langs:
+            cached = None
+            if settings.use_cache:
+                cached = self.cache.get(cache_key(requested_src, dest_lang))
+                if cached is None and src_lang != requested_src:
+                    cached = self.cache.get(cache_key(src_lang, dest_lang))
+            if cached:
+                results[dest_lang] = cached
+            else:
+                pending.append(dest_lang)
+        
+        if pending:
+            try:
+                translated = self._translate_multi_pending(provider, model_name, text, src_lang, pending, settings,
+                                                           cancel_token)
+            except TranslationCancelled:
+                raise
+            except Exception as e:
+                translated = {dest_lang: error_result(dest_lang, str(e)) for dest_lang in pending}
+            
+            for dest_lang in pending:
+                result = translated.get(dest_lang)
+                if result is None:
+                    # Provider skipped this target
+                    result = error_result(dest_lang, f"No translation returned for {dest_lang}")
+                result.model = model_name
+                if settings.cache_results:
+                    self.cache.put(cache_key(requested_src, dest_lang), result)
+                    if src_lang != requested_src:
+                        self.cache.put(cache_key(src_lang, dest_lang), result)
+                results[dest_lang] = result
+        
+        return {dest_lang: results[dest_lang] for dest_lang in dest_langs}
+    
+    def _translate_multi_pending(self, provider: BaseTranslationProvider, model_name: str, text: str,
+                                 src_lang: str, dest_langs: List[str], settings: TranslationProfile,
+                                 cancel_token: Optional[CancellationToken] = None) -> Dict[str, TranslationResult]:
+        """Translate into the targets not served from the cache (mask, then chunk or share one multi call)"""
+        with stage_timings.stage("masking"):
+            masked = self._mask(provider, text)
+        payload = masked.text if masked is not None else text
+        
+        if not is_linguistic(payload, provider.placeholder_template):
+            self._count_masking("short_circuited")
+            return {dest_lang: TranslationResult(text=text, src_lang=src_lang, dest_lang=dest_lang, model=model_name,
+                                                 confidence=1.0, chars_saved=len(text))
+                    for dest_lang in dest_langs}
+        
+        if hasattr(provider, "translate_multi") and not (settings.chunk_size and len(payload) > settings.chunk_size):
+            translated = provider.translate_multi(payload, src_lang, dest_langs, settings.decoding_profile)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            return {dest_lang: self._unmask_result(provider, model_name, text, src_lang, dest_lang, masked, result,
+                                                   settings, cancel_token)
+                    for dest_lang, result in translated.items()}
+        
+        def translate_one(dest_lang: str) -> TranslationResult:
+            result = self._send(provider, model_name, payload, src_lang, dest_lang, settings, cancel_token)
+            return self._unmask_result(provider, model_name, text, src_lang, dest_lang, masked, result, settings,
+                                       cancel_token)
+        
+        with ThreadPoolExecutor(max_workers=min(len(dest_langs), 4)) as executor:
+            return dict(zip(dest_langs, executor.map(stage_timings.bind(translate_one), dest_langs)))
     
     def get_available_models(self) -> Dict[str, str]:
         """Get available translation models"""
         available = {}
-        for name, provider in self.providers.items():
-            if provider.is_available:
+        for name in _PROVIDER_REGISTRY:
+            if self._is_provider_available(name):
                 model_names = {
                     "google": "🌐 Google Translator",
                     "deepl": "🔬 DeepL Translator", 
                     "marian": "🤖 Marian MT (Offline)",
-                    "bing": "🔍 Bing Translator"
+                    "bing": "🔍 Bing Translator",
+                    "libretranslate": "🏠 LibreTranslate (LAN)"
                 }
                 available[name] = model_names.get(name, name.title())
         
@@ -842,22 +2503,33 @@ class TranslationEngine:
         """Get supported languages for specified model"""
         model_name = model or self.default_model
         
-        if model_name in self.providers:
-            return self.providers[model_name].get_supported_languages()
+        provider = self.get_provider(model_name)
+        if provider is not None:
+            return provider.get_supported_languages()
         
         return {}
     
     def set_default_model(self, model: str):
         """Set default translation model"""
-        if model in self.providers and self.providers[model].is_available:
+        provider = self.get_provider(model)
+        if provider is not None and provider.is_available:
             self.default_model = model
             print(f"Default translation model set to: {model}")
         else:
             print(f"Model {model} not available")
     
-    def get_provider(self, model: str) -> Optional[BaseTranslationProvider]:
-        """Get specific provider"""
-        return self.providers.get(model)
+    def shutdown(self):
+        """Release provider resources (worker processes, etc.)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        
+        for provider in list(self.providers.values()):
+            if hasattr(provider, "shutdown"):
+                try:
+                    provider.shutdown()
+                except Exception as e:
+                    print(f"Error shutting down provider {provider.name}: {e}")
 
 
 # === Global Translation Engine Instance ===
@@ -920,6 +2592,7 @@ def get_marian_supported_languages() -> Dict[str, str]:
 
 def detect_language(text: str) -> str:
     """Detect language of text"""
+    detect = get_language_detector()
     if not detect:
         return "unknown"
     
@@ -938,16 +2611,18 @@ def quick_translate(text: str, dest_lang: str = "vi", model: str = None) -> str:
     return result.text
 
 
-def batch_translate(texts: List[str], dest_lang: str = "vi", model: str = None) -> List[TranslationResult]:
+def batch_translate(texts: List[str], dest_lang: str = "vi", model: str = None, src_lang: str = "auto",
+                    profile: str = None) -> List[TranslationResult]:
     """Translate multiple texts"""
     engine = get_translation_engine()
-    results = []
-    
-    for text in texts:
-        result = engine.translate(text, "auto", dest_lang, model)
-        results.append(result)
-    
-    return results
+    return engine.batch_translate(texts, src_lang, dest_lang, model, profile)
+
+
+def translate_multi(text: str, dest_langs: List[str], model: str = None, src_lang: str = "auto",
+                    profile: str = None, cancel_token: Optional[CancellationToken] = None) -> Dict[str, TranslationResult]:
+    """Translate one text into several languages"""
+    engine = get_translation_engine()
+    return engine.translate_multi(text, dest_langs, src_lang, model, profile, cancel_token)
 
 
 def get_available_translation_models() -> Dict[str, str]:
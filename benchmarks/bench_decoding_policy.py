@@ -0,0 +1,177 @@
+"""
+Decoding Policy Benchmark for VezylTranslator
+Measures Marian latency and quality (chrF) per decoding profile on a fixed corpus
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Run from the application directory (config/ and resources/marian_models/ must exist):
+    python benchmarks/bench_decoding_policy.py
+    python benchmarks/bench_decoding_policy.py --profiles instant quality --repeat 3
+Language pairs without a downloaded model are skipped.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from VezylTranslatorProton.translator import DECODING_PROFILES, MarianTranslationProvider
+
+
+# Fixed corpus: (source, reference) per language pair
+CORPUS: Dict[str, List[Tuple[str, str]]] = {
+    "en-vi": [
+        ("Please restart the application to apply the new settings.",
+         "Vui lòng khởi động lại ứng dụng để áp dụng cài đặt mới."),
+        ("The meeting has been moved to Thursday afternoon.",
+         "Cuộc họp đã được dời sang chiều thứ Năm."),
+        ("I could not open the file because it is being used by another program.",
+         "Tôi không thể mở tệp vì nó đang được một chương trình khác sử dụng."),
+        ("Thank you for your quick reply.",
+         "Cảm ơn bạn đã trả lời nhanh."),
+        ("The weather will be sunny with a light breeze in the morning, and rain is expected in the evening.",
+         "Thời tiết sẽ nắng với gió nhẹ vào buổi sáng, và dự kiến có mưa vào buổi tối."),
+    ],
+    "vi-en": [
+        ("Vui lòng khởi động lại ứng dụng để áp dụng cài đặt mới.",
+         "Please restart the application to apply the new settings."),
+        ("Cuộc họp đã được dời sang chiều thứ Năm.",
+         "The meeting has been moved to Thursday afternoon."),
+        ("Cảm ơn bạn đã trả lời nhanh.",
+         "Thank you for your quick reply."),
+        ("Tôi đang học tiếng Anh để chuẩn bị cho công việc mới.",
+         "I am learning English to prepare for my new job."),
+    ],
+    "ja-en": [
+        ("設定を反映するにはアプリケーションを再起動してください。",
+         "Please restart the application to apply the settings."),
+        ("会議は木曜日の午後に変更されました。",
+         "The meeting has been changed to Thursday afternoon."),
+        ("迅速なご返信ありがとうございます。",
+         "Thank you for your quick reply."),
+        ("このファイルは別のプログラムで使用されているため開けません。",
+         "This file cannot be opened because it is being used by another program."),
+    ],
+    "zh-en": [
+        ("请重新启动应用程序以应用新设置。",
+         "Please restart the application to apply the new settings."),
+        ("会议已改到星期四下午。",
+         "The meeting has been moved to Thursday afternoon."),
+        ("感谢您的快速回复。",
+         "Thank you for your quick reply."),
+        ("由于该文件正被另一个程序使用，因此无法打开。",
+         "The file cannot be opened because it is being used by another program."),
+    ],
+    "en-de": [
+        ("Please restart the application to apply the new settings.",
+         "Bitte starten Sie die Anwendung neu, um die neuen Einstellungen zu übernehmen."),
+        ("The meeting has been moved to Thursday afternoon.",
+         "Das Treffen wurde auf Donnerstagnachmittag verschoben."),
+        ("Thank you for your quick reply.",
+         "Vielen Dank für Ihre schnelle Antwort."),
+    ],
+    "de-en": [
+        ("Bitte starten Sie die Anwendung neu, um die neuen Einstellungen zu übernehmen.",
+         "Please restart the application to apply the new settings."),
+        ("Das Treffen wurde auf Donnerstagnachmittag verschoben.",
+         "The meeting has been moved to Thursday afternoon."),
+        ("Vielen Dank für Ihre schnelle Antwort.",
+         "Thank you for your quick reply."),
+    ],
+}
+
+
+def chrf(hypothesis: str, reference: str, max_n: int = 6, beta: float = 2.0) -> float:
+    """Character n-gram F-score (chrF), 0-100"""
+    hyp = hypothesis.replace(" ", "")
+    ref = reference.replace(" ", "")
+    precisions, recalls = [], []
+
+    for n in range(1, max_n + 1):
+        hyp_ngrams = Counter(hyp[i:i + n] for i in range(len(hyp) - n + 1))
+        ref_ngrams = Counter(ref[i:i + n] for i in range(len(ref) - n + 1))
+        if not hyp_ngrams or not ref_ngrams:
+            continue
+        overlap = sum((hyp_ngrams & ref_ngrams).values())
+        precisions.append(overlap / sum(hyp_ngrams.values()))
+        recalls.append(overlap / sum(ref_ngrams.values()))
+
+    if not precisions:
+        return 0.0
+
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def run_benchmark(profiles: List[str], repeat: int) -> List[Dict]:
+    """Run every profile over every available language pair"""
+    provider = MarianTranslationProvider()
+    if not provider.is_available:
+        print("Marian MT is not available (disabled or no models)")
+        return []
+
+    rows = []
+    for pair, samples in CORPUS.items():
+        if not provider.model_manager.is_model_downloaded(pair):
+            print(f"Skipping {pair}: model not downloaded")
+            continue
+
+        src_lang, dest_lang = pair.split("-", 1)
+
+        # Warm-up so model loading is not counted
+        provider.translate(samples[0][0], src_lang, dest_lang)
+
+        for profile in profiles:
+            provider.decoding_profile = profile
+            latencies, scores, truncated = [], [], 0
+
+            for source, reference in samples:
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    result = provider.translate(source, src_lang, dest_lang)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                scores.append(chrf(result.text, reference))
+                if len(result.text) < len(reference) * 0.5:
+                    truncated += 1
+
+            rows.append({
+                "pair": pair,
+                "profile": profile,
+                "p50_ms": statistics.median(latencies),
+                "max_ms": max(latencies),
+                "chrf": statistics.mean(scores),
+                "short_outputs": truncated,
+            })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Marian decoding profiles")
+    parser.add_argument("--profiles", nargs="+", default=list(DECODING_PROFILES.keys()),
+                        choices=list(DECODING_PROFILES.keys()))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per sentence")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.profiles, max(1, args.repeat))
+    if not rows:
+        return 1
+
+    print()
+    print(f"{'pair':<8} {'profile':<10} {'p50 ms':>9} {'max ms':>9} {'chrF':>7} {'short':>6}")
+    for row in rows:
+        print(f"{row['pair']:<8} {row['profile']:<10} {row['p50_ms']:>9.1f} {row['max_ms']:>9.1f} "
+              f"{row['chrf']:>7.1f} {row['short_outputs']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
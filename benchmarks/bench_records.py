@@ -0,0 +1,167 @@
+"""
+Record Memory Benchmark for VezylTranslator
+Measures memory and time of slotted history records and the legacy dict views for 100k entries
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Compares each slotted record with the same dataclass without __slots__, and the legacy
+read path (read-only views, built once per cached list) with converting every entry to
+a dict on every read, as the legacy functions used to do.
+    python benchmarks/bench_records.py
+    python benchmarks/bench_records.py --entries 20000 --reads 10
+"""
+
+import argparse
+import dataclasses
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from VezylTranslatorProton.storage import FavoriteEntry, HistoryEntry, StorageManager
+from VezylTranslatorProton.translator import TranslationResult
+
+LANGUAGE_INTERFACE = "en"
+THEME_INTERFACE = "dark"
+
+
+def without_slots(cls):
+    """Same fields as cls in a plain (__dict__ based) dataclass"""
+    fields = [(field.name, field.type, field) for field in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(f"Dict{cls.__name__}", fields)
+
+
+def measure(build: Callable[[], object]) -> Tuple[float, float]:
+    """(elapsed ms, MiB still allocated by the result); timed without tracemalloc, which slows allocation"""
+    gc.collect()
+    started = time.perf_counter()
+    result = build()
+    elapsed = (time.perf_counter() - started) * 1000
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, allocated / (1024 * 1024)
+
+
+def history_values(index: int) -> dict:
+    return dict(
+        time=f"2025-01-01 12:{index // 60 % 60:02d}:{index % 60:02d}",
+        last_translated_text=f"bản dịch số {index}",
+        src_lang="en",
+        dest_lang="vi",
+        source="popup" if index % 2 else "homepage",
+        original_text=f"translation number {index}",
+    )
+
+
+def favorite_values(index: int) -> dict:
+    return dict(
+        time=f"2025-01-01 12:{index // 60 % 60:02d}:{index % 60:02d}",
+        original_text=f"translation number {index}",
+        translated_text=f"bản dịch số {index}",
+        src_lang="en",
+        dest_lang="vi",
+        note="",
+    )
+
+
+def result_values(index: int) -> dict:
+    return dict(text=f"bản dịch số {index}", src_lang="en", dest_lang="vi", model="google", confidence=0.9)
+
+
+def report(name: str, entries: int, baseline: Tuple[float, float], current: Tuple[float, float]):
+    (base_ms, base_mib), (ms, mib) = baseline, current
+    print(f"{name:<34} {base_ms:>9.1f}ms {base_mib:>8.1f}MiB -> {ms:>9.1f}ms {mib:>8.1f}MiB "
+          f"({base_ms / ms:.1f}x faster, {base_mib / mib:.1f}x less memory, {entries} entries)")
+
+
+def bench_records(entries: int):
+    """Slotted records vs the same dataclasses without __slots__"""
+    for cls, values in ((HistoryEntry, history_values), (FavoriteEntry, favorite_values),
+                        (TranslationResult, result_values)):
+        rows = [values(index) for index in range(entries)]
+        plain_cls = without_slots(cls)
+        base_ms, base_mib = measure(lambda: [plain_cls(**row) for row in rows])
+        ms, mib = measure(lambda: [cls(**row) for row in rows])
+        report(f"{cls.__name__} records", entries, (base_ms, base_mib), (ms, mib))
+
+
+def bench_legacy_reads(entries: int, reads: int):
+    """Legacy history/favorite reads on a warm cache: dict per entry vs shared views"""
+    workspace = tempfile.mkdtemp(prefix="vezyl_records_")
+    try:
+        manager = StorageManager()
+        for kind, values in (("history", history_values), ("favorite", favorite_values)):
+            log_file = os.path.join(workspace, f"{kind}.enc")
+            manager._write_encrypted_file(log_file, [
+                manager._encrypt_entry(values(index), LANGUAGE_INTERFACE, THEME_INTERFACE)
+                for index in range(entries)
+            ])
+            read_entries = getattr(manager, f"read_{kind}_entries")
+            read_views = getattr(manager, f"read_{kind}_views")
+
+            started = time.perf_counter()
+            records = read_entries(log_file, LANGUAGE_INTERFACE, THEME_INTERFACE)
+            print(f"{kind} file decrypted and parsed in {(time.perf_counter() - started) * 1000:.0f}ms "
+                  f"({len(records)} entries)")
+
+            def dict_reads():
+                return [[entry.to_dict() for entry in read_entries(log_file, LANGUAGE_INTERFACE, THEME_INTERFACE)]
+                        for _ in range(reads)]
+
+            def view_reads():
+                manager._view_cache.clear()  # The first read builds the views, later reads share them
+                return [read_views(log_file, LANGUAGE_INTERFACE, THEME_INTERFACE) for _ in range(reads)]
+
+            base_ms, base_mib = measure(dict_reads)
+            ms, mib = measure(view_reads)
+            report(f"legacy {kind} reads x{reads}", entries, (base_ms, base_mib), (ms, mib))
+
+            # Typical UI access: search every entry with .get
+            views = read_views(log_file, LANGUAGE_INTERFACE, THEME_INTERFACE)
+            dicts = [entry.to_dict() for entry in records]
+            field = "last_translated_text" if kind == "history" else "translated_text"
+            started = time.perf_counter()
+            hits = sum("99" in item.get(field, "") for item in dicts)
+            dict_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            view_hits = sum("99" in item.get(field, "") for item in views)
+            view_ms = (time.perf_counter() - started) * 1000
+            assert hits == view_hits
+            print(f"{kind + ' search via .get':<34} {dict_ms:>9.1f}ms (dicts) -> {view_ms:>9.1f}ms (views)")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def bench_result_conversion(entries: int):
+    """Popup result handling: to_dict() vs as_mapping() per translation"""
+    results = [TranslationResult(**result_values(index)) for index in range(entries)]
+    base_ms, base_mib = measure(lambda: [result.to_dict() for result in results])
+    ms, mib = measure(lambda: [result.as_mapping() for result in results])
+    report("TranslationResult legacy format", entries, (base_ms, base_mib), (ms, mib))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark slotted records and legacy dict views")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=5, help="Legacy reads per entry type on a warm cache")
+    args = parser.parse_args()
+
+    print(f"{'':<34} {'before':>22}    {'after':>22}")
+    bench_records(args.entries)
+    bench_legacy_reads(args.entries, args.reads)
+    bench_result_conversion(args.entries)
+
+
+if __name__ == "__main__":
+    main()
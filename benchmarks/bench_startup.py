@@ -0,0 +1,103 @@
+"""
+Startup Benchmark for VezylTranslator
+Measures translator import time (-X importtime) and TranslationEngine construction
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Run from the application directory:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --top 15
+Each run uses a fresh interpreter so nothing is already imported.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENGINE_SNIPPET = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "from VezylTranslatorProton.translator import TranslationEngine\n"
+    "imported = time.perf_counter()\n"
+    "TranslationEngine()\n"
+    "done = time.perf_counter()\n"
+    "print(f'TIMING {(imported - start) * 1000:.3f} {(done - imported) * 1000:.3f}')\n"
+)
+
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter with the repo on sys.path"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return subprocess.run([sys.executable] + args, capture_output=True, text=True, env=env)
+
+
+def import_profile() -> Tuple[int, List[Tuple[int, str]]]:
+    """Get cumulative import time of the translator module and the slowest imports (microseconds)"""
+    output = _run_python(["-X", "importtime", "-c", "import VezylTranslatorProton.translator"]).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        raw_name = parts[2][1:]
+        rows.append((len(raw_name) - len(raw_name.lstrip()), raw_name.strip(), int(parts[1])))
+
+    # Children are printed right before their parent, indented deeper
+    total = 0
+    modules: Dict[str, int] = {}
+    for index, (indent, name, cumulative) in enumerate(rows):
+        if name != "VezylTranslatorProton.translator":
+            continue
+        total = cumulative
+        for child_indent, child_name, child_cumulative in reversed(rows[:index]):
+            if child_indent <= indent:
+                break
+            modules[child_name] = max(child_cumulative, modules.get(child_name, 0))
+
+    slowest = sorted(((us, name) for name, us in modules.items()), reverse=True)
+    return total, slowest
+
+
+def engine_timing() -> Tuple[float, float]:
+    """Get (import ms, engine construction ms) from a fresh interpreter"""
+    output = _run_python(["-c", ENGINE_SNIPPET]).stdout
+    for line in output.splitlines():
+        if line.startswith("TIMING "):
+            import_ms, engine_ms = line.split()[1:3]
+            return float(import_ms), float(engine_ms)
+    raise RuntimeError("Engine timing run failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translator startup")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    totals, slowest = [], []
+    for _ in range(max(1, args.runs)):
+        total, slowest = import_profile()
+        totals.append(total / 1000)
+
+    timings = [engine_timing() for _ in range(max(1, args.runs))]
+
+    print(f"translator import (-X importtime): median {statistics.median(totals):.1f} ms")
+    print(f"import + engine (wall clock):      median {statistics.median(t[0] for t in timings):.1f} ms"
+          f" + {statistics.median(t[1] for t in timings):.1f} ms")
+    print()
+    print("Slowest imports pulled in by the translator (last run, cumulative):")
+    for us, name in slowest[:args.top]:
+        print(f"  {us / 1000:>8.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
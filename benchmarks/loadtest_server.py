@@ -0,0 +1,134 @@
+"""
+Load Test for the VezylTranslator Local Server
+Measures requests per second and latency percentiles against a running --serve instance
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Start the server, then run from the application directory:
+    python VezylTranslator.py --serve
+    python benchmarks/loadtest_server.py --concurrency 8 --requests 2000
+    python benchmarks/loadtest_server.py --endpoint batch --batch-size 32 --unique
+Each worker keeps one keep-alive connection open for all of its requests.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from typing import List
+
+SAMPLE_TEXTS = (
+    "Hello world",
+    "The translator keeps models loaded so other tools can reuse them.",
+    "Please open the settings page and choose a translation profile.",
+    "Long documents are translated in chunks that follow sentence boundaries.",
+)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Get the q-th percentile of sorted values"""
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def build_body(args, sequence: int) -> bytes:
+    """Build a request body; --unique makes every text miss the cache"""
+    def text(i: int) -> str:
+        base = SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]
+        return f"{base} ({i})" if args.unique else base
+
+    payload = {"dest": args.dest, "src": args.src, "model": args.model, "profile": args.profile}
+    if args.endpoint == "batch":
+        payload["texts"] = [text(sequence * args.batch_size + i) for i in range(args.batch_size)]
+        payload["stream"] = args.stream
+    else:
+        payload["text"] = text(sequence)
+    return json.dumps(payload).encode("utf-8")
+
+
+def worker(args, counter, latencies: List[float], errors: List[str], lock: threading.Lock):
+    """Send requests over one persistent connection until the shared counter runs out"""
+    path = "/translate/batch" if args.endpoint == "batch" else "/translate"
+    connection = http.client.HTTPConnection(args.host, args.port, timeout=60)
+    while True:
+        with lock:
+            sequence = counter[0]
+            if sequence >= args.requests:
+                break
+            counter[0] += 1
+
+        body = build_body(args, sequence)
+        started = time.perf_counter()
+        try:
+            connection.request("POST", path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if response.status == 200:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(f"HTTP {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            with lock:
+                errors.append(str(e))
+            connection.close()
+            connection = http.client.HTTPConnection(args.host, args.port, timeout=60)
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the local translation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoint", choices=("translate", "batch"), default="translate")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel keep-alive connections")
+    parser.add_argument("--batch-size", type=int, default=16, help="Texts per batch request")
+    parser.add_argument("--stream", action="store_true", help="Ask for NDJSON streaming batch results")
+    parser.add_argument("--unique", action="store_true", help="Use distinct texts to bypass the cache")
+    parser.add_argument("--dest", default="vi")
+    parser.add_argument("--src", default="auto")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--profile", default=None)
+    args = parser.parse_args()
+
+    # Fail fast if the server is not running
+    try:
+        connection = http.client.HTTPConnection(args.host, args.port, timeout=5)
+        connection.request("GET", "/health")
+        health = json.loads(connection.getresponse().read())
+        connection.close()
+    except (OSError, ValueError) as e:
+        print(f"Server not reachable at {args.host}:{args.port}: {e}")
+        return 1
+    print(f"Server: {health.get('version')} default model {health.get('default_model')}, "
+          f"max concurrency {health.get('max_concurrency')}")
+
+    counter, latencies, errors, lock = [0], [], [], threading.Lock()
+    threads = [threading.Thread(target=worker, args=(args, counter, latencies, errors, lock))
+               for _ in range(max(1, args.concurrency))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    texts_per_request = args.batch_size if args.endpoint == "batch" else 1
+    print(f"{len(latencies)} ok, {len(errors)} failed in {elapsed:.2f}s "
+          f"({args.concurrency} connections, {args.endpoint})")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s, {len(latencies) * texts_per_request / elapsed:.1f} texts/s")
+    if latencies:
+        print(f"latency ms: mean {statistics.mean(latencies):.1f}  p50 {percentile(latencies, 0.5):.1f}  "
+              f"p95 {percentile(latencies, 0.95):.1f}  p99 {percentile(latencies, 0.99):.1f}  max {latencies[-1]:.1f}")
+    if errors:
+        print(f"first errors: {errors[:5]}")
+    return 0 if not errors else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
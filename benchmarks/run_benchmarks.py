@@ -0,0 +1,351 @@
+"""
+Translation Engine Benchmark Suite for VezylTranslator
+Measures TranslationEngine translate/batch_translate, caching, language detection and the Marian path
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+Runs offline: Google is replaced by a fake with configurable latency and Marian
+uses a tiny randomly initialised model generated into a temporary workspace.
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --only cache_hit marian_batch --google-latency-ms 50
+    python benchmarks/run_benchmarks.py --update-baseline
+The run fails (exit code 1) when a benchmark regresses past --tolerance
+compared to benchmarks/baseline.json, or when a baseline benchmark was
+skipped (e.g. Marian could not be set up) without being left out by --only.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+sys.path.insert(0, REPO_ROOT)
+
+MARIAN_PAIR = "en-vi"
+P95_SLACK_MS = 0.1  # Absolute slack so microsecond-level benchmarks don't fail on timer noise
+SAMPLE_SENTENCES = (
+    "the quick brown fox jumps over the lazy dog",
+    "please open the settings page and choose a profile",
+    "the meeting has been moved to thursday afternoon",
+    "thank you for your quick reply",
+    "long documents are translated in chunks",
+    "the weather will be sunny in the morning",
+)
+DETECTION_SAMPLES = (
+    "The quick brown fox jumps over the lazy dog.",
+    "Xin chào, hôm nay bạn thế nào?",
+    "今日はとても良い天気ですね。",
+    "Guten Morgen, wie geht es Ihnen?",
+    "Bonjour tout le monde, comment allez-vous ?",
+    "안녕하세요, 만나서 반갑습니다.",
+)
+
+ADVANCED_CONFIG = """[marian_mt]
+enabled = true
+auto_download_models = false
+worker_processes = 0
+batch_window_ms = 10.0
+max_batch_size = 8
+
+[performance]
+lazy_load_transformers = true
+inference_threads = 1
+inference_interop_threads = 1
+placeholder_masking = true
+
+[decoding]
+profile = instant
+"""
+
+
+# === Workspace ===
+
+def build_tiny_marian(model_dir: str):
+    """Create a tiny randomly initialised Marian model with a real SentencePiece tokenizer"""
+    import sentencepiece as spm
+    import torch
+    from transformers import MarianConfig, MarianMTModel, MarianTokenizer
+
+    os.makedirs(model_dir, exist_ok=True)
+    corpus = os.path.join(model_dir, "corpus.txt")
+    with open(corpus, "w", encoding="utf-8") as f:
+        for i in range(300):
+            f.write(f"{SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]} {i} xin chao the gioi\n")
+    spm_prefix = os.path.join(model_dir, "spm")
+    spm.SentencePieceTrainer.train(input=corpus, model_prefix=spm_prefix, vocab_size=200, model_type="unigram",
+                                   bos_id=-1, eos_id=0, unk_id=1, pad_id=-1, minloglevel=2)
+    os.remove(corpus)
+
+    processor = spm.SentencePieceProcessor(model_file=spm_prefix + ".model")
+    vocab = {"</s>": 0, "<unk>": 1, "<pad>": 2}
+    for index in range(processor.get_piece_size()):
+        vocab.setdefault(processor.id_to_piece(index), len(vocab))
+    with open(os.path.join(model_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+    for name in ("source.spm", "target.spm"):
+        shutil.copy(spm_prefix + ".model", os.path.join(model_dir, name))
+
+    config = MarianConfig(vocab_size=len(vocab), d_model=32, encoder_layers=1, decoder_layers=1,
+                          encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=64,
+                          decoder_ffn_dim=64, max_position_embeddings=256, pad_token_id=2, eos_token_id=0,
+                          decoder_start_token_id=2)
+    torch.manual_seed(0)
+    config.save_pretrained(model_dir)
+    # The model manager looks for pytorch_model.bin; newer transformers only write safetensors
+    torch.save(MarianMTModel(config).state_dict(), os.path.join(model_dir, "pytorch_model.bin"))
+    MarianTokenizer(source_spm=os.path.join(model_dir, "source.spm"),
+                    target_spm=os.path.join(model_dir, "target.spm"),
+                    vocab=os.path.join(model_dir, "vocab.json")).save_pretrained(model_dir)
+
+
+def prepare_workspace(workspace: str) -> bool:
+    """Create config/ and resources/ for the benchmark run. Returns False if Marian cannot be built"""
+    os.makedirs(os.path.join(workspace, "config"), exist_ok=True)
+    with open(os.path.join(workspace, "config", "advanced_config.ini"), "w", encoding="utf-8") as f:
+        f.write(ADVANCED_CONFIG)
+    with open(os.path.join(workspace, "config", "general.json"), "w", encoding="utf-8") as f:
+        json.dump({"translation_model": "google", "translation_profile": "balanced"}, f)
+    try:
+        build_tiny_marian(os.path.join(workspace, "resources", "marian_models", MARIAN_PAIR))
+        return True
+    except ImportError as e:
+        print(f"[WARNING] Marian benchmarks skipped: {e}")
+        return False
+
+
+# === Fake Google ===
+
+def make_fake_google(latency_ms: float, jitter_ms: float):
+    """Google stand-in that echoes the text after a normally distributed delay"""
+    from VezylTranslatorProton.translator import BaseTranslationProvider, TranslationResult
+
+    class FakeGoogleProvider(BaseTranslationProvider):
+        def __init__(self):
+            self._random = random.Random(0)
+            self._lock = threading.Lock()
+            super().__init__("google")
+
+        def _check_availability(self):
+            self.is_available = True
+
+        def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi") -> TranslationResult:
+            with self._lock:
+                delay = max(0.0, self._random.gauss(latency_ms, jitter_ms))
+            time.sleep(delay / 1000)
+            return TranslationResult(text=f"[{dest_lang}] {text}", src_lang="en" if src_lang == "auto" else src_lang,
+                                     dest_lang=dest_lang, model="google", confidence=1.0)
+
+        def get_supported_languages(self) -> Dict[str, str]:
+            return {"auto": "Auto", "en": "English", "vi": "Tiếng Việt"}
+
+    return FakeGoogleProvider
+
+
+# === Measurement ===
+
+def percentile(values: List[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def summarize(latencies_ms: List[float], elapsed: float, items: int) -> Dict[str, float]:
+    """Throughput (items/s) and latency percentiles of one benchmark"""
+    ordered = sorted(latencies_ms)
+    return {
+        "count": len(ordered),
+        "throughput": round(items / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+    }
+
+
+def timed_calls(calls: List[Callable[[], object]], concurrency: int = 1) -> Tuple[List[float], float]:
+    """Run calls (optionally on a thread pool) and return per-call latency and wall time"""
+    def run(call):
+        started = time.perf_counter()
+        call()
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(run, calls))
+    else:
+        latencies = [run(call) for call in calls]
+    return latencies, time.perf_counter() - started
+
+
+def unique_texts(count: int, prefix: str) -> List[str]:
+    """Distinct short sentences so every call misses the cache"""
+    return [f"{SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]} {prefix} {i}" for i in range(count)]
+
+
+# === Benchmarks ===
+
+def run_suite(args, marian_ready: bool) -> Dict[str, Dict[str, float]]:
+    from VezylTranslatorProton import translator
+    from VezylTranslatorProton.translator import TranslationEngine, detect_language, register_provider
+
+    register_provider("google", make_fake_google(args.google_latency_ms, args.google_jitter_ms), lambda: True)
+    engine = TranslationEngine()
+    scale = args.scale
+    results: Dict[str, Dict[str, float]] = {}
+
+    def bench(name: str, fn: Callable[[], Dict[str, float]]):
+        if args.only and name not in args.only:
+            return
+        engine.cache.clear()
+        results[name] = fn()
+        row = results[name]
+        print(f"{name:<28} {row['throughput']:>10.1f}/s  p50 {row['p50_ms']:>8.3f}  "
+              f"p95 {row['p95_ms']:>8.3f}  p99 {row['p99_ms']:>8.3f} ms  (n={row['count']})")
+
+    def translate_sequential():
+        texts = unique_texts(int(100 * scale), "seq")
+        latencies, elapsed = timed_calls([lambda t=t: engine.translate(t, "en", "vi", "google") for t in texts])
+        return summarize(latencies, elapsed, len(texts))
+
+    def translate_concurrent():
+        texts = unique_texts(int(200 * scale), "par")
+        latencies, elapsed = timed_calls([lambda t=t: engine.translate(t, "en", "vi", "google") for t in texts],
+                                         concurrency=8)
+        return summarize(latencies, elapsed, len(texts))
+
+    def batch_google():
+        batches = [unique_texts(16, f"batch{b}") for b in range(int(8 * scale))]
+        latencies, elapsed = timed_calls([lambda b=b: engine.batch_translate(b, "en", "vi", "google")
+                                          for b in batches])
+        return summarize(latencies, elapsed, sum(len(b) for b in batches))
+
+    def cache_hit():
+        engine.translate("the quick brown fox", "en", "vi", "google")
+        calls = [lambda: engine.translate("the quick brown fox", "en", "vi", "google")] * int(2000 * scale)
+        latencies, elapsed = timed_calls(calls)
+        return summarize(latencies, elapsed, len(calls))
+
+    def language_detection():
+        detect_language(DETECTION_SAMPLES[0])  # Load the detector outside the timing
+        calls = [lambda t=t: detect_language(t) for t in DETECTION_SAMPLES * int(50 * scale)]
+        latencies, elapsed = timed_calls(calls)
+        return summarize(latencies, elapsed, len(calls))
+
+    def warm_up_marian():
+        """Load the model outside the timing and make sure the engine did not fall back to another provider"""
+        result = engine.translate("warm up the model", "en", "vi", "marian")
+        if result.model != "marian":
+            raise RuntimeError(f"Marian benchmark served by '{result.model}' instead of the tiny model")
+
+    def marian_translate():
+        warm_up_marian()
+        texts = unique_texts(int(40 * scale), "mt")
+        latencies, elapsed = timed_calls([lambda t=t: engine.translate(t, "en", "vi", "marian") for t in texts])
+        return summarize(latencies, elapsed, len(texts))
+
+    def marian_batch():
+        warm_up_marian()
+        batches = [unique_texts(16, f"mb{b}") for b in range(int(8 * scale))]
+        latencies, elapsed = timed_calls([lambda b=b: engine.batch_translate(b, "en", "vi", "marian")
+                                          for b in batches])
+        return summarize(latencies, elapsed, sum(len(b) for b in batches))
+
+    print(f"fake google latency {args.google_latency_ms}ms ± {args.google_jitter_ms}ms\n")
+    bench("translate_google", translate_sequential)
+    bench("translate_google_concurrent", translate_concurrent)
+    bench("batch_translate_google", batch_google)
+    bench("cache_hit", cache_hit)
+    bench("detect_language", language_detection)
+    if marian_ready:
+        bench("marian_translate", marian_translate)
+        bench("marian_batch", marian_batch)
+
+    engine.shutdown()
+    translator.reset_translation_engine()
+    return results
+
+
+# === Baseline ===
+
+def compare_with_baseline(results: Dict[str, Dict[str, float]], baseline: Dict, tolerance: float,
+                          only: List[str] = None) -> List[str]:
+    """List regressions: p95 latency above or throughput below the baseline by more than tolerance, or not run"""
+    regressions = []
+    for name, expected in baseline.get("benchmarks", {}).items():
+        current = results.get(name)
+        if current is None:
+            if not only or name in only:
+                regressions.append(f"{name}: skipped, but it is in the baseline")
+            continue
+        if current["p95_ms"] > expected["p95_ms"] * (1 + tolerance) + P95_SLACK_MS:
+            regressions.append(f"{name}: p95 {current['p95_ms']:.3f}ms vs baseline {expected['p95_ms']:.3f}ms")
+        if current["throughput"] < expected["throughput"] / (1 + tolerance):
+            regressions.append(f"{name}: throughput {current['throughput']:.1f}/s "
+                               f"vs baseline {expected['throughput']:.1f}/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the translation engine offline")
+    parser.add_argument("--only", nargs="+", help="Run only these benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply iteration counts")
+    parser.add_argument("--google-latency-ms", type=float, default=20.0, help="Fake Google mean latency")
+    parser.add_argument("--google-jitter-ms", type=float, default=5.0, help="Fake Google latency std deviation")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown (0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--keep-workspace", action="store_true", help="Keep the generated workspace")
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix="vezyl_bench_")
+    os.environ.setdefault("APPDATA", workspace)  # constant.py needs it outside Windows
+    os.chdir(workspace)  # Config and model paths are relative to the app directory
+    try:
+        marian_ready = prepare_workspace(workspace)
+        results = run_suite(args, marian_ready)
+    finally:
+        os.chdir(REPO_ROOT)
+        if not args.keep_workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    if args.update_baseline:
+        if not marian_ready:
+            print("\n[WARNING] Marian benchmarks were skipped and will be missing from the new baseline")
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "machine": f"{platform.system()} {platform.machine()} Python {platform.python_version()}",
+                "google_latency_ms": args.google_latency_ms,
+                "google_jitter_ms": args.google_jitter_ms,
+                "benchmarks": results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline to compare against (run with --update-baseline)")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if (baseline.get("google_latency_ms"), baseline.get("google_jitter_ms")) != (args.google_latency_ms,
+                                                                                args.google_jitter_ms):
+        print("\n[WARNING] Fake Google latency differs from the baseline; Google benchmarks are not comparable")
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.only)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions against {os.path.basename(args.baseline)} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
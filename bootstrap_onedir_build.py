@@ -3,6 +3,12 @@ import os
 import time
 import tkinter as tk
 from tkinter import ttk
+import multiprocessing
+
+# Marian worker processes re-run this script in frozen builds - hand them off
+# before any window is created
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
 
 print("🚀 VezylTranslator starting...")
 
@@ -0,0 +1,202 @@
+"""
+LibreTranslate Provider Tests for VezylTranslator
+Runs LibreTranslateProvider against a local ThreadingHTTPServer stand-in
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+    python -m pytest tests/test_libretranslate.py
+    python -m unittest tests.test_libretranslate
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="vezyl_tests_"))  # Read by constant on import
+
+from VezylTranslatorProton.translator import LibreTranslateProvider
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """LibreTranslate /translate and /languages: translates by prefixing the target code"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Any, headers: Dict[str, str] = None):
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json" if not isinstance(body, str) else "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/languages":
+            self._send(200, [{"code": "en", "name": "English"}, {"code": "zh", "name": "Chinese"}])
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        server = self.server
+        with server.lock:
+            server.requests.append((time.monotonic(), payload))
+            scripted = server.responses.pop(0) if server.responses else None
+        if scripted is not None:
+            self._send(*scripted)
+            return
+
+        texts = payload["q"]
+        translate = lambda text: f"[{payload['target']}] {text}"
+        detected = {"language": "en", "confidence": 90}
+        if isinstance(texts, list):
+            if not server.supports_batch:
+                self._send(200, {"translatedText": translate(" ".join(texts))})
+                return
+            self._send(200, {"translatedText": [translate(text) for text in texts],
+                             "detectedLanguage": [detected] * len(texts)})
+        else:
+            self._send(200, {"translatedText": translate(texts), "detectedLanguage": detected})
+
+
+class LibreTranslateProviderTest(unittest.TestCase):
+    """Single and batch calls, retries, error mapping and the async API"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests: List[Tuple[float, Dict[str, Any]]] = []
+        self.server.responses: List[tuple] = []  # (status, body[, headers]) served before normal replies
+        self.server.supports_batch = True
+        self.provider = LibreTranslateProvider(url=self.url, api_key="secret", timeout=5, pool_size=2, batch_size=2)
+
+    def tearDown(self):
+        self.provider.shutdown()
+
+    @property
+    def payloads(self) -> List[Dict[str, Any]]:
+        return [payload for _, payload in self.server.requests]
+
+    # === Single and batch ===
+
+    def test_translate_single(self):
+        result = self.provider.translate("Hello", "auto", "vi")
+        self.assertIsNone(result.error)
+        self.assertEqual(result.text, "[vi] Hello")
+        self.assertEqual(result.src_lang, "en")
+        self.assertAlmostEqual(result.confidence, 0.9)
+        self.assertEqual(self.payloads, [{"q": "Hello", "source": "auto", "target": "vi", "format": "text",
+                                          "api_key": "secret"}])
+
+    def test_language_codes_are_mapped(self):
+        result = self.provider.translate("Hello", "en", "zh-cn")
+        self.assertEqual(result.text, "[zh] Hello")
+        self.assertEqual(result.src_lang, "en")
+        self.assertEqual(self.payloads[0]["target"], "zh")
+        self.assertEqual(self.provider.get_supported_languages(),
+                         {"auto": "🔍 Tự động phát hiện", "en": "English", "zh-cn": "Chinese"})
+
+    def test_translate_batch_uses_one_request_per_batch_size(self):
+        texts = ["one", "two", "three", "four", "five"]
+        results = self.provider.translate_batch(texts, "en", "vi")
+        self.assertEqual([result.text for result in results], [f"[vi] {text}" for text in texts])
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual([payload["q"] for payload in self.payloads], [["one", "two"], ["three", "four"], ["five"]])
+
+    def test_batch_without_server_support_is_an_error(self):
+        self.server.supports_batch = False
+        results = self.provider.translate_batch(["one", "two"], "en", "vi")
+        self.assertEqual([result.error for result in results], ["Server does not support batch requests"] * 2)
+
+    # === Retries and errors ===
+
+    def test_overload_is_retried(self):
+        self.server.responses = [(503, {"error": "Busy"}), (502, {"error": "Bad gateway"})]
+        result = self.provider.translate("Hello", "en", "vi")
+        self.assertIsNone(result.error)
+        self.assertEqual(result.text, "[vi] Hello")
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_retry_after_is_respected(self):
+        self.server.responses = [(429, {"error": "Slow down"}, {"Retry-After": "1"})]
+        result = self.provider.translate("Hello", "en", "vi")
+        self.assertIsNone(result.error)
+        (first, _), (second, _) = self.server.requests
+        self.assertGreaterEqual(second - first, 0.9)
+
+    def test_retries_are_bounded(self):
+        self.server.responses = [(503, {"error": "Busy"})] * 5
+        result = self.provider.translate("Hello", "en", "vi")
+        self.assertIsNotNone(result.error)
+        self.assertEqual(result.text, "Lỗi dịch LibreTranslate: Hello")
+        self.assertEqual(len(self.server.requests), 3)  # First try and two retries
+
+    def test_client_errors_are_not_retried(self):
+        self.server.responses = [(400, {"error": "Invalid request: missing q parameter"})]
+        result = self.provider.translate("Hello", "en", "vi")
+        self.assertEqual(result.error, "HTTP 400: Invalid request: missing q parameter")
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_non_json_error_body(self):
+        self.server.responses = [(500, "Internal Server Error")]
+        result = self.provider.translate("Hello", "en", "vi")
+        self.assertEqual(result.error, "HTTP 500: Internal Server Error")
+
+    def test_failed_batch_chunk_only_fails_its_texts(self):
+        self.server.responses = [(403, {"error": "Invalid API key"})]
+        results = self.provider.translate_batch(["one", "two", "three"], "en", "vi")
+        self.assertEqual([result.error for result in results], ["HTTP 403: Invalid API key"] * 2 + [None])
+        self.assertEqual(results[2].text, "[vi] three")
+
+    def test_unreachable_server(self):
+        self.provider.shutdown()
+        provider = LibreTranslateProvider(url="http://127.0.0.1:9", timeout=1, batch_size=2)
+        result = provider.translate("Hello", "en", "vi")
+        self.assertIsNotNone(result.error)
+        self.assertEqual(result.model, "libretranslate")
+
+    def test_not_configured(self):
+        provider = LibreTranslateProvider(url="")
+        self.assertFalse(provider.is_available)
+        self.assertEqual(provider.translate("Hello", "en", "vi").error, "LibreTranslate not configured")
+        self.assertEqual(self.server.requests, [])
+
+    # === Async ===
+
+    def test_translate_async(self):
+        result = asyncio.run(self.provider.translate_async("Hello", "en", "vi"))
+        self.assertEqual(result.text, "[vi] Hello")
+
+    def test_translate_batch_async_keeps_order(self):
+        texts = [f"text {index}" for index in range(7)]
+        results = asyncio.run(self.provider.translate_batch_async(texts, "en", "vi"))
+        self.assertEqual([result.text for result in results], [f"[vi] {text}" for text in texts])
+        self.assertEqual(len(self.server.requests), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
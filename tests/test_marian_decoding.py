@@ -0,0 +1,90 @@
+"""
+Marian Decoding Budget Tests for VezylTranslator
+Checks that the generate timeout grows with the decoding policy's max_length x num_beams budget
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+    python -m pytest tests/test_marian_decoding.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="vezyl_tests_"))  # Read by constant on import
+
+from VezylTranslatorProton import translator
+from VezylTranslatorProton.translator import DECODING_PROFILES, MarianTranslationProvider, get_generate_timeout
+
+# Scaled-down cost model: the stand-in model spends this long per budget token
+SECONDS_PER_TOKEN = 0.0002
+
+
+class _Row(list):
+    def tolist(self):
+        return list(self)
+
+
+class _CostModelTokenizer:
+    """Tokenizer stand-in: only padding is used by generate"""
+    pad_token_id = 0
+    eos_token_id = 1
+
+    def pad(self, encoded, return_tensors=None):
+        return {"input_ids": encoded["input_ids"]}
+
+
+class _CostModel:
+    """Model stand-in whose generate takes `cost` x the budget at the scaled per-token rate"""
+
+    def __init__(self, cost: float):
+        self.cost = cost
+
+    def generate(self, input_ids, max_length, num_beams=1, **kwargs):
+        time.sleep(max_length * num_beams * SECONDS_PER_TOKEN * self.cost)
+        return [_Row(range(max_length)) for _ in input_ids]
+
+
+class GenerateTimeoutTest(unittest.TestCase):
+    """Budget-sized inputs finish; runaway generates still time out"""
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(translator, "MARIAN_GENERATE_TIMEOUT", 0.05),
+            mock.patch.object(translator, "MARIAN_GENERATE_SECONDS_PER_TOKEN", SECONDS_PER_TOKEN),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.provider = MarianTranslationProvider()
+
+    def test_timeout_grows_with_budget(self):
+        for name, policy in DECODING_PROFILES.items():
+            short = policy.generate_kwargs(4)
+            longest = policy.generate_kwargs(policy.max_length_cap)
+            self.assertEqual(get_generate_timeout(short), 0.05, name)
+            self.assertAlmostEqual(get_generate_timeout(longest),
+                                   longest["max_length"] * longest["num_beams"] * SECONDS_PER_TOKEN, msg=name)
+
+    def test_budget_sized_input_does_not_time_out(self):
+        model = _CostModel(cost=0.8)
+        for name, policy in DECODING_PROFILES.items():
+            generate_kwargs = policy.generate_kwargs(policy.max_length_cap)  # Largest budget of the profile
+            output = self.provider._generate_with_timeout(model, _CostModelTokenizer(), [5] * policy.max_length_cap,
+                                                          generate_kwargs)
+            self.assertIsNotNone(output, f"{name} profile timed out")
+            self.assertEqual(len(output), generate_kwargs["max_length"])
+
+    def test_runaway_generate_times_out(self):
+        generate_kwargs = DECODING_PROFILES["quality"].generate_kwargs(512)
+        output = self.provider._generate_with_timeout(_CostModel(cost=3.0), _CostModelTokenizer(), [5] * 512,
+                                                      generate_kwargs)
+        self.assertIsNone(output)
+
+
+if __name__ == "__main__":
+    unittest.main()
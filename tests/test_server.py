@@ -0,0 +1,87 @@
+"""
+Local Translation Server Tests for VezylTranslator
+Checks request body handling of the HTTP API over raw sockets
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+    python -m pytest tests/test_server.py
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="vezyl_tests_"))  # Read by constant on import
+
+from VezylTranslatorProton.server import TranslationServer
+
+SOCKET_TIMEOUT = 5.0  # A handler blocked on the body would exceed this
+
+
+class ContentLengthTest(unittest.TestCase):
+    """Content-Length values that are not a non-negative number are rejected without reading the body"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = TranslationServer("127.0.0.1", 0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _post(self, content_length: str, body: bytes = b"") -> tuple:
+        """Send a raw POST /detect and return (status, JSON body, raw response)"""
+        request = (f"POST /detect HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {content_length}\r\n\r\n").encode("ascii") + body
+        with socket.create_connection(self.server.server_address, timeout=SOCKET_TIMEOUT) as sock:
+            sock.sendall(request)
+            response = b""
+            while b"\r\n\r\n" not in response or len(response.split(b"\r\n\r\n", 1)[1]) < self._length(response):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                response += chunk
+        head, _, payload = response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        return status, json.loads(payload or b"{}"), head.decode("latin-1")
+
+    @staticmethod
+    def _length(response: bytes) -> int:
+        for line in response.split(b"\r\n\r\n", 1)[0].split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                return int(line.split(b":", 1)[1])
+        return 0
+
+    def test_valid_request(self):
+        body = json.dumps({"text": "Good morning, how are you today?"}).encode("utf-8")
+        status, payload, _ = self._post(str(len(body)), body)
+        self.assertEqual(status, 200)
+        self.assertIn("lang", payload)
+
+    def test_non_numeric_content_length(self):
+        status, payload, head = self._post("abc", b'{"text": "hello"}')
+        self.assertEqual(status, 400)
+        self.assertEqual(payload, {"error": "Invalid Content-Length"})
+        self.assertIn("Connection: close", head)
+
+    def test_negative_content_length(self):
+        status, payload, head = self._post("-1", b'{"text": "hello"}')
+        self.assertEqual(status, 400)
+        self.assertEqual(payload, {"error": "Invalid Content-Length"})
+        self.assertIn("Connection: close", head)
+
+    def test_body_too_large(self):
+        status, payload, _ = self._post(str(10 ** 12))
+        self.assertEqual(status, 413)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Multi-Target Translation Tests for VezylTranslator
+Checks that TranslationEngine.translate_multi masks, chunks and cancels like translate
+Author: Tuan Viet Nguyen
+Copyright (c) 2025 Vezyl. All rights reserved.
+
+    python -m pytest tests/test_translate_multi.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from dataclasses import replace
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="vezyl_tests_"))  # Read by constant on import
+
+from VezylTranslatorNeutron.scheduler_service import CancellationToken, TranslationCancelled
+from VezylTranslatorProton.profiles import TRANSLATION_PROFILES
+from VezylTranslatorProton.translator import (
+    BaseTranslationProvider, TranslationEngine, TranslationResult, register_provider
+)
+
+URL = "https://example.com/docs/setup?lang=en"
+TEXT = f"Read the guide at {URL} before you start."
+
+
+class _RecordingProvider(BaseTranslationProvider):
+    """Upper-cases text and records what was sent"""
+
+    def __init__(self, name: str = "test_recording"):
+        self.sent: List[str] = []
+        self._lock = threading.Lock()
+        super().__init__(name)
+
+    def _check_availability(self):
+        self.is_available = True
+
+    def translate(self, text: str, src_lang: str = "auto", dest_lang: str = "vi") -> TranslationResult:
+        with self._lock:
+            self.sent.append(text)
+        return TranslationResult(text=f"[{dest_lang}] {text.upper()}", src_lang=src_lang, dest_lang=dest_lang,
+                                 model=self.name, confidence=1.0)
+
+    def detect_language(self, text: str) -> str:
+        return "en"
+
+    def get_supported_languages(self) -> Dict[str, str]:
+        return {"en": "English", "vi": "Tiếng Việt", "fr": "Français"}
+
+
+class _MultiProvider(_RecordingProvider):
+    """Provider with its own multi-target path, like Marian"""
+
+    def translate_multi(self, text: str, src_lang: str, dest_langs: List[str],
+                        decoding_profile: str = None) -> Dict[str, TranslationResult]:
+        return {dest_lang: self.translate(text, src_lang, dest_lang) for dest_lang in dest_langs}
+
+
+class TranslateMultiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = TranslationEngine()
+        self.addCleanup(self.engine.shutdown)
+
+    def _use(self, provider_class, name: str) -> BaseTranslationProvider:
+        provider = provider_class(name)
+        register_provider(name, lambda: provider)
+        return provider
+
+    def _assert_url_protected(self, provider, results: Dict[str, TranslationResult]):
+        self.assertEqual(sorted(results), ["fr", "vi"])
+        for dest_lang, result in results.items():
+            self.assertIsNone(result.error)
+            self.assertIn(URL, result.text)  # Restored untouched
+            self.assertTrue(result.text.startswith(f"[{dest_lang}] READ THE GUIDE AT "))
+        self.assertTrue(provider.sent)
+        for sent in provider.sent:
+            self.assertNotIn("example.com", sent)
+
+    def test_url_is_masked_with_provider_multi_path(self):
+        provider = self._use(_MultiProvider, "test_multi")
+        results = self.engine.translate_multi(TEXT, ["vi", "fr"], "en", "test_multi")
+        self._assert_url_protected(provider, results)
+
+    def test_url_is_masked_per_target(self):
+        provider = self._use(_RecordingProvider, "test_single")
+        results = self.engine.translate_multi(TEXT, ["vi", "fr"], "auto", "test_single")
+        self._assert_url_protected(provider, results)
+
+    def test_url_only_text_is_not_sent(self):
+        provider = self._use(_MultiProvider, "test_url_only")
+        results = self.engine.translate_multi(URL, ["vi", "fr"], "en", "test_url_only")
+        self.assertEqual({result.text for result in results.values()}, {URL})
+        self.assertEqual(provider.sent, [])
+
+    def test_long_text_is_chunked(self):
+        provider = self._use(_MultiProvider, "test_chunked")
+        profile = replace(TRANSLATION_PROFILES["balanced"], name="test_small_chunks", chunk_size=60)
+        TRANSLATION_PROFILES[profile.name] = profile
+        self.addCleanup(TRANSLATION_PROFILES.pop, profile.name)
+        sentences = [f"Sentence number {index} talks about the weather today." for index in range(6)]
+        results = self.engine.translate_multi(" ".join(sentences), ["vi", "fr"], "en", "test_chunked", profile.name)
+        self.assertTrue(all(len(sent) <= 60 for sent in provider.sent))
+        self.assertEqual(len(provider.sent), 2 * len(sentences))
+        for dest_lang, result in results.items():
+            self.assertEqual(result.text.count(f"[{dest_lang}]"), len(sentences))
+
+    def test_cancelled_request_raises(self):
+        provider = self._use(_MultiProvider, "test_cancel")
+        token = CancellationToken()
+        token.cancel()
+        with self.assertRaises(TranslationCancelled):
+            self.engine.translate_multi(TEXT, ["vi", "fr"], "en", "test_cancel", cancel_token=token)
+        self.assertEqual(provider.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()